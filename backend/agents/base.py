@@ -3,11 +3,35 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from typing import Any
 
 from backend.services.llm_service import LLMService
+from backend.services.structured_output import json_response_format, parse_structured
 
 logger = logging.getLogger(__name__)
 
+# Per-run conversation histories keyed by agent, so one agent instance can
+# serve concurrent runs (see :func:`activate_agent_run`).
+_run_histories: ContextVar[dict[int, list[dict[str, str]]] | None] = ContextVar(
+    "agent_run_histories", default=None)
+
+
+def activate_agent_run() -> Token:
+    """Give the current context (and tasks it spawns) fresh agent histories.
+
+    Agents are shared across runs by the orchestrator factory; while a run
+    is active, :attr:`BaseAgent.conversation_history` is private to it.
+    Pass the token to :func:`deactivate_agent_run` when the run ends, or let
+    it lapse with the task's context.
+    """
+    return _run_histories.set({})
+
+
+def deactivate_agent_run(token: Token) -> None:
+    _run_histories.reset(token)
+
 
 class BaseAgent:
     """Foundation for all podcast agents (host & guests).
@@ -25,7 +49,15 @@ class BaseAgent:
         self.name = name
         self.system_prompt = system_prompt
         self.llm = llm_service
-        self.conversation_history: list[dict[str, str]] = []
+        self._own_history: list[dict[str, str]] = []
+
+    @property
+    def conversation_history(self) -> list[dict[str, str]]:
+        """Internal-memory history of the active run (or of this agent)."""
+        histories = _run_histories.get()
+        if histories is None:
+            return self._own_history
+        return histories.setdefault(id(self), [])
 
     # ------------------------------------------------------------------
     # Core thinking
@@ -38,25 +70,51 @@ class BaseAgent:
         conversation_history: list[dict[str, str]] | None = None,
         temperature: float = 0.85,
         max_tokens: int = 4096,
+        system_suffix: str = "",
+        response_format: dict[str, Any] | None = None,
+        call_site: str | None = None,
     ) -> str:
         """Generate a response given the user message and optional shared history.
 
         If *conversation_history* is provided it is used instead of the
         agent's own history (useful for shared podcast conversation).
+
+        Messages are laid out for provider-side prefix caching: a shared
+        history's leading system message (the episode brief, identical for
+        every agent) goes first, then this agent's system prompt plus the
+        static *system_suffix*, then the rest of the history and finally the
+        per-call *user_message*.  Everything before the history therefore
+        stays byte-identical across an episode's calls.
+
+        *call_site* names the call for model-tier routing (see
+        :func:`backend.services.llm_service.tier_for`).
         """
         use_external_history = conversation_history is not None
         history = conversation_history if use_external_history else self.conversation_history
 
+        system_content = self.system_prompt
+        if system_suffix:
+            system_content = f"{system_content}\n\n{system_suffix}"
+        shared_prefix: list[dict[str, str]] = []
+        if use_external_history and history and history[0].get("role") == "system":
+            shared_prefix, history = [history[0]], history[1:]
+
         messages = [
-            {"role": "system", "content": self.system_prompt},
+            *shared_prefix,
+            {"role": "system", "content": system_content},
             *history,
             {"role": "user", "content": user_message},
         ]
 
+        chat_kwargs: dict[str, Any] = {}
+        if response_format is not None:
+            chat_kwargs["response_format"] = response_format
         response = await self.llm.chat(
             messages,
             temperature=temperature,
             max_tokens=max_tokens,
+            call_site=call_site,
+            **chat_kwargs,
         )
 
         # Update internal history only when using internal memory mode.
@@ -70,6 +128,26 @@ class BaseAgent:
 
         return response
 
+    async def think_json(
+        self,
+        user_message: str,
+        schema: Any,
+        *,
+        name: str,
+        normalize: Callable[[Any], Any] | None = None,
+        **think_kwargs: Any,
+    ) -> Any:
+        """Like :meth:`think`, but return the reply validated against *schema*.
+
+        Requests provider JSON mode and repairs near-JSON locally; raises
+        :class:`~backend.services.structured_output.StructuredOutputError`
+        when the reply is unusable.
+        """
+        think_kwargs.setdefault("call_site", name)
+        response = await self.think(
+            user_message, response_format=json_response_format(), **think_kwargs)
+        return parse_structured(response, schema, name=name, normalize=normalize)
+
     def reset_history(self) -> None:
         """Clear the conversation history."""
         self.conversation_history.clear()
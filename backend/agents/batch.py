@@ -0,0 +1,196 @@
+"""Batch generation — a slate of episodes produced in one run.
+
+A batch is either an explicit list of topics or *count* topics the host
+picks from a single ``get_topic_news`` call (see
+:meth:`PodcastOrchestrator.plan_batch_topics`).  The episodes then run
+through the normal pipeline with three things in common:
+
+- research is shared: news, knowledge-base lookups and Tavily deep searches
+  that two episodes ask for are run once
+  (:mod:`backend.services.shared_research`);
+- at most ``settings.batch_max_concurrent_episodes`` episodes are in flight;
+- their LLM calls are scheduled at batch priority, behind interactive and
+  normal requests (see :mod:`backend.services.llm_service`), and their TTS
+  calls draw on the process-wide ``tts_max_concurrency`` budget.
+
+A failed episode is recorded and the rest of the batch continues.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from backend.config import settings
+from backend.services.llm_service import PRIORITY_BATCH, llm_priority
+from backend.services.shared_research import SharedResearch
+
+if TYPE_CHECKING:
+    from backend.agents.orchestrator import PodcastOrchestrator
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class BatchEpisode:
+    """Progress of one episode in a batch."""
+
+    index: int
+    topic: str
+    status: str = PENDING
+    stage: str = ""
+    detail: str = ""
+    episode_id: str | None = None
+    error: str = ""
+    seconds: float = 0.0
+
+
+@dataclass
+class BatchResult:
+    episodes: list[BatchEpisode]
+    elapsed_s: float
+    max_concurrent_episodes: int
+    shared_research: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def completed(self) -> list[BatchEpisode]:
+        return [e for e in self.episodes if e.status == COMPLETED]
+
+    @property
+    def episodes_per_hour(self) -> float:
+        if self.elapsed_s <= 0:
+            return 0.0
+        return len(self.completed) * 3600 / self.elapsed_s
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "requested": len(self.episodes),
+            "completed": len(self.completed),
+            "failed": sum(e.status == FAILED for e in self.episodes),
+            "elapsed_s": round(self.elapsed_s, 3),
+            "episodes_per_hour": round(self.episodes_per_hour, 2),
+            "max_concurrent_episodes": self.max_concurrent_episodes,
+            "shared_research": self.shared_research,
+            "episodes": [asdict(e) for e in self.episodes],
+        }
+
+
+BatchProgress = Callable[[BatchEpisode], Awaitable[None]] | None
+
+
+class BatchGenerator:
+    """Runs a batch of episodes through one orchestrator."""
+
+    def __init__(
+        self,
+        orchestrator: PodcastOrchestrator,
+        *,
+        max_concurrent_episodes: int | None = None,
+        max_news_results: int = 10,
+    ) -> None:
+        self._orchestrator = orchestrator
+        self.max_concurrent_episodes = (
+            max_concurrent_episodes or settings.batch_max_concurrent_episodes)
+        self.max_news_results = max_news_results
+
+    async def run(
+        self,
+        *,
+        topics: list[str] | None = None,
+        count: int = 0,
+        selected_guest_names: list[str] | None = None,
+        generation_mode: str | None = None,
+        progress: BatchProgress = None,
+    ) -> BatchResult:
+        """Generate one episode per topic in *topics*, or *count* host-picked ones."""
+        topics = [t.strip() for t in (topics or []) if t and t.strip()]
+        if not topics and count <= 0:
+            raise ValueError("A batch needs topics or a positive count")
+        limit = settings.batch_max_episodes
+        if len(topics) > limit or count > limit:
+            raise ValueError(f"A batch is limited to {limit} episodes")
+
+        started = time.perf_counter()
+        research = SharedResearch()
+        token = research.activate()
+        try:
+            news_items = None
+            if topics:
+                choices: list[dict[str, Any] | None] = [None] * len(topics)
+            else:
+                with llm_priority(PRIORITY_BATCH):
+                    news_items, picked = await self._orchestrator.plan_batch_topics(
+                        count, max_news_results=self.max_news_results)
+                choices = list(picked)
+                topics = [choice.get("topic", "") for choice in picked]
+            episodes = [BatchEpisode(index=i, topic=topic)
+                        for i, topic in enumerate(topics)]
+            logger.info("Batch of %d episodes, %d at a time",
+                        len(episodes), self.max_concurrent_episodes)
+
+            semaphore = asyncio.Semaphore(self.max_concurrent_episodes)
+
+            async def _notify(item: BatchEpisode) -> None:
+                if progress:
+                    await progress(item)
+
+            async def _generate(item: BatchEpisode, choice: dict[str, Any] | None) -> None:
+                async with semaphore:
+                    item.status = RUNNING
+                    item_started = time.perf_counter()
+                    await _notify(item)
+
+                    async def _progress(stage: str, detail: str) -> None:
+                        item.stage, item.detail = stage, detail
+                        await _notify(item)
+
+                    try:
+                        episode = await self._orchestrator.generate_episode(
+                            progress=_progress,
+                            topic="" if choice else item.topic,
+                            selected_guest_names=selected_guest_names,
+                            generation_mode=generation_mode,
+                            topic_choice=choice,
+                            news_items=news_items if choice else None,
+                        )
+                        item.status = COMPLETED
+                        item.episode_id = episode.id
+                        item.topic = episode.topic or item.topic
+                    except asyncio.CancelledError:
+                        item.status = CANCELLED
+                        raise
+                    except Exception as exc:
+                        logger.exception("Batch episode %d (%s) failed",
+                                         item.index + 1, item.topic)
+                        item.status = FAILED
+                        item.error = str(exc)
+                    finally:
+                        item.seconds = round(time.perf_counter() - item_started, 3)
+                await _notify(item)
+
+            with llm_priority(PRIORITY_BATCH):
+                await asyncio.gather(*(
+                    _generate(item, choice) for item, choice in zip(episodes, choices)))
+        finally:
+            SharedResearch.deactivate(token)
+
+        result = BatchResult(
+            episodes=episodes,
+            elapsed_s=time.perf_counter() - started,
+            max_concurrent_episodes=self.max_concurrent_episodes,
+            shared_research=research.stats(),
+        )
+        logger.info("Batch finished: %d/%d episodes in %.1fs (%.1f episodes/hour)",
+                    len(result.completed), len(episodes), result.elapsed_s,
+                    result.episodes_per_hour)
+        return result
@@ -0,0 +1,250 @@
+"""Token-budgeted shared context for dialogue generation.
+
+Every line of an episode is generated from the same shared context: the
+research brief plus the conversation so far.  :class:`DialogueContext`
+keeps that context under a token budget: the most recent turns are sent
+verbatim and older turns are folded into a rolling summary instead of
+being dropped.
+
+The verbatim window slides a chunk at a time, so consecutive calls share
+an identical message prefix that providers can serve from their prompt
+cache.  The summary is produced incrementally by the LLM in the background, one
+chunk of turns at a time, and cached, so a line generation never waits on
+it.  Turns that left the verbatim window but are still being summarized
+are skipped for the few calls in between; if summarization fails, an
+extractive digest (speaker plus the head of each turn) is used instead.
+
+Token counts use :func:`estimate_tokens`, a local approximation tuned for
+mixed Chinese / English text (no tokenizer download needed).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from backend.config import settings
+
+if TYPE_CHECKING:
+    from backend.services.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+_SUMMARY_SYSTEM = (
+    "你是播客编导，负责为正在录制的节目维护一份“前文摘要”，供主持人和嘉宾接话时参考。"
+)
+_SUMMARY_PROMPT = """已有摘要：
+{summary}
+
+新增对话：
+{turns}
+
+请把新增对话合并进摘要，输出更新后的完整摘要（不超过{max_chars}字）：
+- 按发言人记录各自的核心观点、立场和举过的案例/数据
+- 保留尚未解决的分歧和被抛出但没回答的问题
+- 不要评价，不要加入对话里没有的信息
+只输出摘要正文。"""
+
+# Per-message overhead of the chat format (role, separators).
+_MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of *text* for budget decisions.
+
+    CJK characters count as one token each; other characters at roughly
+    four per token, which is close to BPE tokenizers on English text.
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut *text* so that ``estimate_tokens`` of the result fits *max_tokens*."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def _message_tokens(message: dict[str, str]) -> int:
+    return estimate_tokens(message.get("content", "")) + _MESSAGE_OVERHEAD
+
+
+class DialogueContext:
+    """Shared conversation context with a per-call prompt budget.
+
+    Parameters
+    ----------
+    brief:
+        Research brief sent as the first system message on every call.
+    llm:
+        Service used for the rolling summary; ``None`` keeps the extractive
+        digest only.
+    max_tokens:
+        Budget for brief + summary + verbatim turns.
+    summary_chunk_turns:
+        How many turns must leave the verbatim window before they are
+        summarized (one LLM call per chunk).
+    summary_max_chars:
+        Target length of the rolling summary.
+    """
+
+    def __init__(
+        self,
+        brief: str,
+        *,
+        llm: LLMService | None = None,
+        max_tokens: int | None = None,
+        summary_chunk_turns: int | None = None,
+        summary_max_chars: int = 600,
+    ) -> None:
+        self.brief = brief
+        self.llm = llm
+        self.max_tokens = max_tokens or settings.dialogue_context_max_tokens
+        self.summary_chunk_turns = max(
+            1, summary_chunk_turns or settings.dialogue_summary_chunk_turns)
+        self.summary_max_chars = summary_max_chars
+        self.turns: list[dict[str, str]] = []
+        self.summary = ""
+        self.summarized_upto = 0  # turns[:summarized_upto] are in self.summary
+        self._summary_task: asyncio.Task | None = None
+        self._summary_target = 0
+        self._window_start = 0
+        self._brief_message = {"role": "system", "content": brief}
+        self._brief_tokens = _message_tokens(self._brief_message)
+
+    def append(self, speaker: str, text: str) -> None:
+        self.turns.append(
+            {"role": "assistant", "content": f"[{speaker}]: {text}"})
+
+    # ------------------------------------------------------------------
+    # Building the per-call context
+    # ------------------------------------------------------------------
+
+    def _summary_message(self) -> dict[str, str] | None:
+        if not self.summary:
+            return None
+        return {"role": "system", "content": f"【前文摘要】\n{self.summary}"}
+
+    def _collect_summary(self) -> None:
+        task = self._summary_task
+        if task is None or not task.done():
+            return
+        self._summary_task = None
+        if task.cancelled():
+            return
+        try:
+            self.summary = task.result()
+        except Exception as exc:
+            logger.warning("Rolling summary failed, using extractive digest: %s", exc)
+            self.summary = self._extractive_summary(
+                self.summary, self.turns[self.summarized_upto:self._summary_target])
+        self.summarized_upto = self._summary_target
+
+    def build(self) -> list[dict[str, str]]:
+        """Return the messages to send for the next line, within budget."""
+        self._collect_summary()
+        summary_message = self._summary_message()
+        remaining = self.max_tokens - self._brief_tokens
+        if summary_message is not None:
+            remaining -= _message_tokens(summary_message)
+
+        needed_start = len(self.turns)
+        for index in range(len(self.turns) - 1, self.summarized_upto - 1, -1):
+            cost = _message_tokens(self.turns[index])
+            # Always keep the latest turn so the speaker can respond to it.
+            if cost > remaining and index < len(self.turns) - 1:
+                break
+            remaining -= cost
+            needed_start = index
+
+        # Slide the window a whole chunk at a time so the message prefix stays
+        # identical (and provider-cacheable) for several consecutive calls.
+        window_start = max(self._window_start, self.summarized_upto)
+        if needed_start > window_start:
+            window_start = min(
+                max(needed_start, window_start + self.summary_chunk_turns),
+                len(self.turns) - 1,
+            )
+        self._window_start = window_start
+
+        if window_start - self.summarized_upto >= self.summary_chunk_turns:
+            self._start_summary(window_start)
+
+        messages = [self._brief_message]
+        if summary_message is not None:
+            messages.append(summary_message)
+        messages.extend(self.turns[window_start:])
+        return messages
+
+    def prompt_tokens(self, messages: list[dict[str, str]]) -> int:
+        return sum(_message_tokens(m) for m in messages)
+
+    # ------------------------------------------------------------------
+    # Rolling summary
+    # ------------------------------------------------------------------
+
+    def _start_summary(self, upto: int) -> None:
+        if self._summary_task is not None:
+            return
+        pending = self.turns[self.summarized_upto:upto]
+        self._summary_target = upto
+        if self.llm is None:
+            self.summary = self._extractive_summary(self.summary, pending)
+            self.summarized_upto = upto
+            return
+        self._summary_task = asyncio.create_task(
+            self._summarize(self.summary, pending))
+        # Mark failures as retrieved if the dialogue ends before collection.
+        self._summary_task.add_done_callback(
+            lambda task: task.cancelled() or task.exception())
+
+    async def _summarize(self, previous: str, turns: list[dict[str, str]]) -> str:
+        prompt = _SUMMARY_PROMPT.format(
+            summary=previous or "（暂无）",
+            turns="\n".join(turn["content"] for turn in turns),
+            max_chars=self.summary_max_chars,
+        )
+        text = await self.llm.chat(
+            [{"role": "system", "content": _SUMMARY_SYSTEM},
+             {"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=self.summary_max_chars * 2,
+            call_site="context_summary",
+        )
+        text = text.strip()
+        if not text:
+            raise ValueError("empty summary")
+        return text[: self.summary_max_chars * 2]
+
+    def _extractive_summary(self, previous: str, turns: list[dict[str, str]]) -> str:
+        lines = [previous] if previous else []
+        for turn in turns:
+            head = re.split(r"(?<=[。！？!?])", turn["content"], maxsplit=1)[0]
+            lines.append(head[:80])
+        text = "\n".join(lines)
+        # Keep the most recent part when the digest outgrows its target.
+        return text[-self.summary_max_chars * 2:]
+
+    async def aclose(self) -> None:
+        """Cancel an in-flight summary (call when the dialogue is finished)."""
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+            try:
+                await self._summary_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._summary_task = None
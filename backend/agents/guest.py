@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-import json
 import logging
 
 from backend.agents.base import BaseAgent
 from backend.agents.personas import build_system_prompt
-from backend.models import DialogueLine, PersonaConfig
+from backend.models import DialogueLine, LineDraft, PersonaConfig
 from backend.services.llm_service import LLMService
+from backend.services.structured_output import (
+    StructuredOutputError,
+    json_response_format,
+    parse_structured,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,21 +32,10 @@ class GuestAgent(BaseAgent):
     # Line generation
     # ------------------------------------------------------------------
 
-    async def generate_line(
-        self,
-        context: list[dict[str, str]],
-        instruction: str,
-    ) -> DialogueLine:
-        """Generate a single guest line within the podcast conversation.
-
-        *context* is the shared conversation history visible to all agents.
-        *instruction* tells the guest what to respond to / focus on.
-        """
-        prompt = f"""【嘉宾发言指令】{instruction}
-
-请生成你（{self.name}，{self.persona.mbti}，{self.persona.occupation}）在这个位置的发言。
-
-【发言要求】
+    def _line_rules(self) -> str:
+        """Static line-generation rules, sent with the system prompt so the
+        cacheable prefix stays identical across calls."""
+        return f"""【发言要求】
 一、专业人格表达
 - 一段自然口语化发言，50-200字左右
 - 体现你{self.persona.mbti}的性格内核和{self.persona.occupation}的独特视角
@@ -81,24 +74,36 @@ class GuestAgent(BaseAgent):
     "stance": "当前立场表达（如 agreement, disagreement, extension, correction）"
 }}"""
 
-        response = await self.think(prompt, conversation_history=context, temperature=0.85, max_tokens=800)
+    async def generate_line(
+        self,
+        context: list[dict[str, str]],
+        instruction: str,
+    ) -> DialogueLine:
+        """Generate a single guest line within the podcast conversation.
+
+        *context* is the shared conversation history visible to all agents.
+        *instruction* tells the guest what to respond to / focus on.
+        """
+        prompt = f"""【嘉宾发言指令】{instruction}
+
+请生成你（{self.name}，{self.persona.mbti}，{self.persona.occupation}）在这个位置的发言。遵循系统设定中的【发言要求】，并按其中的JSON格式返回。"""
+
+        response = await self.think(
+            prompt, conversation_history=context, temperature=0.85, max_tokens=800,
+            system_suffix=self._line_rules(), response_format=json_response_format(),
+            call_site="guest_line",
+        )
 
         try:
-            cleaned = response.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1]
-            if cleaned.endswith("```"):
-                cleaned = cleaned.rsplit("```", 1)[0]
-            cleaned = cleaned.strip()
-            data = json.loads(cleaned)
+            draft = parse_structured(response, LineDraft, name="guest_line")
             return DialogueLine(
                 speaker=self.name,
-                text=data.get("text", ""),
-                ssml_text=data.get("ssml_text", data.get("text", "")),
-                emotion=data.get("emotion", "neutral"),
+                text=draft.text,
+                ssml_text=draft.ssml_text or draft.text,
+                emotion=draft.emotion,
                 voice_id=self.persona.voice_id,
             )
-        except (json.JSONDecodeError, Exception) as exc:
+        except StructuredOutputError as exc:
             logger.error("Failed to parse guest line from %s: %s",
                          self.name, exc)
             return DialogueLine(
@@ -2,14 +2,35 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import re
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
 
 from backend.agents.base import BaseAgent
 from backend.agents.personas import HOST_PERSONA, build_system_prompt
-from backend.models import DialogueLine, EpisodePlan, NewsItem
+from backend.models import (
+    DialogueLine,
+    EpisodePlan,
+    FreshSearchDecision,
+    LineDraft,
+    NewsItem,
+    PersonaConfig,
+    SegmentDraft,
+    TopicChoice,
+    TopicSlate,
+)
 from backend.services.llm_service import LLMService
+from backend.services.structured_output import (
+    StructuredOutputError,
+    json_response_format,
+    parse_structured,
+)
+
+if TYPE_CHECKING:
+    from backend.knowledge.topic_index import TopicIndex
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +56,15 @@ class HostAgent(BaseAgent):
         news_list: list[NewsItem],
         *,
         recent_topics: list[str] | None = None,
+        topic_index: TopicIndex | None = None,
+        exclude_episode_id: str | None = None,
     ) -> dict:
         """Pick the most compelling topic direction from a list of news items.
 
+        *recent_topics* are shown to the LLM as topics to avoid.  When a
+        *topic_index* is given, the chosen topic is also checked against the
+        whole back catalogue with a nearest-neighbour lookup.
+
         Returns a dict with keys: ``index``, ``topic``, ``reason``, ``search_queries``.
         Optional keys: ``conflict_points``, ``angle_hint``.
         """
@@ -94,29 +121,132 @@ class HostAgent(BaseAgent):
     "angle_hint": "建议讨论切入角度（如：伦理切入 / 历史对比切入 / 生活化类比切入）"
 }}"""
 
-        response = await self.think(prompt, temperature=0.7, max_tokens=1024)
+        try:
+            choice = await self.think_json(
+                prompt, TopicChoice, name="topic_choice",
+                temperature=0.7, max_tokens=1024)
+        except StructuredOutputError:
+            logger.error("Failed to parse topic selection, using fallback topic")
+            return await self._fallback_non_repetitive_topic(
+                news_list, recent_topics, topic_index, exclude_episode_id)
+        selected = choice.model_dump()
+        selected_topic = choice.topic.strip()
+
+        repetitive = await self._find_repetitive(
+            [selected_topic], recent_topics, topic_index, exclude_episode_id)
+        if repetitive[0]:
+            logger.info(
+                "Selected topic appears repetitive, switching to fallback topic. topic=%s",
+                selected_topic,
+            )
+            return await self._fallback_non_repetitive_topic(
+                news_list, recent_topics, topic_index, exclude_episode_id)
+        return selected
+
+    async def select_topics(
+        self,
+        news_list: list[NewsItem],
+        count: int,
+        *,
+        recent_topics: list[str] | None = None,
+        topic_index: TopicIndex | None = None,
+    ) -> list[dict]:
+        """Pick *count* distinct topic directions from one news list (batch mode).
+
+        One LLM call proposes the whole slate.  Proposals that repeat a past
+        episode or an earlier proposal are dropped, and the slate is topped
+        up from the remaining news titles.  Fewer than *count* topics are
+        returned only when the news list runs out of distinct items.
+
+        Each dict has the same keys as :meth:`select_topic` returns.
+        """
+        recent_topics = [t.strip()
+                         for t in (recent_topics or []) if t and t.strip()]
+        news_summary = "\n".join(
+            f"{i+1}. 【{item.title}】{item.content[:200]}"
+            for i, item in enumerate(news_list)
+        )
+        recent_topics_block = "\n".join(
+            f"- {topic}" for topic in recent_topics[:20]
+        ) or "（暂无往期话题）"
+
+        prompt = f"""以下是今天获取到的{len(news_list)}条相关资讯：
+
+{news_summary}
+
+【往期已聊过的话题（必须规避重复）】
+{recent_topics_block}
+
+今天要一次性制作{count}期播客。请你作为播客主编，从中挑选**{count}个互不重复的讨论方向**，每期一个。
+
+【选择标准】
+- 有争议、悖论或反直觉角度，能形成至少两种立场的碰撞
+- 支持多角度切入，能形成"表层现象 → 深层原因 → 外延影响"的追问链条
+- 和普通听众生活有真实关联，有新信息或新解释框架
+- 各期之间不能语义重复，尽量取自不同的资讯
+- 不能与【往期已聊过的话题】语义重复
+
+请以JSON格式返回本批次的全部选题（不要包含markdown代码块标记）：
+{{
+    "topics": [
+        {{
+            "index": 选中的新闻序号,
+            "topic": "提炼的播客话题方向（一句话，要有观点倾向）",
+            "reason": "选择理由（2-3句话）",
+            "conflict_points": ["可能的立场冲突点1", "冲突点2"],
+            "search_queries": ["后续深度搜索关键词1", "关键词2", "关键词3", "关键词4", "关键词5"],
+            "angle_hint": "建议讨论切入角度"
+        }}
+    ]
+}}"""
 
         try:
-            # Strip possible markdown code fences
-            cleaned = response.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1]
-            if cleaned.endswith("```"):
-                cleaned = cleaned.rsplit("```", 1)[0]
-            cleaned = cleaned.strip()
-            selected = json.loads(cleaned)
-
-            selected_topic = str(selected.get("topic", "")).strip()
-            if self._is_topic_repetitive(selected_topic, recent_topics):
-                logger.info(
-                    "Selected topic appears repetitive, switching to fallback topic. topic=%s",
-                    selected_topic,
-                )
-                return self._fallback_non_repetitive_topic(news_list, recent_topics)
-            return selected
-        except json.JSONDecodeError:
-            logger.error("Failed to parse topic selection JSON: %s", response)
-            return self._fallback_non_repetitive_topic(news_list, recent_topics)
+            slate = await self.think_json(
+                prompt, TopicSlate, name="topic_slate",
+                temperature=0.7, max_tokens=min(4096, 400 * count + 256))
+            proposals = [choice.model_dump() for choice in slate.topics]
+        except StructuredOutputError:
+            logger.error("Failed to parse topic slate, using news titles")
+            proposals = []
+
+        repetitive = await self._find_repetitive(
+            [p["topic"].strip() for p in proposals], recent_topics, topic_index)
+        selected: list[dict] = []
+        for proposal, is_repeat in zip(proposals, repetitive):
+            topic = proposal["topic"].strip()
+            if is_repeat or self._is_topic_repetitive(
+                    topic, [s["topic"] for s in selected]):
+                logger.info("Dropping repetitive batch topic: %s", topic)
+                continue
+            selected.append(proposal)
+            if len(selected) == count:
+                return selected
+
+        used = {s.get("index") for s in selected}
+        title_repeats = await self._find_repetitive(
+            [item.title for item in news_list], recent_topics, topic_index)
+        for i, item in enumerate(news_list, start=1):
+            if len(selected) == count:
+                break
+            if i in used or title_repeats[i - 1] or self._is_topic_repetitive(
+                    item.title, [s["topic"] for s in selected]):
+                continue
+            selected.append(self._news_fallback_topic(i, item))
+        if len(selected) < count:
+            logger.warning(
+                "Only %d distinct topics found for a batch of %d", len(selected), count)
+        return selected
+
+    @staticmethod
+    def _news_fallback_topic(index: int, item: NewsItem) -> dict:
+        return {
+            "index": index,
+            "topic": item.title,
+            "reason": "基于往期去重策略，选择与历史讨论重复度更低的资讯方向。",
+            "conflict_points": ["新技术价值与落地成本如何平衡"],
+            "search_queries": [item.title],
+            "angle_hint": "从新增信息和用户真实影响切入",
+        }
 
     @staticmethod
     def _topic_tokens(text: str) -> set[str]:
@@ -148,21 +278,59 @@ class HostAgent(BaseAgent):
                 return True
         return False
 
-    def _fallback_non_repetitive_topic(
+    @classmethod
+    async def _find_repetitive(
+        cls,
+        candidates: list[str],
+        recent_topics: list[str],
+        topic_index: TopicIndex | None,
+        exclude_episode_id: str | None = None,
+    ) -> list[bool]:
+        """Flag candidates that repeat a past episode.
+
+        Token overlap against *recent_topics* catches literal repeats; the
+        optional vector index adds one batched nearest-neighbour query over
+        every past topic and summary, which catches paraphrases.  Index
+        failures degrade to the token-overlap check alone.
+        """
+        flags = [cls._is_topic_repetitive(c, recent_topics) for c in candidates]
+        if topic_index is None or not candidates:
+            return flags
+        try:
+            matches = await asyncio.to_thread(
+                topic_index.find_repeats,
+                candidates,
+                exclude_episode_id=exclude_episode_id,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Topic index lookup failed, using token overlap only: %s", exc)
+            return flags
+        for i, match in enumerate(matches):
+            if match is not None and not flags[i]:
+                logger.info(
+                    "Topic %r repeats episode %s (%r, distance=%.3f)",
+                    candidates[i], match.episode_id, match.topic, match.distance,
+                )
+                flags[i] = True
+        return flags
+
+    async def _fallback_non_repetitive_topic(
         self,
         news_list: list[NewsItem],
         recent_topics: list[str],
+        topic_index: TopicIndex | None = None,
+        exclude_episode_id: str | None = None,
     ) -> dict:
+        repetitive = await self._find_repetitive(
+            [item.title for item in news_list],
+            recent_topics,
+            topic_index,
+            exclude_episode_id,
+        )
         for i, item in enumerate(news_list, start=1):
-            if not self._is_topic_repetitive(item.title, recent_topics):
-                return {
-                    "index": i,
-                    "topic": item.title,
-                    "reason": "基于往期去重策略，选择与历史讨论重复度更低的资讯方向。",
-                    "conflict_points": ["新技术价值与落地成本如何平衡"],
-                    "search_queries": [item.title],
-                    "angle_hint": "从新增信息和用户真实影响切入",
-                }
+            if not repetitive[i - 1]:
+                return self._news_fallback_topic(i, item)
 
         # If all today's titles look similar, still return one but force a fresh angle
         fallback_title = news_list[0].title if news_list else "今日热点话题"
@@ -247,21 +415,13 @@ class HostAgent(BaseAgent):
 - `example_needed` 字段极其重要：给出具体的人名、事件、数字，让嘉宾有血有肉可讲
 - `unexpected_angle` 必须是真正反直觉的——不是"AI会影响就业"这种人人都知道的话"""
 
-        response = await self.think(prompt, temperature=0.7, max_tokens=1500)
-
         try:
-            cleaned = response.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1]
-            if cleaned.endswith("```"):
-                cleaned = cleaned.rsplit("```", 1)[0]
-            cleaned = cleaned.strip()
-            data = json.loads(cleaned)
-            normalized = self._normalize_episode_plan_payload(data)
-            return EpisodePlan(**normalized)
-        except (json.JSONDecodeError, Exception) as exc:
-            logger.error(
-                "Failed to parse episode plan: %s | raw: %s", exc, response)
+            return await self.think_json(
+                prompt, EpisodePlan, name="episode_plan",
+                normalize=self._normalize_episode_plan_payload,
+                temperature=0.7, max_tokens=1500)
+        except (StructuredOutputError, ValidationError) as exc:
+            logger.error("Failed to plan episode, using default outline: %s", exc)
             return EpisodePlan(
                 topic=topic.get("topic", "深度讨论"),
                 summary="关于最新话题的深度圆桌讨论",
@@ -387,23 +547,13 @@ class HostAgent(BaseAgent):
   "focus": "若需要新搜索，给出一个更聚焦的搜索意图；否则给空字符串"
 }}"""
 
-        response = await self.think(prompt, temperature=0.2, max_tokens=400)
         try:
-            cleaned = response.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1]
-            if cleaned.endswith("```"):
-                cleaned = cleaned.rsplit("```", 1)[0]
-            cleaned = cleaned.strip()
-            data = json.loads(cleaned)
-            return {
-                "need_fresh_search": bool(data.get("need_fresh_search", False)),
-                "reason": str(data.get("reason", "")),
-                "focus": str(data.get("focus", "")),
-            }
-        except Exception:
-            logger.warning(
-                "Failed to parse fresh-search decision JSON: %s", response)
+            decision = await self.think_json(
+                prompt, FreshSearchDecision, name="fresh_search_decision",
+                temperature=0.2, max_tokens=400)
+            return decision.model_dump()
+        except StructuredOutputError as exc:
+            logger.warning("Fresh-search decision failed, using fallback: %s", exc)
             return {
                 "need_fresh_search": len(rag_snippets) < 2,
                 "reason": "fallback: rag信息不足时补充搜索",
@@ -414,17 +564,10 @@ class HostAgent(BaseAgent):
     # Line generation
     # ------------------------------------------------------------------
 
-    async def generate_line(
-        self,
-        context: list[dict[str, str]],
-        instruction: str,
-    ) -> DialogueLine:
-        """Generate a single host line within the podcast conversation."""
-        prompt = f"""【主持人指令】{instruction}
-
-请生成你（{self.name}）在这个位置的发言。
-
-【发言要求】
+    def _line_rules(self) -> str:
+        """Static line-generation rules, sent with the system prompt so the
+        cacheable prefix stays identical across calls."""
+        return f"""【发言要求】
 一、基础
 - 一段自然口语化发言，50-150字左右
 - 像朋友聊天：可断句、可犹豫、可小幅情绪起伏
@@ -452,24 +595,32 @@ class HostAgent(BaseAgent):
     "intent": "发言意图（如 question, challenge, summarize, transition）"
 }}"""
 
-        response = await self.think(prompt, conversation_history=context, temperature=0.85, max_tokens=800)
+    async def generate_line(
+        self,
+        context: list[dict[str, str]],
+        instruction: str,
+    ) -> DialogueLine:
+        """Generate a single host line within the podcast conversation."""
+        prompt = f"""【主持人指令】{instruction}
+
+请生成你（{self.name}）在这个位置的发言。遵循系统设定中的【发言要求】，并按其中的JSON格式返回。"""
+
+        response = await self.think(
+            prompt, conversation_history=context, temperature=0.85, max_tokens=800,
+            system_suffix=self._line_rules(), response_format=json_response_format(),
+            call_site="host_line",
+        )
 
         try:
-            cleaned = response.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1]
-            if cleaned.endswith("```"):
-                cleaned = cleaned.rsplit("```", 1)[0]
-            cleaned = cleaned.strip()
-            data = json.loads(cleaned)
+            draft = parse_structured(response, LineDraft, name="host_line")
             return DialogueLine(
                 speaker=self.name,
-                text=data.get("text", ""),
-                ssml_text=data.get("ssml_text", data.get("text", "")),
-                emotion=data.get("emotion", "neutral"),
+                text=draft.text,
+                ssml_text=draft.ssml_text or draft.text,
+                emotion=draft.emotion,
                 voice_id=self.persona.voice_id,
             )
-        except (json.JSONDecodeError, Exception) as exc:
+        except StructuredOutputError as exc:
             logger.error("Failed to parse host line: %s", exc)
             # Fallback: use raw response as text
             return DialogueLine(
@@ -479,3 +630,110 @@ class HostAgent(BaseAgent):
                 emotion="neutral",
                 voice_id=self.persona.voice_id,
             )
+
+    # ------------------------------------------------------------------
+    # Whole-segment generation
+    # ------------------------------------------------------------------
+
+    def _segment_rules(self, cast: list[PersonaConfig]) -> str:
+        """Static rules for writing a whole talking-point exchange.
+
+        The persona cards cover the episode's whole *cast*, not just the
+        speakers of one talking point, so the suffix stays identical (and
+        prefix-cacheable) across an episode's segments.  Who speaks in a
+        segment is named in the per-call prompt instead.
+        """
+        cards = "\n".join(
+            f"- {p.name}（{'主持人' if p.name == self.name else '嘉宾'}）："
+            f"{p.age}岁{p.occupation}，{p.mbti}；性格：{p.personality}；"
+            f"说话风格：{p.speaking_style}；"
+            f"立场倾向：{p.stance_bias or '保持审慎但有判断'}"
+            for p in cast
+        )
+        return f"""【整段对话要求】
+这一次你不只说自己的台词，而是以主持人的身份把这一段对话完整写出来，每个人都必须说符合自己人设的话。
+
+【本期人物】
+{cards}
+
+一、人设约束
+- 每个人的观点、用词和语气都要贴合上面的人物卡，不同人之间要听得出区别
+- 嘉宾各自从职业经验出发，带着自己的立场，可以正面交锋，不要互相附和
+- 主持人台词50-150字，嘉宾台词50-200字，口语化，可犹豫、可激动、可吐槽
+
+二、对话推进
+- 只有指令中列出的【本段发言人】可以说话，严格按【发言顺序】出场，每一轮发言都要在前一位的基础上增加新信息
+- 尽量给具体案例、数据或一手观察，不要泛泛而谈
+- 自然加入 `<#X#>` 停顿和语气词标签
+
+严禁出现：三段式总结、"非常好的问题"、"正如你所说"、"此外"、"值得注意的是"、"综上所述"、"让我们拭目以待"、"不仅……而且……"等AI痕迹
+
+请以JSON格式返回（不要包含markdown代码块标记）：
+{{
+    "lines": [
+        {{
+            "speaker": "发言人姓名（必须是本段发言人之一）",
+            "text": "用于展示的纯净文本（不含标注）",
+            "ssml_text": "带语音标注的文本（含 <#X#> 停顿和情感语气词）",
+            "emotion": "当前情感状态（如 happy, neutral, excited, thoughtful, skeptical, curious）"
+        }}
+    ]
+}}"""
+
+    async def generate_segment(
+        self,
+        context: list[dict[str, str]],
+        instruction: str,
+        participants: list[PersonaConfig],
+        *,
+        cast: list[PersonaConfig] | None = None,
+        min_lines: int = 2,
+    ) -> list[DialogueLine] | None:
+        """Write a whole exchange (several speakers) in one structured call.
+
+        *participants* are this segment's speakers; *cast* (default: the
+        participants) is everyone on the episode, whose persona cards go in
+        the cacheable system suffix.  Returns ``None`` when the response cannot be parsed into at least
+        *min_lines* lines from known speakers, so the caller can fall back
+        to per-line generation.  Lines by unknown speakers are dropped.
+        """
+        speakers = "、".join(p.name for p in participants)
+        prompt = f"""【本段发言人】{speakers}
+
+【本段对话指令】{instruction}
+
+请一次写出这一段完整的对话。遵循系统设定中的【整段对话要求】，并按其中的JSON格式返回。"""
+
+        response = await self.think(
+            prompt, conversation_history=context, temperature=0.85, max_tokens=3000,
+            system_suffix=self._segment_rules(cast or participants),
+            response_format=json_response_format(),
+            call_site="dialogue_segment",
+        )
+
+        voices = {p.name: p.voice_id for p in participants}
+        try:
+            draft = parse_structured(
+                response, SegmentDraft, name="dialogue_segment",
+                normalize=lambda data: {"lines": data} if isinstance(data, list) else data)
+        except StructuredOutputError as exc:
+            logger.error("Failed to parse dialogue segment: %s", exc)
+            return None
+
+        lines: list[DialogueLine] = []
+        for item in draft.lines:
+            speaker, text = item.speaker.strip(), item.text.strip()
+            if speaker not in voices or not text:
+                logger.warning("Dropping segment line by %r (unknown speaker or empty text)", speaker)
+                continue
+            lines.append(DialogueLine(
+                speaker=speaker,
+                text=text,
+                ssml_text=item.ssml_text or text,
+                emotion=item.emotion or "neutral",
+                voice_id=voices[speaker],
+            ))
+        if len(lines) < min_lines:
+            logger.error("Dialogue segment too short (%d lines), discarding", len(lines))
+            return None
+        return lines
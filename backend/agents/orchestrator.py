@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
 import random
+import re
+import time
 from collections.abc import Awaitable, Callable
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, TypedDict, TypeVar
 
 from langgraph.graph import END, START, StateGraph
 
+from backend.agents.base import activate_agent_run, deactivate_agent_run
+from backend.agents.context import DialogueContext, estimate_tokens, truncate_to_tokens
 from backend.agents.guest import GuestAgent
 from backend.agents.host import HostAgent
 from backend.agents.personas import (
@@ -23,19 +29,45 @@ from backend.knowledge import get_knowledge_base
 from backend.knowledge.chroma_kb import (
     BACKGROUND_MATERIAL,
     KNOWLEDGE_SCOPE_GLOBAL,
+    KNOWLEDGE_SCOPE_TASK,
 )
+from backend.knowledge.topic_index import TopicIndex
 from backend.logging_config import get_episode_file_handler
-from backend.models import DetailedInfo, DialogueLine, Episode, EpisodePlan, NewsItem, PersonaConfig
+from backend.models import (
+    DetailedInfo,
+    DialogueLine,
+    DocumentTopic,
+    Episode,
+    EpisodeMeta,
+    EpisodePlan,
+    NewsItem,
+    PersonaConfig,
+    episode_meta_paths,
+)
 from backend.services.audio_service import AudioService, audio_service
 from backend.services.llm_service import LLMService, get_llm_service
 from backend.services.news_service import NewsService, get_news_service
 from backend.services.run_logger import EpisodeRunLogger
+from backend.services.live_playlist import LivePlaylist
+from backend.services.search_cache import normalize_query
+from backend.services.shared_research import shared
+from backend.services.structured_output import StructuredOutputError, chat_json
+from backend.services.telemetry import (
+    SPAN_NODE,
+    RunTelemetry,
+    current_run,
+    mark_queue_wait,
+    span,
+    traced_node,
+)
 from backend.services.tts_service import TTSService, get_tts_service
+from backend.services.guest_pool_service import get_guest_pool_service
 from backend.services.host_service import get_host_service
 
 logger = logging.getLogger(__name__)
 
 ProgressCallback = Callable[[str, str], Awaitable[None]] | None
+_T = TypeVar("_T")
 
 
 class OrchestratorState(TypedDict, total=False):
@@ -55,6 +87,12 @@ class OrchestratorState(TypedDict, total=False):
     # Document mode extras
     document_session_id: str | None     # session ID for uploaded docs in ChromaDB
     user_prompt: str                    # user-supplied brief / instructions
+    generation_mode: str | None         # dialogue mode; None → settings
+    # Research breadth (script preview exposes these per request)
+    max_news_results: int
+    max_search_queries: int
+    search_queries: list[str]           # queries actually researched
+    preselected_topic: bool             # topic picked before the run (batch)
 
 
 class PodcastOrchestrator:
@@ -67,13 +105,14 @@ class PodcastOrchestrator:
         tts: TTSService | None = None,
         audio: AudioService | None = None,
         guest_personas: list[PersonaConfig] | None = None,
+        host_persona: PersonaConfig | None = None,
     ) -> None:
         self._llm = llm or get_llm_service()
         self._news = news or get_news_service()
         self._tts = tts or get_tts_service()
         self._audio = audio or audio_service
 
-        host_persona = get_host_service().get_host()
+        host_persona = host_persona or get_host_service().get_host()
         self.host = HostAgent(self._llm, persona=host_persona)
 
         # We'll select guest instances per episode run to control guest count
@@ -85,24 +124,28 @@ class PodcastOrchestrator:
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph pipeline once and reuse for every run."""
         graph = StateGraph(OrchestratorState)
-        graph.add_node("fetch_news", self._node_fetch_news)
-        graph.add_node("select_topic", self._node_select_topic)
-        graph.add_node("derive_doc_topic", self._node_derive_doc_topic)
-        graph.add_node("deep_research", self._node_deep_research)
-        graph.add_node("retrieve_rag", self._node_retrieve_rag)
-        graph.add_node("plan_episode", self._node_plan_episode)
-        graph.add_node("generate_dialogue", self._node_generate_dialogue)
-        graph.add_node("generate_article", self._node_generate_article)
-        graph.add_node("synthesize_tts", self._node_synthesize_tts)
-        graph.add_node("stitch_audio", self._node_stitch_audio)
-        graph.add_node("save_episode", self._node_save_episode)
-
-        # Conditional start: document mode bypasses news fetching
+        for name, node in (
+            ("fetch_news", self._node_fetch_news),
+            ("select_topic", self._node_select_topic),
+            ("derive_doc_topic", self._node_derive_doc_topic),
+            ("deep_research", self._node_deep_research),
+            ("retrieve_rag", self._node_retrieve_rag),
+            ("plan_episode", self._node_plan_episode),
+            ("generate_dialogue", self._node_generate_dialogue),
+            ("generate_article", self._node_generate_article),
+            ("synthesize_tts", self._node_synthesize_tts),
+            ("stitch_audio", self._node_stitch_audio),
+            ("save_episode", self._node_save_episode),
+        ):
+            graph.add_node(name, traced_node(name, node))
+
+        # Conditional start: document mode bypasses news fetching; a topic
+        # chosen up front (batch generation) goes straight to research.
         graph.add_conditional_edges(
             START,
-            lambda state: "derive_doc_topic" if state.get(
-                "document_session_id") else "fetch_news",
-            {"derive_doc_topic": "derive_doc_topic", "fetch_news": "fetch_news"},
+            self._route_start,
+            {"derive_doc_topic": "derive_doc_topic", "fetch_news": "fetch_news",
+             "deep_research": "deep_research"},
         )
         graph.add_edge("fetch_news", "select_topic")
         graph.add_edge("select_topic", "deep_research")
@@ -117,6 +160,25 @@ class PodcastOrchestrator:
         graph.add_edge("save_episode", END)
         return graph
 
+    @staticmethod
+    def _route_start(state: OrchestratorState) -> str:
+        if state.get("document_session_id"):
+            return "derive_doc_topic"
+        if state.get("preselected_topic"):
+            return "deep_research"
+        return "fetch_news"
+
+    @staticmethod
+    def _preselected_topic(topic_choice: dict[str, Any]) -> dict[str, Any]:
+        """Copy of a host-picked topic that can go straight to research.
+
+        The run skips news fetching and topic selection, so a choice without
+        search queries researches its topic title.
+        """
+        topic = (topic_choice.get("topic") or "").strip()
+        return {**topic_choice, "topic": topic,
+                "search_queries": list(topic_choice.get("search_queries") or [topic])}
+
     def _build_active_guests(self, selected_guest_names: list[str] | None = None) -> list[GuestAgent]:
         names = [name.strip() for name in (selected_guest_names or [])
                  if name and name.strip()]
@@ -156,11 +218,110 @@ class PodcastOrchestrator:
         selected_guest_names: list[str] | None = None,
         document_session_id: str | None = None,
         user_prompt: str = "",
+        generation_mode: str | None = None,
+        topic_choice: dict[str, Any] | None = None,
+        news_items: list[NewsItem] | None = None,
     ) -> Episode:
-        """Run the complete podcast generation pipeline via LangGraph."""
+        """Run the complete podcast generation pipeline via LangGraph.
+
+        *generation_mode* (``"per_line"`` / ``"segment"``) overrides
+        ``settings.dialogue_generation_mode`` for this run.  A *topic_choice*
+        already made by the host (see :meth:`plan_batch_topics`) skips news
+        fetching and topic selection; *news_items* become the episode's
+        sources.
+        """
+        final_state = await self._run_pipeline(
+            progress,
+            topic=topic,
+            selected_guest_names=selected_guest_names,
+            document_session_id=document_session_id,
+            user_prompt=user_prompt,
+            generation_mode=generation_mode,
+            topic_choice=topic_choice,
+            news_items=news_items,
+        )
+        return final_state["episode"]
+
+    async def preview_script(
+        self,
+        progress: ProgressCallback = None,
+        *,
+        topic: str = "",
+        selected_guest_names: list[str] | None = None,
+        document_session_id: str | None = None,
+        user_prompt: str = "",
+        generation_mode: str | None = None,
+        max_news_results: int | None = None,
+        max_search_queries: int | None = None,
+    ) -> OrchestratorState:
+        """Run the same graph up to the finished dialogue, for script preview.
+
+        Execution is interrupted before ``generate_article``, so no article,
+        audio or saved episode is produced.  The returned state carries the
+        ``episode`` (with dialogue and news sources), ``plan``, ``topic`` and
+        the ``search_queries`` that were researched.
+        """
+        return await self._run_pipeline(
+            progress,
+            topic=topic,
+            selected_guest_names=selected_guest_names,
+            document_session_id=document_session_id,
+            user_prompt=user_prompt,
+            generation_mode=generation_mode,
+            max_news_results=max_news_results,
+            max_search_queries=max_search_queries,
+            preview=True,
+        )
+
+    async def plan_batch_topics(
+        self,
+        count: int,
+        *,
+        max_news_results: int = 10,
+    ) -> tuple[list[NewsItem], list[dict[str, Any]]]:
+        """Fetch today's news once and let the host pick *count* distinct topics.
+
+        Returns the shared news list and the topic choices, each ready to be
+        passed to :meth:`generate_episode` as ``news_items`` / ``topic_choice``.
+        """
+        news_items = await self._news.get_topic_news(
+            topic="", max_results=max_news_results)
+        if not news_items:
+            raise RuntimeError("No news items retrieved from Tavily")
+        agent_run_token = activate_agent_run()
+        try:
+            topics = await self.host.select_topics(
+                news_items,
+                count,
+                recent_topics=self._load_recent_topics(limit=20),
+                topic_index=await self._get_topic_index(),
+            )
+        finally:
+            deactivate_agent_run(agent_run_token)
+        return news_items, topics
+
+    async def _run_pipeline(
+        self,
+        progress: ProgressCallback,
+        *,
+        topic: str,
+        selected_guest_names: list[str] | None,
+        document_session_id: str | None,
+        user_prompt: str,
+        generation_mode: str | None,
+        max_news_results: int | None = None,
+        max_search_queries: int | None = None,
+        preview: bool = False,
+        topic_choice: dict[str, Any] | None = None,
+        news_items: list[NewsItem] | None = None,
+    ) -> OrchestratorState:
+        if topic_choice:
+            topic_choice = self._preselected_topic(topic_choice)
+            topic = topic_choice["topic"]
         active_guests = self._build_active_guests(selected_guest_names)
         selected_names = [guest.persona.name for guest in active_guests]
         speaker_voice_map = self._build_speaker_voice_map(active_guests)
+        label = "script preview" if preview else "episode generation"
 
         normalized_topic = (topic or "").strip()
         episode = Episode(
@@ -169,64 +330,89 @@ class PodcastOrchestrator:
             title=normalized_topic,
             document_session_id=document_session_id,
             user_prompt=user_prompt,
+            news_sources=list(news_items or []),
         )
         output_dir = settings.ensure_output_dir()
-        run_log = EpisodeRunLogger(output_dir / "logs" / f"{episode.id}.jsonl")
-        episode.generation_log_path = str(run_log.log_path)
+        log_name = f"{episode.id}.debug.jsonl" if preview else f"{episode.id}.jsonl"
+        run_log = EpisodeRunLogger(output_dir / "logs" / log_name)
+        episode.generation_log_path = str(run_log.final_path)
 
         # Attach per-episode file handler so all loggers write to the episode log
-        ep_handler = get_episode_file_handler(episode.id, output_dir)
-        logging.getLogger().addHandler(ep_handler)
+        ep_handler = None
+        if not preview:
+            ep_handler = get_episode_file_handler(episode.id, output_dir)
+            logging.getLogger().addHandler(ep_handler)
+
+        telemetry = RunTelemetry(run_log)
+        telemetry_token = telemetry.activate()
+        agent_run_token = activate_agent_run()
 
         run_log.event(
             "pipeline",
-            "episode generation started",
+            f"{label} started",
             payload={"episode_id": episode.id, "guests": episode.guests,
-                     "mode": "document" if document_session_id else "topic"},
+                     "mode": "document" if document_session_id
+                     else "preselected" if topic_choice else "topic",
+                     "generation_mode": generation_mode
+                     or settings.dialogue_generation_mode},
         )
 
+        initial_state: OrchestratorState = {
+            "episode": episode,
+            "topic": (dict(topic_choice) if topic_choice
+                      else {"topic": normalized_topic} if normalized_topic else {}),
+            "detailed_info": [],
+            "dialogue": [],
+            "audio_segments": [],
+            "progress": progress,
+            "run_logger": run_log,
+            "rag_context": "",
+            "active_guests": active_guests,
+            "speaker_voice_map": speaker_voice_map,
+            "document_session_id": document_session_id,
+            "user_prompt": user_prompt,
+            "generation_mode": generation_mode,
+            "preselected_topic": bool(topic_choice),
+        }
+        if max_news_results is not None:
+            initial_state["max_news_results"] = max_news_results
+        if max_search_queries is not None:
+            initial_state["max_search_queries"] = max_search_queries
+
         try:
             final_state = await self._app.ainvoke(
-                {
-                    "episode": episode,
-                    "topic": {"topic": normalized_topic} if normalized_topic else {},
-                    "detailed_info": [],
-                    "dialogue": [],
-                    "audio_segments": [],
-                    "progress": progress,
-                    "run_logger": run_log,
-                    "rag_context": "",
-                    "active_guests": active_guests,
-                    "speaker_voice_map": speaker_voice_map,
-                    "document_session_id": document_session_id,
-                    "user_prompt": user_prompt,
-                }
+                initial_state,
+                interrupt_before=["generate_article"] if preview else None,
             )
             result_episode = final_state["episode"]
+            if preview:
+                result_episode.metrics = telemetry.summary()
             run_log.event(
                 "pipeline",
-                "episode generation completed",
+                f"{label} completed",
                 status="success",
                 payload={
                     "episode_id": result_episode.id,
                     "audio_path": result_episode.audio_path,
                     "duration_seconds": result_episode.duration_seconds,
                     "word_count": result_episode.word_count,
+                    "metrics": result_episode.metrics.get("totals", {}),
                 },
             )
-            return result_episode
+            return final_state
         except Exception as exc:
-            logger.exception("Episode generation failed")
+            logger.exception("%s failed", label.capitalize())
             run_log.exception("pipeline", exc, payload={
                               "episode_id": episode.id})
             raise
         finally:
-            self.host.reset_history()
-            for g in active_guests:
-                g.reset_history()
-            # Remove per-episode file handler
-            logging.getLogger().removeHandler(ep_handler)
-            ep_handler.close()
+            RunTelemetry.deactivate(telemetry_token)
+            deactivate_agent_run(agent_run_token)
+            if ep_handler is not None:
+                # Remove per-episode file handler
+                logging.getLogger().removeHandler(ep_handler)
+                ep_handler.close()
+            await asyncio.to_thread(run_log.close)
 
     async def _emit_progress(
         self,
@@ -287,12 +473,11 @@ class PodcastOrchestrator:
             },
         ]
 
-        import json as _json
-        raw = await self._llm.chat(messages, temperature=0.5, max_tokens=512)
-        raw = raw.strip().lstrip("```json").lstrip("```").rstrip("```").strip()
         try:
-            topic = _json.loads(raw)
-        except Exception:
+            topic = (await chat_json(
+                self._llm, messages, DocumentTopic, name="document_topic",
+                temperature=0.5, max_tokens=512)).model_dump()
+        except StructuredOutputError:
             # Fallback: use user_prompt as topic
             topic_text = user_prompt or "文档内容讨论"
             topic = {
@@ -317,11 +502,15 @@ class PodcastOrchestrator:
         episode = state["episode"]
         user_topic = (episode.topic or "").strip()
         await self._emit_progress(state, "news", f"正在获取{'\u300c' + user_topic + '\u300d相关' if user_topic else ''}资讯…")
-        news_items = await self._news.get_topic_news(topic=user_topic, max_results=10)
+        max_results = state.get("max_news_results", 10)
+        news_items = await shared(
+            ("news", normalize_query(user_topic), max_results),
+            lambda: self._news.get_topic_news(topic=user_topic, max_results=max_results),
+        )
         if not news_items:
             raise RuntimeError("No news items retrieved from Tavily")
 
-        episode.news_sources = news_items
+        episode.news_sources = list(news_items)
         await self._emit_progress(
             state,
             "news",
@@ -361,6 +550,8 @@ class PodcastOrchestrator:
         topic = await self.host.select_topic(
             episode.news_sources,
             recent_topics=recent_topics,
+            topic_index=await self._get_topic_index(),
+            exclude_episode_id=episode.id,
         )
         episode.topic = topic.get("topic", "")
         episode.title = episode.topic
@@ -372,6 +563,16 @@ class PodcastOrchestrator:
         )
         return {"episode": episode, "topic": topic}
 
+    async def _get_topic_index(self) -> TopicIndex | None:
+        """Return the KB topic index (backfilled from saved episodes), if usable."""
+        try:
+            index = get_knowledge_base().topic_index
+            await asyncio.to_thread(index.backfill, settings.output_dir)
+            return index
+        except Exception as exc:
+            logger.warning("Topic index unavailable: %s", exc)
+            return None
+
     def _load_recent_topics(
         self,
         *,
@@ -384,11 +585,11 @@ class PodcastOrchestrator:
             return []
 
         topics: list[str] = []
-        for json_path in sorted(output_dir.glob("*.json"), reverse=True):
+        for json_path in sorted(episode_meta_paths(output_dir), reverse=True):
             try:
                 if exclude_episode_id and json_path.stem == exclude_episode_id:
                     continue
-                episode = Episode.load_json(json_path)
+                episode = EpisodeMeta.load(json_path)
                 topic = (episode.topic or episode.title or "").strip()
                 if topic:
                     topics.append(topic)
@@ -400,9 +601,8 @@ class PodcastOrchestrator:
 
     async def _node_deep_research(self, state: OrchestratorState) -> OrchestratorState:
         topic = state["topic"]
-        session_id = state.get("document_session_id") or (state.get(
-            # type: ignore[union-attr]
-            "episode") or {}).get("document_session_id")
+        session_id = state.get("document_session_id") or getattr(
+            state.get("episode"), "document_session_id", None)
         is_doc_mode = bool(session_id)
 
         await self._emit_progress(
@@ -410,101 +610,123 @@ class PodcastOrchestrator:
             "research",
             "正在深度搜索（优先检索上传文档…）" if is_doc_mode else "正在深度搜索…",
         )
-        search_queries = topic.get("search_queries", [])[:5]
-        detailed_info: list[DetailedInfo] = []
-        kb = get_knowledge_base()
+        search_queries = topic.get("search_queries", [])[
+            :state.get("max_search_queries", 5)]
+        # Queries are independent: research them concurrently.
+        detailed_info: list[DetailedInfo] = await self._generate_concurrently([
+            self._research_query(state, query, i, len(search_queries), session_id)
+            for i, query in enumerate(search_queries)
+        ])
 
-        for i, query in enumerate(search_queries):
-            await self._emit_progress(
-                state,
-                "research",
-                f"深度搜索 ({i + 1}/{len(search_queries)}): {query}",
-                payload={"query": query, "index": i +
-                         1, "total": len(search_queries)},
-            )
+        await self._emit_progress(
+            state,
+            "research",
+            f"完成{len(detailed_info)}轮深度搜索",
+            payload={"query_count": len(detailed_info)},
+        )
+        return {"detailed_info": detailed_info, "search_queries": search_queries}
 
-            # 1) In document mode: retrieve from task-scoped uploaded docs first
-            doc_snippets: list[str] = []
-            if is_doc_mode and session_id:
-                doc_docs = await kb.query(
+    async def _research_query(
+        self,
+        state: OrchestratorState,
+        query: str,
+        index: int,
+        total: int,
+        session_id: str | None,
+    ) -> DetailedInfo:
+        """Research one query: uploaded docs and KB first, Tavily when needed."""
+        is_doc_mode = bool(session_id)
+        kb = get_knowledge_base()
+        await self._emit_progress(
+            state,
+            "research",
+            f"深度搜索 ({index + 1}/{total}): {query}",
+            payload={"query": query, "index": index + 1, "total": total},
+        )
+
+        # 1) In document mode: retrieve from task-scoped uploaded docs first
+        doc_snippets: list[str] = []
+        if is_doc_mode and session_id:
+            doc_docs = await shared(
+                ("kb.query", query, 5, KNOWLEDGE_SCOPE_TASK, session_id),
+                lambda: kb.query(
                     query,
                     top_k=5,
                     collection=BACKGROUND_MATERIAL,
                     scope=KNOWLEDGE_SCOPE_TASK,
                     task_id=session_id,
-                )
-                doc_snippets = [d.get("content", "")
-                                for d in doc_docs if d.get("content")]
+                ),
+            )
+            doc_snippets = [d.get("content", "")
+                            for d in doc_docs if d.get("content")]
 
-            # 2) Retrieve from long-term global RAG
-            rag_docs = await kb.query(
+        # 2) Retrieve from long-term global RAG
+        rag_docs = await shared(
+            ("kb.query", query, 4, KNOWLEDGE_SCOPE_GLOBAL, None),
+            lambda: kb.query(
                 query,
                 top_k=4,
                 collection=BACKGROUND_MATERIAL,
                 scope=KNOWLEDGE_SCOPE_GLOBAL,
+            ),
+        )
+        rag_snippets = [d.get("content", "")
+                        for d in rag_docs if d.get("content")]
+
+        # Merge: document snippets take priority
+        combined_snippets = doc_snippets + \
+            [s for s in rag_snippets if s not in doc_snippets]
+
+        # 3) Let host agent decide whether fresh web search is needed
+        decision = await self.host.decide_need_fresh_search(query, combined_snippets)
+        need_fresh_search = bool(decision.get("need_fresh_search", False))
+        if not combined_snippets:
+            need_fresh_search = True
+
+        if need_fresh_search:
+            focus_query = decision.get("focus", "").strip() or query
+            info = await shared(
+                ("search_detail", normalize_query(focus_query)),
+                lambda: self._news.search_detail(focus_query),
             )
-            rag_snippets = [d.get("content", "")
-                            for d in rag_docs if d.get("content")]
-
-            # Merge: document snippets take priority
-            combined_snippets = doc_snippets + \
-                [s for s in rag_snippets if s not in doc_snippets]
-
-            # 3) Let host agent decide whether fresh web search is needed
-            decision = await self.host.decide_need_fresh_search(query, combined_snippets)
-            need_fresh_search = bool(decision.get("need_fresh_search", False))
-            if not combined_snippets:
-                need_fresh_search = True
-
-            if need_fresh_search:
-                focus_query = decision.get("focus", "").strip() or query
-                info = await self._news.search_detail(focus_query)
-                info_source = "tavily"
-                # Prepend document context to the answer if available
-                if doc_snippets:
-                    doc_context = "\n\n".join(
-                        f"- {s[:300]}" for s in doc_snippets[:3])
-                    info = DetailedInfo(
-                        query=info.query,
-                        answer=(
-                            f"【文档内容】\n{doc_context}\n\n【网络信息】\n{info.answer or ''}" if info.answer else f"【文档内容】\n{doc_context}"),
-                        results=info.results,
-                    )
-            else:
-                combined_answer = "\n\n".join(
-                    f"- {txt[:300]}" for txt in combined_snippets[:5])
-                source_label = "文档内容及知识库" if is_doc_mode else "知识库历史资料"
+            info_source = "tavily"
+            # Prepend document context to the answer if available
+            if doc_snippets:
+                doc_context = "\n\n".join(
+                    f"- {s[:300]}" for s in doc_snippets[:3])
                 info = DetailedInfo(
-                    query=query,
-                    answer=f"基于{source_label}整理：\n{combined_answer}" if combined_answer else "",
-                    results=[],
+                    query=info.query,
+                    answer=(
+                        f"【文档内容】\n{doc_context}\n\n【网络信息】\n{info.answer or ''}" if info.answer else f"【文档内容】\n{doc_context}"),
+                    results=info.results,
                 )
-                info_source = "rag+doc" if is_doc_mode else "rag"
-
-            detailed_info.append(info)
-            state["run_logger"].event(
-                "research",
-                "search result captured",
-                payload={
-                    "query": query,
-                    "source": info_source,
-                    "need_fresh_search": need_fresh_search,
-                    "decision_reason": decision.get("reason", ""),
-                    "rag_hit_count": len(rag_docs),
-                    "doc_hit_count": len(doc_snippets),
-                    "answer": info.answer,
-                    "result_count": len(info.results),
-                    "result_titles": [item.title for item in info.results],
-                },
+        else:
+            combined_answer = "\n\n".join(
+                f"- {txt[:300]}" for txt in combined_snippets[:5])
+            source_label = "文档内容及知识库" if is_doc_mode else "知识库历史资料"
+            info = DetailedInfo(
+                query=query,
+                answer=f"基于{source_label}整理：\n{combined_answer}" if combined_answer else "",
+                results=[],
             )
+            info_source = "rag+doc" if is_doc_mode else "rag"
 
-        await self._emit_progress(
-            state,
+        state["run_logger"].event(
             "research",
-            f"完成{len(detailed_info)}轮深度搜索",
-            payload={"query_count": len(detailed_info)},
+            "search result captured",
+            payload={
+                "query": query,
+                "source": info_source,
+                "need_fresh_search": need_fresh_search,
+                "decision_reason": decision.get("reason", ""),
+                "rag_hit_count": len(rag_docs),
+                "doc_hit_count": len(doc_snippets),
+                "answer": info.answer,
+                "result_count": len(info.results),
+                "result_titles": [item.title for item in info.results],
+            },
         )
-        return {"detailed_info": detailed_info}
+        return info
 
     async def _node_retrieve_rag(self, state: OrchestratorState) -> OrchestratorState:
         """Retrieve relevant knowledge from the RAG database."""
@@ -519,8 +741,9 @@ class PodcastOrchestrator:
         await self._emit_progress(state, "rag", "正在检索知识库…")
         try:
             kb = get_knowledge_base()
-            rag_context = await kb.build_rag_context(
-                topic_text, top_k_per_collection=3,
+            rag_context = await shared(
+                ("kb.rag_context", topic_text, 3),
+                lambda: kb.build_rag_context(topic_text, top_k_per_collection=3),
             )
             # In document mode: prepend task-scoped document context
             if session_id:
@@ -607,11 +830,19 @@ class PodcastOrchestrator:
                 payload=payload,
             ),
             run_logger=state["run_logger"],
+            live_episode_id=episode.id,
         )
         self._persist_segment_audio_files(episode, dialogue, audio_segments)
         await self._emit_progress(state, "audio", "语音合成全部完成")
         return {"audio_segments": audio_segments, "episode": episode}
 
+    @staticmethod
+    def _prepare_audio_delivery(path: Path) -> None:
+        """Start encoding the compressed copy players are served."""
+        from backend.services.audio_delivery import get_audio_transcoder
+
+        get_audio_transcoder().prepare(path)
+
     async def _node_stitch_audio(self, state: OrchestratorState) -> OrchestratorState:
         episode = state["episode"]
         audio_segments = state.get("audio_segments", [])
@@ -629,6 +860,7 @@ class PodcastOrchestrator:
         )
         episode.audio_path = str(output_path)
         episode.duration_seconds = duration
+        self._prepare_audio_delivery(output_path)
 
         await self._emit_progress(
             state,
@@ -712,7 +944,7 @@ class PodcastOrchestrator:
                 {"role": "user", "content": user_prompt},
             ]
             article_text = await self._llm.chat(
-                messages, temperature=0.75, max_tokens=3000
+                messages, temperature=0.75, max_tokens=3000, call_site="article"
             )
             article_text = (article_text or "").strip()
 
@@ -737,6 +969,9 @@ class PodcastOrchestrator:
     async def _node_save_episode(self, state: OrchestratorState) -> OrchestratorState:
         episode = state["episode"]
         output_dir = settings.ensure_output_dir()
+        run = current_run()
+        if run is not None:
+            episode.metrics = run.summary()
         metadata_path = episode.save_json(output_dir)
 
         # Ingest episode into knowledge base for future RAG retrieval
@@ -776,11 +1011,13 @@ class PodcastOrchestrator:
     ) -> list[DialogueLine]:
         """Generate the full dialogue script turn by turn with interruption simulation."""
         dialogue: list[DialogueLine] = []
-        shared_context: list[dict[str, str]] = []
 
         rag_context = state.get("rag_context", "")
-        bg_info = self._build_background_info(plan, detailed_info, rag_context)
-        shared_context.append({"role": "system", "content": bg_info})
+        bg_info = self._build_background_info(
+            plan, detailed_info, rag_context,
+            max_tokens=settings.dialogue_brief_max_tokens,
+        )
+        shared_context = DialogueContext(bg_info, llm=self._llm)
 
         active_guests = state.get("active_guests", [])
         speaker_voice_map = state.get("speaker_voice_map", {})
@@ -793,8 +1030,7 @@ class PodcastOrchestrator:
             if mapped_voice:
                 line.voice_id = mapped_voice
             dialogue.append(line)
-            shared_context.append(
-                {"role": "assistant", "content": f"[{line.speaker}]: {line.text}"})
+            shared_context.append(line.speaker, line.text)
             state["run_logger"].event(
                 "dialogue",
                 "line generated",
@@ -816,7 +1052,7 @@ class PodcastOrchestrator:
         )
 
         opening_hint = plan.opening_text()
-        trimmed_open = self._trim_shared_context(shared_context)
+        trimmed_open = shared_context.build()
         opening_line = await self.host.generate_line(
             trimmed_open,
             f"现在是节目开场。请紧接刚才的开场白，用一种轻松自然的方式带出今天的话题「{plan.topic}」，"
@@ -826,6 +1062,38 @@ class PodcastOrchestrator:
         )
         _append_line(opening_line)
 
+        # Next talking point's host intro, drafted concurrently with the
+        # preceding follow-up (see ``dialogue_speculative_turns``).
+        speculative_intro: asyncio.Future[DialogueLine] | None = None
+
+        def _discard(task: asyncio.Future | None) -> None:
+            if task is not None and not task.done():
+                task.cancel()
+
+        def _log_regenerated(kind: str, line: DialogueLine) -> None:
+            state["run_logger"].event(
+                "dialogue",
+                "speculative turn regenerated",
+                payload={"kind": kind, "speaker": line.speaker, "text": line.text},
+            )
+
+        def _reached_word_target() -> bool:
+            current_words = sum(len(line.text) for line in dialogue)
+            if current_words < settings.target_word_count_max:
+                return False
+            logger.info(
+                "Reached target word count (%d), wrapping up.", current_words)
+            state["run_logger"].event(
+                "dialogue",
+                "target word count reached",
+                payload={"current_words": current_words,
+                         "target_max": settings.target_word_count_max},
+            )
+            return True
+
+        generation_mode = (
+            state.get("generation_mode") or settings.dialogue_generation_mode)
+
         # Track how many interruptions have occurred to avoid overuse
         interruption_count = 0
         max_interruptions = 2  # At most 2 interruptions per episode
@@ -845,61 +1113,64 @@ class PodcastOrchestrator:
                 payload={"talking_point": talking_point, "index": tp_idx + 1},
             )
 
-            # Host introduces the talking point — technique varies by arc position
-            # Techniques based on podcast research:
-            #   exposition   → anecdote hook / life-scenario opener
-            #   rising_action → contrast probe ("before vs now") / challenge assumption
-            #   climax        → emotional recall / hypothetical scenario / reveal unexpected_angle
-            #   falling_action → synthesize conflict, pivot toward resolution
-            if arc_pos == "exposition":
-                intro_technique = (
-                    f"引入讨论要点：「{talking_point}」。"
-                    f"开场用一个生活化场景或反直觉事实做钩子，让听众立刻感到「这和我有关」。"
-                    f"然后向{guest_names[0]}抛出第一个问题，要具体，不要泛问「你怎么看」。"
-                    f"背景补充方向：{depth_hint or '把这件事的来龙去脉交代清楚'}。"
-                )
-            elif arc_pos == "rising_action":
-                intro_technique = (
-                    f"深化讨论：「{talking_point}」。"
-                    f"用对比性追问打开空间——可以是「一年前你们行业怎么看这问题？现在变了吗？」"
-                    f"或者挑战上一轮的某个假设：「等等，那个前提站得住脚吗？」"
-                    f"可能的冲突点：{conflict_setup or '不同利益方对这件事的权重判断完全不同'}。"
-                    f"需要的案例或数据：{example_needed or '具体到人、到事的佐证'}。"
-                )
-            elif arc_pos == "climax":
-                unexpected = plan.unexpected_angle or "这件事背后有一个大家没注意到的变量"
-                intro_technique = (
-                    f"全片高潮时刻——讨论要点：「{talking_point}」。"
-                    f"现在抛出今天节目最有冲击力的角度：{unexpected}。"
-                    f"可用情感召回法：「带我回到你第一次意识到这个问题的时候，当时发生了什么？」"
-                    f"或设定极端假设场景让嘉宾决策，探测价值观真实边界。"
-                    f"这里要有张力，不要急着和稀泥——让不同观点的碰撞多发酵一会儿。"
-                    f"冲突设计：{conflict_setup or '此处应有明确的立场分叉'}。"
+            # Determine speaking order and which guests speak this round
+            order = self._get_speaking_order(tp_idx, guest_names)
+            speakers_this_round = order[:2] if tp_idx < len(
+                plan.talking_points) - 1 else order
+
+            if generation_mode == "segment" and speakers_this_round:
+                # One structured call writes the whole exchange; a bad
+                # response falls through to the per-line path below.
+                _discard(speculative_intro)
+                speculative_intro = None
+                interrupter = None
+                if (interruption_count < max_interruptions and tp_idx > 0
+                        and len(speakers_this_round) > 1
+                        and random.random() < 0.35):
+                    interrupter = speakers_this_round[1]
+                segment = await self.host.generate_segment(
+                    shared_context.build(),
+                    self._segment_instruction(
+                        plan, tp_idx, speakers_this_round, guest_map,
+                        guest_names, interrupter=interrupter),
+                    [self.host.persona] + [
+                        guest_map[name].persona for name in speakers_this_round],
+                    cast=[self.host.persona] + [
+                        guest_map[name].persona for name in guest_names],
                 )
-            else:  # falling_action / resolution
-                intro_technique = (
-                    f"进入收尾阶段：「{talking_point}」。"
-                    f"先快速总结刚才分歧的核心：「你们真正的分歧其实是在……」"
-                    f"然后追问影响与后果：这些争议对普通人意味着什么？短期vs长期如何？"
-                    f"追问方向：{depth_hint or '把讨论落回到听众的真实生活'}。"
+                if segment is not None:
+                    for line in segment:
+                        _append_line(line)
+                    if interrupter is not None:
+                        interruption_count += 1
+                    if _reached_word_target():
+                        break
+                    continue
+                state["run_logger"].event(
+                    "dialogue",
+                    "segment generation failed, falling back to per-line",
+                    status="warning",
+                    payload={"talking_point": talking_point},
                 )
 
             # tp_idx == 0: the opening_line already introduced the topic and asked
             # the first question, so skip an extra host intro to avoid 3+ consecutive
             # host lines before any guest has spoken.
             if tp_idx > 0:
-                trimmed_ctx = self._trim_shared_context(shared_context)
-                host_intro = await self.host.generate_line(
-                    trimmed_ctx,
-                    intro_technique + "\n不要说'接下来我们来讨论'这种过渡套话。",
-                )
+                intro_instruction = self._talking_point_intro_instruction(
+                    plan, tp_idx, guest_names)
+                host_intro = None
+                if speculative_intro is not None:
+                    host_intro = await speculative_intro
+                    speculative_intro = None
+                    if self._turns_conflict(host_intro.text, [dialogue[-1].text]):
+                        _log_regenerated("host_intro", host_intro)
+                        host_intro = None
+                if host_intro is None:
+                    host_intro = await self.host.generate_line(
+                        shared_context.build(), intro_instruction)
                 _append_line(host_intro)
 
-            # Determine speaking order and which guests speak this round
-            order = self._get_speaking_order(tp_idx, guest_names)
-            speakers_this_round = order[:2] if tp_idx < len(
-                plan.talking_points) - 1 else order
-
             # Track speakers who already contributed during an interruption so
             # their normal turn is not generated again (would cause duplicate lines).
             already_spoken_this_round: set[str] = set()
@@ -927,7 +1198,7 @@ class PodcastOrchestrator:
                     interrupter = guest_map[interrupter_name]
 
                     # First speaker starts (will be cut short)
-                    trimmed_intr = self._trim_shared_context(shared_context)
+                    trimmed_intr = shared_context.build()
                     start_line = await guest.generate_line(
                         trimmed_intr,
                         f"你刚要回应关于「{talking_point}」的讨论，但你的发言会被{interrupter_name}打断。"
@@ -938,7 +1209,7 @@ class PodcastOrchestrator:
                     _append_line(start_line)
 
                     # Interrupter cuts in
-                    trimmed_intr2 = self._trim_shared_context(shared_context)
+                    trimmed_intr2 = shared_context.build()
                     interrupt_line = await interrupter.generate_line(
                         trimmed_intr2,
                         f"你忍不住打断了{guest_name}的发言！可能因为你太想反驳、太兴奋，"
@@ -949,7 +1220,7 @@ class PodcastOrchestrator:
                     _append_line(interrupt_line)
 
                     # Original speaker responds / continues
-                    trimmed_intr3 = self._trim_shared_context(shared_context)
+                    trimmed_intr3 = shared_context.build()
                     resume_line = await guest.generate_line(
                         trimmed_intr3,
                         f"你被{interrupter_name}打断了。现在你可以接着说或者回应ta的观点。"
@@ -1012,54 +1283,42 @@ class PodcastOrchestrator:
                         f"{depth_prompt}{example_prompt}{arc_guidance}"
                     )
 
-                trimmed_ctx_guest = self._trim_shared_context(shared_context)
+                trimmed_ctx_guest = shared_context.build()
                 guest_line = await guest.generate_line(trimmed_ctx_guest, instruction)
                 _append_line(guest_line)
 
             # Host follow-up / transition
             if tp_idx < len(plan.talking_points) - 1:
-                next_talking_point = plan.talking_point_text(tp_idx + 1)
-                next_arc = plan.arc_position(tp_idx + 1)
-                # Vary follow-up style by upcoming arc position
-                if next_arc == "climax":
-                    followup_style = (
-                        f"先快速点出刚才讨论的核心分歧：「你们真正不同的地方是……」。"
-                        f"然后用一个尖锐问题引出「{next_talking_point}」——这是今天最关键的问题，"
-                        f"预告一下它的颠覆性，让听众想继续听。"
-                    )
-                elif next_arc == "falling_action":
-                    followup_style = (
-                        f"对刚才的讨论做一个「不总结的提炼」——点出最重要的一个洞见，"
-                        f"然后自然引向「{next_talking_point}」，把讨论的余温带进去。"
-                    )
-                else:
-                    followup_style = (
-                        f"对嘉宾刚才的观点做一个简短、有态度的回应。"
-                        f"可以同意并补充、也可以质疑并追问，或点出核心分歧。"
-                        f"然后自然过渡到下一个讨论方向「{next_talking_point}」，"
-                        f"不要用'接下来'、'让我们转向'这类套话。"
-                    )
-                trimmed_followup = self._trim_shared_context(shared_context)
-                followup = await self.host.generate_line(trimmed_followup, followup_style)
+                followup_style = self._talking_point_transition_instruction(
+                    plan, tp_idx + 1)
+                trimmed_followup = shared_context.build()
+                if settings.dialogue_speculative_turns:
+                    # The next intro barely depends on this transition line:
+                    # draft it from the same snapshot while the follow-up runs.
+                    speculative_intro = asyncio.ensure_future(self.host.generate_line(
+                        trimmed_followup,
+                        self._talking_point_intro_instruction(
+                            plan, tp_idx + 1, guest_names),
+                    ))
+                    speculative_intro.add_done_callback(
+                        lambda task: task.cancelled() or task.exception())
+                try:
+                    followup = await self.host.generate_line(trimmed_followup, followup_style)
+                except BaseException:
+                    _discard(speculative_intro)
+                    raise
                 _append_line(followup)
 
-            current_words = sum(len(line.text) for line in dialogue)
-            if current_words >= settings.target_word_count_max:
-                logger.info(
-                    "Reached target word count (%d), wrapping up.", current_words)
-                state["run_logger"].event(
-                    "dialogue",
-                    "target word count reached",
-                    payload={"current_words": current_words,
-                             "target_max": settings.target_word_count_max},
-                )
+            if _reached_word_target():
+                _discard(speculative_intro)
+                speculative_intro = None
                 break
 
         # --- Pre-closing: each guest gives a brief final take ---
         # This mirrors the "Change Point" technique from Sawatsky: ask each person
         # for their single most important changed perspective from this conversation.
         if guest_names:
-            trimmed_pretake = self._trim_shared_context(shared_context)
+            trimmed_pretake = shared_context.build()
             host_pretake = await self.host.generate_line(
                 trimmed_pretake,
                 f"节目即将结束，请每位嘉宾说一句话——不是总结，而是：今天这个讨论里，"
@@ -1068,21 +1327,41 @@ class PodcastOrchestrator:
             )
             _append_line(host_pretake)
 
-            for final_guest_name in guest_names:
-                final_guest = guest_map[final_guest_name]
-                trimmed_final = self._trim_shared_context(shared_context)
-                final_line = await final_guest.generate_line(
-                    trimmed_final,
+            def _final_take_instruction(final_guest: GuestAgent) -> str:
+                return (
                     f"节目将要结束了。用一到两句话说一个「变革点」——今天的讨论里"
                     f"有没有让你改变看法的时刻？或者你带走的一个还没想清楚的问题？"
                     f"要真实、具体，不要做总结发言，不要说'感谢主持人'之类的套话。"
-                    f"体现你{final_guest.persona.occupation}的独特视角。",
+                    f"体现你{final_guest.persona.occupation}的独特视角。"
                 )
+
+            final_guests = [guest_map[name] for name in guest_names]
+            drafts: list[DialogueLine | None] = [None] * len(final_guests)
+            if settings.dialogue_speculative_turns:
+                # Each take answers the host's question, not the other guests:
+                # draft them all from one snapshot.
+                snapshot = shared_context.build()
+                drafts = await self._generate_concurrently([
+                    final_guest.generate_line(
+                        snapshot, _final_take_instruction(final_guest))
+                    for final_guest in final_guests
+                ])
+
+            accepted_takes: list[str] = []
+            for final_guest, final_line in zip(final_guests, drafts):
+                if final_line is not None and self._turns_conflict(
+                        final_line.text, accepted_takes):
+                    _log_regenerated("final_take", final_line)
+                    final_line = None
+                if final_line is None:
+                    final_line = await final_guest.generate_line(
+                        shared_context.build(), _final_take_instruction(final_guest))
                 _append_line(final_line)
+                accepted_takes.append(final_line.text)
 
         # --- Closing ---
         closing_hint = plan.closing_text()
-        trimmed_close = self._trim_shared_context(shared_context)
+        trimmed_close = shared_context.build()
         closing_line = await self.host.generate_line(
             trimmed_close,
             f"节目收尾。不要做长篇总结，也不要说'让我们拭目以待'之类的套话。"
@@ -1091,8 +1370,188 @@ class PodcastOrchestrator:
         )
         _append_line(closing_line)
 
+        await shared_context.aclose()
         return dialogue
 
+    @staticmethod
+    async def _generate_concurrently(calls: list[Awaitable[_T]]) -> list[_T]:
+        """Await generations together; cancel the rest if one fails."""
+        tasks = [asyncio.ensure_future(call) for call in calls]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @staticmethod
+    def _turns_conflict(text: str, previous: list[str]) -> bool:
+        """Cheap coherence check for a turn drafted without seeing *previous*.
+
+        Flags a draft that largely repeats one of those lines (character
+        bigram overlap), which is how a speculatively generated turn most
+        often clashes with the turn that was generated alongside it.
+        """
+        def _bigrams(value: str) -> set[str]:
+            value = re.sub(r"<#[\d.]+#>|\s+", "", value)
+            return {value[i:i + 2] for i in range(len(value) - 1)}
+
+        draft = _bigrams(text)
+        if not draft:
+            return False
+        for other in previous:
+            other_grams = _bigrams(other)
+            if not other_grams:
+                continue
+            overlap = len(draft & other_grams) / min(len(draft), len(other_grams))
+            if overlap >= settings.dialogue_speculative_max_overlap:
+                return True
+        return False
+
+    @staticmethod
+    def _talking_point_intro_instruction(
+        plan: EpisodePlan, tp_idx: int, guest_names: list[str],
+    ) -> str:
+        """Host instruction for introducing talking point *tp_idx*."""
+        talking_point = plan.talking_point_text(tp_idx)
+        depth_hint = plan.talking_point_depth_hint(tp_idx)
+        conflict_setup = plan.talking_point_conflict_setup(tp_idx)
+        example_needed = plan.talking_point_example_needed(tp_idx)
+        arc_pos = plan.arc_position(tp_idx)
+
+        # Host introduces the talking point — technique varies by arc position
+        # Techniques based on podcast research:
+        #   exposition   → anecdote hook / life-scenario opener
+        #   rising_action → contrast probe ("before vs now") / challenge assumption
+        #   climax        → emotional recall / hypothetical scenario / reveal unexpected_angle
+        #   falling_action → synthesize conflict, pivot toward resolution
+        if arc_pos == "exposition":
+            intro_technique = (
+                f"引入讨论要点：「{talking_point}」。"
+                f"开场用一个生活化场景或反直觉事实做钩子，让听众立刻感到「这和我有关」。"
+                f"然后向{guest_names[0]}抛出第一个问题，要具体，不要泛问「你怎么看」。"
+                f"背景补充方向：{depth_hint or '把这件事的来龙去脉交代清楚'}。"
+            )
+        elif arc_pos == "rising_action":
+            intro_technique = (
+                f"深化讨论：「{talking_point}」。"
+                f"用对比性追问打开空间——可以是「一年前你们行业怎么看这问题？现在变了吗？」"
+                f"或者挑战上一轮的某个假设：「等等，那个前提站得住脚吗？」"
+                f"可能的冲突点：{conflict_setup or '不同利益方对这件事的权重判断完全不同'}。"
+                f"需要的案例或数据：{example_needed or '具体到人、到事的佐证'}。"
+            )
+        elif arc_pos == "climax":
+            unexpected = plan.unexpected_angle or "这件事背后有一个大家没注意到的变量"
+            intro_technique = (
+                f"全片高潮时刻——讨论要点：「{talking_point}」。"
+                f"现在抛出今天节目最有冲击力的角度：{unexpected}。"
+                f"可用情感召回法：「带我回到你第一次意识到这个问题的时候，当时发生了什么？」"
+                f"或设定极端假设场景让嘉宾决策，探测价值观真实边界。"
+                f"这里要有张力，不要急着和稀泥——让不同观点的碰撞多发酵一会儿。"
+                f"冲突设计：{conflict_setup or '此处应有明确的立场分叉'}。"
+            )
+        else:  # falling_action / resolution
+            intro_technique = (
+                f"进入收尾阶段：「{talking_point}」。"
+                f"先快速总结刚才分歧的核心：「你们真正的分歧其实是在……」"
+                f"然后追问影响与后果：这些争议对普通人意味着什么？短期vs长期如何？"
+                f"追问方向：{depth_hint or '把讨论落回到听众的真实生活'}。"
+            )
+        return intro_technique + "\n不要说'接下来我们来讨论'这种过渡套话。"
+
+    @staticmethod
+    def _talking_point_transition_instruction(plan: EpisodePlan, next_idx: int) -> str:
+        """Host instruction for wrapping up and leading into *next_idx*."""
+        next_talking_point = plan.talking_point_text(next_idx)
+        next_arc = plan.arc_position(next_idx)
+        # Vary follow-up style by upcoming arc position
+        if next_arc == "climax":
+            return (
+                f"先快速点出刚才讨论的核心分歧：「你们真正不同的地方是……」。"
+                f"然后用一个尖锐问题引出「{next_talking_point}」——这是今天最关键的问题，"
+                f"预告一下它的颠覆性，让听众想继续听。"
+            )
+        if next_arc == "falling_action":
+            return (
+                f"对刚才的讨论做一个「不总结的提炼」——点出最重要的一个洞见，"
+                f"然后自然引向「{next_talking_point}」，把讨论的余温带进去。"
+            )
+        return (
+            f"对嘉宾刚才的观点做一个简短、有态度的回应。"
+            f"可以同意并补充、也可以质疑并追问，或点出核心分歧。"
+            f"然后自然过渡到下一个讨论方向「{next_talking_point}」，"
+            f"不要用'接下来'、'让我们转向'这类套话。"
+        )
+
+    def _segment_instruction(
+        self,
+        plan: EpisodePlan,
+        tp_idx: int,
+        speakers: list[str],
+        guest_map: dict[str, GuestAgent],
+        guest_names: list[str],
+        *,
+        interrupter: str | None = None,
+    ) -> str:
+        """Instruction for writing talking point *tp_idx* in one call.
+
+        Mirrors the per-line turn structure: host intro (except for the first
+        point, which the opening already set up), the guests' turns with an
+        optional interruption, then the host's transition to the next point.
+        """
+        host = self.host.name
+        talking_point = plan.talking_point_text(tp_idx)
+        depth_hint = plan.talking_point_depth_hint(tp_idx)
+        example_needed = plan.talking_point_example_needed(tp_idx)
+        arc_guidance = {
+            "exposition": "嘉宾先把第一手观察讲清楚，用具体案例打底。",
+            "rising_action": "每位嘉宾都要在前一位的基础上加新信息量，要有增量或转折。",
+            "climax": "这是全片最重要的时刻，嘉宾要把最核心的判断说出来，敢于暴露真实困惑或反直觉立场。",
+            "falling_action": "嘉宾回到自己最在意的核心论点，给出可操作的具体判断。",
+        }.get(plan.arc_position(tp_idx), "")
+
+        order: list[str] = [host] if tp_idx > 0 else []
+        steps: list[str] = []
+        if tp_idx > 0:
+            steps.append(
+                f"{host}开场：" + self._talking_point_intro_instruction(
+                    plan, tp_idx, guest_names))
+        else:
+            steps.append(f"主持人已经在开场抛出了第一个问题，直接由{speakers[0]}回应。")
+
+        remaining = list(speakers)
+        if interrupter is not None:
+            first = speakers[0]
+            order += [first, interrupter, first]
+            remaining = [name for name in speakers if name not in (first, interrupter)]
+            steps.append(
+                f"{first}刚说了20-40字就被{interrupter}打断（句子可以不完整，用「——」或「…」结尾）；"
+                f"{interrupter}用自然口语切入（如『不好意思打断一下』），40-80字给出核心观点；"
+                f"{first}接着回应被打断这件事，再把自己的观点说完。"
+            )
+        for name in remaining:
+            order.append(name)
+            persona = guest_map[name].persona
+            steps.append(
+                f"{name}从{persona.occupation}的真实经验出发，"
+                f"立场：{persona.stance_bias or '保持审慎但有判断'}。"
+            )
+        if tp_idx < len(plan.talking_points) - 1:
+            order.append(host)
+            steps.append(f"{host}收尾过渡："
+                         + self._talking_point_transition_instruction(plan, tp_idx + 1))
+
+        hints = "".join([
+            f"深挖方向：{depth_hint}。" if depth_hint else "",
+            f"需要的案例或数据：{example_needed}。" if example_needed else "",
+            arc_guidance,
+        ])
+        return (
+            f"讨论要点：「{talking_point}」。{hints}\n"
+            f"【发言顺序】{' → '.join(order)}\n"
+            + "\n".join(f"{i + 1}. {step}" for i, step in enumerate(steps))
+        )
+
     async def _generate_article_text(self, episode: "Episode") -> str:
         """Generate a deep-read article from the episode content.
 
@@ -1149,6 +1608,7 @@ class PodcastOrchestrator:
             ],
             temperature=0.75,
             max_tokens=3000,
+            call_site="article",
         )
         return (article_text or "").strip()
 
@@ -1177,10 +1637,12 @@ class PodcastOrchestrator:
 
         output_dir = settings.ensure_output_dir()
         run_log = EpisodeRunLogger(output_dir / "logs" / f"{episode.id}.jsonl")
-        episode.generation_log_path = str(run_log.log_path)
+        episode.generation_log_path = str(run_log.final_path)
 
         ep_handler = get_episode_file_handler(episode.id, output_dir)
         logging.getLogger().addHandler(ep_handler)
+        telemetry = RunTelemetry(run_log)
+        telemetry_token = telemetry.activate()
 
         async def _emit(stage: str, detail: str, payload: dict[str, Any] | None = None):
             logger.info("[%s] %s", stage, detail)
@@ -1202,40 +1664,46 @@ class PodcastOrchestrator:
                     line.speech_rate = 1.0
 
             await _emit("audio", "正在实时合成语音…")
-            audio_segments = await self._synthesize_dialogue_segments(
-                episode.dialogue,
-                progress=lambda detail, payload: _emit(
-                    "audio", detail, payload),
-                run_logger=run_log,
-            )
-            self._persist_segment_audio_files(
-                episode,
-                episode.dialogue,
-                audio_segments,
-            )
+            async with span(SPAN_NODE, "synthesize_tts"):
+                audio_segments = await self._synthesize_dialogue_segments(
+                    episode.dialogue,
+                    progress=lambda detail, payload: _emit(
+                        "audio", detail, payload),
+                    run_logger=run_log,
+                    live_episode_id=episode.id,
+                )
+                self._persist_segment_audio_files(
+                    episode,
+                    episode.dialogue,
+                    audio_segments,
+                )
 
             await _emit("audio", "正在拼接音频…")
             audio_ext = settings.minimax_audio_format.lower()
             if audio_ext not in {"mp3", "wav"}:
                 audio_ext = "wav"
             output_path = output_dir / f"{episode.id}.{audio_ext}"
-            duration = await self._audio.stitch_episode(
-                audio_segments=audio_segments,
-                output_path=str(output_path),
-            )
+            async with span(SPAN_NODE, "stitch_audio"):
+                duration = await self._audio.stitch_episode(
+                    audio_segments=audio_segments,
+                    output_path=str(output_path),
+                )
             episode.audio_path = str(output_path)
             episode.duration_seconds = duration
+            self._prepare_audio_delivery(output_path)
 
             # Auto-generate deep-read article (no user confirmation required)
             await _emit("article", "正在撰写本期深度文章…")
             try:
-                article_text = await self._generate_article_text(episode)
+                async with span(SPAN_NODE, "generate_article"):
+                    article_text = await self._generate_article_text(episode)
                 episode.article = article_text
                 await _emit("article", f"深度文章撰写完成（{len(article_text)} 字）")
             except Exception as exc:
                 logger.warning("Article generation failed: %s", exc)
                 episode.article = ""
 
+            episode.metrics = telemetry.summary()
             metadata_path = episode.save_json(output_dir)
             await _emit(
                 "done",
@@ -1249,8 +1717,10 @@ class PodcastOrchestrator:
             )
             return episode
         finally:
+            RunTelemetry.deactivate(telemetry_token)
             logging.getLogger().removeHandler(ep_handler)
             ep_handler.close()
+            await asyncio.to_thread(run_log.close)
 
     async def retime_episode_audio(
         self,
@@ -1265,6 +1735,8 @@ class PodcastOrchestrator:
 
         ep_handler = get_episode_file_handler(episode.id, output_dir)
         logging.getLogger().addHandler(ep_handler)
+        telemetry = RunTelemetry(run_log)
+        telemetry_token = telemetry.activate()
 
         async def _emit(stage: str, detail: str, payload: dict[str, Any] | None = None):
             logger.info("[%s] %s", stage, detail)
@@ -1333,13 +1805,17 @@ class PodcastOrchestrator:
                     audio_ext = "wav"
                 output_path = output_dir / f"{episode.id}.{audio_ext}"
 
-            duration = await self._audio.stitch_episode_from_local_segments(
-                segment_items=segment_items,
-                output_path=str(output_path),
-            )
+            async with span(SPAN_NODE, "retime_audio"):
+                duration = await self._audio.stitch_episode_from_local_segments(
+                    segment_items=segment_items,
+                    output_path=str(output_path),
+                )
             episode.audio_path = str(output_path)
             episode.duration_seconds = duration
+            self._prepare_audio_delivery(output_path)
 
+            # Keep the original generation breakdown; retimes are tracked apart.
+            episode.metrics = {**episode.metrics, "retime": telemetry.summary()}
             metadata_path = episode.save_json(output_dir)
             await _emit(
                 "done",
@@ -1353,8 +1829,10 @@ class PodcastOrchestrator:
             )
             return episode
         finally:
+            RunTelemetry.deactivate(telemetry_token)
             logging.getLogger().removeHandler(ep_handler)
             ep_handler.close()
+            await asyncio.to_thread(run_log.close)
 
     @staticmethod
     def _segment_dir(episode: Episode) -> Path:
@@ -1395,17 +1873,26 @@ class PodcastOrchestrator:
         progress: Callable[[str, dict[str, Any]], Awaitable[None]],
         run_logger: EpisodeRunLogger,
         max_concurrency: int = 4,
+        live_episode_id: str | None = None,
     ) -> list[tuple[bytes, float]]:
-        """Synthesize dialogue into audio segments concurrently while preserving order."""
+        """Synthesize dialogue into audio segments concurrently while preserving order.
+
+        With *live_episode_id*, finished segments are also published in order
+        to that episode's progressive-playback playlist.
+        """
         if not dialogue:
             return []
+        live = (LivePlaylist(live_episode_id, self._audio)
+                if live_episode_id and settings.live_playback_enabled else None)
 
         semaphore = asyncio.Semaphore(max_concurrency)
         ordered_segments: list[tuple[bytes, float]
                                | None] = [None] * len(dialogue)
 
         async def _worker(index: int, line: DialogueLine) -> tuple[int, DialogueLine, bytes]:
+            queued_at = time.perf_counter()
             async with semaphore:
+                mark_queue_wait(time.perf_counter() - queued_at)
                 audio_bytes = await self._tts.synthesize(
                     text=line.ssml_text,
                     voice_id=line.voice_id,
@@ -1425,6 +1912,8 @@ class PodcastOrchestrator:
             for done in asyncio.as_completed(tasks):
                 index, line, audio_bytes = await done
                 ordered_segments[index] = (audio_bytes, line.pause_after)
+                if live is not None:
+                    await live.add(index, audio_bytes, line.pause_after)
                 done_count += 1
                 await progress(
                     f"语音合成 ({done_count}/{total}): {line.speaker}",
@@ -1451,6 +1940,8 @@ class PodcastOrchestrator:
             for task in tasks:
                 if not task.done():
                     task.cancel()
+            if live is not None:
+                live.close()
 
         return [segment for segment in ordered_segments if segment is not None]
 
@@ -1479,12 +1970,18 @@ class PodcastOrchestrator:
         plan: EpisodePlan,
         detailed_info: list[DetailedInfo],
         rag_context: str = "",
+        *,
+        max_tokens: int | None = None,
     ) -> str:
         """Compile background research + RAG into an E-type structured brief for agents.
 
         E-type structure: Current State → How We Got Here → Where This Leads.
         This mirrors best-practice used by editors like 'The Daily' to anchor narrative
         in the present, provide historical depth, then open future possibility.
+
+        With *max_tokens* the brief is fitted to that budget by shortening the
+        full research archive first, then the knowledge-base excerpt; the
+        three narrative layers and the reminders are kept.
         """
         lines = [
             "=" * 60,
@@ -1525,46 +2022,45 @@ class PodcastOrchestrator:
             lines.append("")
 
         # --- Full research archive (for fact/data lookups) ---
-        lines.append("【全量搜索资料（可引用事实、数据、案例）】")
+        archive = ["【全量搜索资料（可引用事实、数据、案例）】"]
         for info in detailed_info:
-            lines.append(f"--- 搜索: {info.query} ---")
+            archive.append(f"--- 搜索: {info.query} ---")
             if info.answer:
-                lines.append(info.answer[:300])
+                archive.append(info.answer[:300])
             for result in info.results[:2]:
-                lines.append(f"  · {result.title}: {result.content[:200]}")
-        lines.append("")
+                archive.append(f"  · {result.title}: {result.content[:200]}")
 
         # --- RAG: past episodes, expert opinions ---
-        if rag_context:
-            lines.append("【知识库（历期节目观点、专家评论、事实核查）】")
-            lines.append(rag_context[:1500])
-            lines.append("")
+        rag_excerpt = rag_context[:1500]
 
         # --- Key reminders for agents ---
-        lines.append("【讨论要点提醒】" + " | ".join(plan.talking_point_texts()))
-        lines.append("【反直觉角度】" + (plan.unexpected_angle or "暂无"))
-        lines.append("=" * 60)
-
-        return "\n".join(lines)
+        reminders = [
+            "【讨论要点提醒】" + " | ".join(plan.talking_point_texts()),
+            "【反直觉角度】" + (plan.unexpected_angle or "暂无"),
+            "=" * 60,
+        ]
 
-    @staticmethod
-    def _trim_shared_context(
-        ctx: list[dict],
-        max_turns: int = 16,
-    ) -> list[dict]:
-        """Maintain a sliding window over shared conversation context.
-
-        Retains ALL system messages plus the most recent max_turns
-        non-system messages. This prevents ever-growing context from
-        degrading quality or exceeding token budgets.
-        """
-        if not ctx:
-            return ctx
-        system_msgs = [m for m in ctx if m.get("role") == "system"]
-        non_system = [m for m in ctx if m.get("role") != "system"]
-        if len(non_system) <= max_turns:
-            return ctx
-        return system_msgs + non_system[-max_turns:]
+        def _assemble() -> str:
+            parts = lines + archive + [""]
+            if rag_excerpt:
+                parts += ["【知识库（历期节目观点、专家评论、事实核查）】", rag_excerpt, ""]
+            return "\n".join(parts + reminders)
+
+        brief = _assemble()
+        if max_tokens is None:
+            return brief
+        while len(archive) > 1 and estimate_tokens(brief) > max_tokens:
+            archive.pop()
+            brief = _assemble()
+        if len(archive) == 1:
+            archive.clear()
+            brief = _assemble()
+        overflow = estimate_tokens(brief) - max_tokens
+        if overflow > 0 and rag_excerpt:
+            rag_excerpt = truncate_to_tokens(
+                rag_excerpt, max(0, estimate_tokens(rag_excerpt) - overflow))
+            brief = _assemble()
+        return brief
 
     @staticmethod
     def _get_speaking_order(round_idx: int, guest_names: list[str]) -> list[str]:
@@ -1574,3 +2070,44 @@ class PodcastOrchestrator:
             return []
         start = round_idx % n
         return guest_names[start:] + guest_names[:start]
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+_orchestrator: PodcastOrchestrator | None = None
+_orchestrator_key: str = ""
+
+
+def _persona_fingerprint(host: PersonaConfig, guests: list[PersonaConfig]) -> str:
+    payload = json.dumps(
+        [host.model_dump(mode="json"), [g.model_dump(mode="json") for g in guests]],
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_orchestrator(
+    guest_personas: list[PersonaConfig] | None = None,
+) -> PodcastOrchestrator:
+    """Return the shared orchestrator, rebuilt only when the personas change.
+
+    Building one compiles the LangGraph pipeline and renders every agent's
+    system prompt, so requests reuse a single instance.  Per-run state lives
+    in the graph state and in :func:`~backend.agents.base.activate_agent_run`
+    histories, never on the agents.  *guest_personas* defaults to the
+    persisted guest pool; runs still holding a replaced instance finish on it.
+    """
+    global _orchestrator, _orchestrator_key
+    host = get_host_service().get_host()
+    guests = (guest_personas if guest_personas is not None
+              else get_guest_pool_service().list_guests())
+    key = _persona_fingerprint(host, guests)
+    if _orchestrator is None or key != _orchestrator_key:
+        if _orchestrator is not None:
+            logger.info("Personas changed, rebuilding orchestrator")
+        _orchestrator = PodcastOrchestrator(
+            guest_personas=guests, host_persona=host)
+        _orchestrator_key = key
+    return _orchestrator
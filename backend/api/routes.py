@@ -5,16 +5,19 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import random
+import re
+import shutil
+from dataclasses import asdict
 from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
 from fastapi.responses import FileResponse, StreamingResponse
 
-from backend.agents.orchestrator import PodcastOrchestrator
 from backend.api.schemas import (
     AppSettingsOut,
     AppSettingsPatch,
+    BatchGenerateRequest,
     DialogueLineOut,
     DocumentUploadResponse,
     DocumentFileInfo,
@@ -32,14 +35,27 @@ from backend.api.schemas import (
 )
 from backend.config import settings
 from backend.knowledge import get_knowledge_base
-from backend.knowledge.chroma_kb import (
-    BACKGROUND_MATERIAL,
-    KNOWLEDGE_SCOPE_GLOBAL,
-    KNOWLEDGE_SCOPE_TASK,
+from backend.knowledge.retention import get_compaction_job
+from backend.models import (
+    DialogueLine,
+    Episode,
+    EpisodeMeta,
+    episode_body_paths,
+    episode_meta_paths,
 )
-from backend.models import DetailedInfo, DialogueLine, Episode
-from backend.services.run_logger import EpisodeRunLogger
+from backend.services import metrics
+from backend.services.audio_delivery import (
+    audio_response,
+    compressed_variants,
+    get_audio_index,
+    get_audio_transcoder,
+)
+from backend.services.live_playlist import PLAYLIST_NAME, live_dir, live_dir_for_task
+from backend.services.llm_service import PRIORITY_INTERACTIVE, llm_priority
 from backend.services.news_service import get_news_service
+from backend.services.search_cache import get_search_cache
+from backend.services.structured_output import chat_json
+from backend.services.telemetry import bind_task_id
 from backend.services.guest_pool_service import get_guest_pool_service, to_persona_config
 from backend.services.host_service import get_host_service
 from backend.services.document_service import get_document_service
@@ -47,10 +63,19 @@ from backend.services.document_service import get_document_service
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api")
 
+# The orchestrator (langgraph, LLM / Tavily clients, audio) is imported inside
+# the handlers that need it so that importing this module stays cheap.
+
 # In-memory task tracking (MVP — no persistent task store)
 _tasks: dict[str, dict] = {}
 _task_jobs: dict[str, asyncio.Task] = {}
 
+_LIVE_FILE_RE = re.compile(r"index\.m3u8|\d{4}\.mp3")
+
+
+def _live_playlist_url(task_id: str) -> str:
+    return f"/api/tasks/{task_id}/live/{PLAYLIST_NAME}"
+
 
 # ---------------------------------------------------------------------------
 # Debug endpoints — stage-by-stage backend verification
@@ -71,7 +96,8 @@ async def _translate_to_chinese(text: str, llm_service) -> str:
             {"role": "system", "content": "You are a translator. Translate the following news title and content to Chinese. Keep the translation natural and concise. Only return the translated text, no explanations."},
             {"role": "user", "content": text}
         ]
-        translated = await llm_service.chat(messages, temperature=0.3, max_tokens=1024)
+        translated = await llm_service.chat(
+            messages, temperature=0.3, max_tokens=1024, call_site="translation")
         return translated.strip() if translated else text
     except Exception as e:
         logger.warning(f"Translation failed: {e}")
@@ -102,156 +128,111 @@ async def debug_news(max_results: int = 6, topic: str = ""):
     }
 
 
-@router.post("/debug/script")
-async def debug_script_preview(req: ScriptPreviewRequest | None = None):
-    """Run pipeline until dialogue generation (skip TTS and audio stitching)."""
-    payload = req or ScriptPreviewRequest()
-    guest_pool_service = get_guest_pool_service()
-    guest_pool = guest_pool_service.list_guests()
-    orchestrator = PodcastOrchestrator(guest_personas=guest_pool)
-
-    selected_names = [name.strip()
-                      for name in payload.selected_guests if name and name.strip()]
-    if selected_names:
-        unknown = [
-            name for name in selected_names if name not in orchestrator._guest_pool]
-        if unknown:
-            raise HTTPException(
-                status_code=400, detail=f"Unknown guests: {', '.join(unknown)}")
-        if len(selected_names) > settings.max_guests:
-            raise HTTPException(
-                status_code=400, detail=f"最多可选择{settings.max_guests}位嘉宾")
-    else:
-        num_guests = random.randint(1, 2)
-        selected_names = random.sample(
-            list(orchestrator._guest_pool.keys()), num_guests)
-
-    active_guests = [orchestrator._guest_pool[name] for name in selected_names]
-    speaker_voice_map = orchestrator._build_speaker_voice_map(active_guests)
+@router.get("/debug/search-cache")
+async def debug_search_cache():
+    """Return Tavily response-cache counters (hits / stale / misses / coalesced)."""
+    cache = get_search_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.get_stats()}
+
+
+async def refresh_scrape_metrics() -> None:
+    """Refresh the gauges read from live state when ``/metrics`` is scraped."""
+    by_stage: dict[tuple[str, str], float] = {}
+    for task in list(_tasks.values()):
+        key = (str(task.get("status", "")), str(task.get("stage", "")))
+        by_stage[key] = by_stage.get(key, 0) + 1
+    metrics.tasks_by_stage.replace(by_stage)
+    metrics.tasks_active.set(len(_task_jobs))
+
+    cache = get_search_cache()
+    if cache is not None:
+        cache_stats = await asyncio.to_thread(cache.get_stats)
+        metrics.cache_events.replace({
+            ("tavily", event): cache_stats[event]
+            for event in ("hits", "stale_hits", "misses", "coalesced", "errors")
+        })
+        metrics.cache_hit_ratio.set(cache_stats["hit_ratio"], cache="tavily")
 
-    news_items = await orchestrator._news.get_topic_news(
-        topic=payload.topic, max_results=payload.max_news_results
-    )
-    if not news_items:
-        raise HTTPException(status_code=502, detail="No news items retrieved")
-
-    if payload.topic.strip():
-        selected_topic = payload.topic.strip()
-        topic = {
-            "topic": selected_topic,
-            "reason": "用户手动选择话题",
-            "search_queries": [
-                selected_topic,
-                f"{selected_topic} 最新进展",
-                f"{selected_topic} 行业争议",
-            ],
-        }
+    try:
+        counts = await asyncio.to_thread(
+            lambda: get_knowledge_base().get_collection_stats())
+    except Exception as exc:
+        logger.warning("Knowledge base stats unavailable for metrics: %s", exc)
     else:
-        recent_topics = orchestrator._load_recent_topics(
-            limit=20,
-        )
-        topic = await orchestrator.host.select_topic(
-            news_items,
-            recent_topics=recent_topics,
-        )
-    search_queries = topic.get("search_queries", [])[
-        : payload.max_search_queries]
-
-    detailed_info: list[DetailedInfo] = []
-    kb = get_knowledge_base()
-    for query in search_queries:
-        rag_docs = await kb.query(
-            query,
-            top_k=4,
-            collection=BACKGROUND_MATERIAL,
-            scope=KNOWLEDGE_SCOPE_GLOBAL,
-        )
-        rag_snippets = [d.get("content", "")
-                        for d in rag_docs if d.get("content")]
-        decision = await orchestrator.host.decide_need_fresh_search(query, rag_snippets)
-        need_fresh_search = bool(decision.get("need_fresh_search", False))
-        if not rag_snippets:
-            need_fresh_search = True
-
-        if need_fresh_search:
-            focus_query = decision.get("focus", "").strip() or query
-            detailed_info.append(await orchestrator._news.search_detail(focus_query))
-        else:
-            rag_answer = "\n\n".join(
-                f"- {txt[:300]}" for txt in rag_snippets[:4])
-            detailed_info.append(
-                DetailedInfo(
-                    query=query,
-                    answer=f"基于知识库历史资料整理：\n{rag_answer}" if rag_answer else "",
-                    results=[],
-                )
-            )
+        metrics.chroma_documents.replace(
+            {(name,): count for name, count in counts.items()})
 
-    plan = await orchestrator.host.plan_episode(
-        topic,
-        [info.model_dump() for info in detailed_info],
-        selected_names,
-    )
 
-    episode = Episode(
-        topic=plan.topic,
-        title=plan.topic,
-        summary=plan.summary,
-        guests=selected_names,
-    )
-    # Retrieve RAG context
-    rag_context = ""
-    try:
-        kb = get_knowledge_base()
-        rag_context = await kb.build_rag_context(plan.topic, top_k_per_collection=3)
-    except Exception:
-        logger.warning(
-            "RAG retrieval failed in debug endpoint, continuing without")
-
-    output_dir = settings.ensure_output_dir()
-    run_logger = EpisodeRunLogger(
-        output_dir / "logs" / f"{episode.id}.debug.jsonl")
-    dialogue = await orchestrator._generate_dialogue(
-        plan,
-        detailed_info,
-        {
-            "episode": episode,
-            "progress": None,
-            "run_logger": run_logger,
-            "rag_context": rag_context,
-            "active_guests": active_guests,
-            "speaker_voice_map": speaker_voice_map,
-        },
-    )
-    word_count = sum(len(line.text) for line in dialogue)
+class _PreviewRequestError(ValueError):
+    """The preview request itself is invalid (a 400, unlike pipeline errors)."""
 
-    orchestrator.host.reset_history()
-    for guest in active_guests:
-        guest.reset_history()
 
+def _validate_preview_guests(orchestrator, selected_guests: list[str]) -> list[str]:
+    """Return the requested guest names, or raise _PreviewRequestError."""
+    names = [name.strip() for name in selected_guests if name and name.strip()]
+    unknown = [name for name in names if name not in orchestrator._guest_pool]
+    if unknown:
+        raise _PreviewRequestError(f"Unknown guests: {', '.join(unknown)}")
+    if len(names) > settings.max_guests:
+        raise _PreviewRequestError(f"最多可选择{settings.max_guests}位嘉宾")
+    return names
+
+
+async def _run_script_preview(payload: ScriptPreviewRequest, progress=None) -> dict:
+    """Run the shared pipeline up to the dialogue and shape the preview result."""
+    from backend.agents.orchestrator import get_orchestrator
+
+    orchestrator = get_orchestrator()
+    selected_names = _validate_preview_guests(orchestrator, payload.selected_guests)
+    with llm_priority(PRIORITY_INTERACTIVE):  # a user is waiting on the preview
+        state = await orchestrator.preview_script(
+            progress,
+            topic=payload.topic,
+            selected_guest_names=selected_names or None,
+            document_session_id=payload.document_session_id,
+            user_prompt=payload.user_prompt or "",
+            generation_mode=payload.generation_mode,
+            max_news_results=payload.max_news_results,
+            max_search_queries=payload.max_search_queries,
+        )
+    episode, plan = state["episode"], state["plan"]
     return {
         "title": plan.topic,
         "topic": plan.topic,
         "summary": plan.summary,
-        "guests": selected_names,
+        "guests": episode.guests,
         "talking_points": plan.talking_point_texts(),
-        "word_count": word_count,
-        "line_count": len(dialogue),
-        "news_count": len(news_items),
-        "search_queries": search_queries,
-        "generation_log_path": str(run_logger.log_path),
-        "news_sources": [item.model_dump() for item in news_items],
+        "word_count": episode.word_count,
+        "line_count": len(episode.dialogue),
+        "news_count": len(episode.news_sources),
+        "search_queries": state.get("search_queries", []),
+        "generation_log_path": episode.generation_log_path,
+        "news_sources": [item.model_dump() for item in episode.news_sources],
         "dialogue": [
             {
                 "speaker": line.speaker,
                 "text": line.text,
                 "emotion": line.emotion,
             }
-            for line in dialogue
+            for line in episode.dialogue
         ],
     }
 
 
+@router.post("/debug/script")
+async def debug_script_preview(req: ScriptPreviewRequest | None = None):
+    """Run pipeline until dialogue generation (skip article, TTS and audio)."""
+    payload = req or ScriptPreviewRequest()
+    try:
+        return await _run_script_preview(payload)
+    except _PreviewRequestError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+
 @router.post("/script/preview")
 async def script_preview(req: ScriptPreviewRequest | None = None):
     """Preview generated script for manual confirmation/editing."""
@@ -273,245 +254,16 @@ async def script_preview_task(req: ScriptPreviewRequest | None = None):
     }
 
     async def _run():
-        guest_pool_service = get_guest_pool_service()
-        guest_pool = guest_pool_service.list_guests()
-        orchestrator = PodcastOrchestrator(guest_personas=guest_pool)
-
-        selected_names = [n.strip()
-                          for n in payload.selected_guests if n and n.strip()]
-        if selected_names:
-            unknown = [
-                n for n in selected_names if n not in orchestrator._guest_pool]
-            if unknown:
-                _tasks[task_id].update({
-                    "status": "failed", "stage": "error",
-                    "detail": f"Unknown guests: {', '.join(unknown)}"
-                })
-                return
-            if len(selected_names) > settings.max_guests:
-                _tasks[task_id].update({
-                    "status": "failed", "stage": "error",
-                    "detail": f"最多可选择{settings.max_guests}位嘉宾"
-                })
-                return
-        else:
-            num_guests = random.randint(1, 2)
-            selected_names = random.sample(
-                list(orchestrator._guest_pool.keys()), num_guests)
-
-        active_guests = [orchestrator._guest_pool[name]
-                         for name in selected_names]
-        speaker_voice_map = orchestrator._build_speaker_voice_map(
-            active_guests)
+        async def _progress(stage: str, detail: str):
+            _tasks[task_id].update({"stage": stage, "detail": detail})
 
         try:
-            if payload.document_session_id:
-                # --- Document mode: derive topic from uploaded docs ---
-                _tasks[task_id].update(
-                    {"stage": "documents", "detail": "正在分析上传的文档内容..."})
-
-                doc_service = get_document_service()
-                doc_summary = await doc_service.get_document_summary(
-                    payload.document_session_id)
-                if not doc_summary:
-                    raise RuntimeError("未能从上传的文档中提取内容，请检查文件格式")
-
-                _tasks[task_id].update(
-                    {"stage": "documents", "detail": "文档内容提取完成，正在生成话题..."})
-                user_prompt_hint = (
-                    f"\n\n用户提示：{payload.user_prompt}" if payload.user_prompt else "")
-                derive_messages = [
-                    {
-                        "role": "system",
-                        "content": (
-                            "你是一位资深播客主持人，擅长从素材中提炼出有深度的讨论话题。\n"
-                            "根据以下文档内容（以及用户的提示），提炼出一个适合播客讨论的核心话题。\n"
-                            "输出严格遵循 JSON 格式，字段：\n"
-                            "  topic: 话题名称（10-20字）\n"
-                            "  reason: 选题理由（50字内）\n"
-                            "  search_queries: 补充搜索查询列表（3-4条，用于获取背景信息）\n"
-                            "只输出 JSON，不要加 Markdown 围栏。"
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": f"文档内容摘要：\n{doc_summary[:2000]}{user_prompt_hint}",
-                    },
-                ]
-                raw_topic = await orchestrator._llm.chat(
-                    derive_messages, temperature=0.5, max_tokens=512)
-                raw_topic = raw_topic.strip().lstrip(
-                    "```json").lstrip("```").rstrip("```").strip()
-                try:
-                    topic = json.loads(raw_topic)
-                except Exception:
-                    topic_text = payload.user_prompt or "文档内容讨论"
-                    topic = {
-                        "topic": topic_text,
-                        "reason": "基于用户上传的文档内容",
-                        "search_queries": [topic_text, f"{topic_text} 相关背景"],
-                    }
-                news_items = []  # no news in document mode
-            else:
-                # --- Topic mode: fetch news and select topic ---
-                _tasks[task_id].update(
-                    {"stage": "news", "detail": "正在获取资讯..."})
-                news_items = await orchestrator._news.get_topic_news(
-                    topic=payload.topic, max_results=payload.max_news_results
-                )
-                if not news_items:
-                    raise RuntimeError("未获取到相关资讯")
-
-                _tasks[task_id].update(
-                    {"stage": "topic", "detail": "正在分析选定话题..."})
-                if payload.topic.strip():
-                    selected_topic = payload.topic.strip()
-                    topic = {
-                        "topic": selected_topic,
-                        "reason": "用户手动选择话题",
-                        "search_queries": [
-                            selected_topic,
-                            f"{selected_topic} 最新进展",
-                            f"{selected_topic} 行业争议",
-                        ],
-                    }
-                else:
-                    recent_topics = orchestrator._load_recent_topics(limit=20)
-                    topic = await orchestrator.host.select_topic(
-                        news_items, recent_topics=recent_topics)
-
-            search_queries = topic.get("search_queries", [])[
-                :payload.max_search_queries]
-
-            _tasks[task_id].update({
-                "stage": "research",
-                "detail": f"深度研究中：{topic.get('topic', '')}...",
-            })
-            detailed_info: list[DetailedInfo] = []
-            kb = get_knowledge_base()
-            for query in search_queries:
-                rag_docs = await kb.query(
-                    query, top_k=4, collection=BACKGROUND_MATERIAL, scope=KNOWLEDGE_SCOPE_GLOBAL
-                )
-                doc_snippets: list[str] = []
-                if payload.document_session_id:
-                    try:
-                        doc_docs = await kb.query(
-                            query, top_k=4, collection=BACKGROUND_MATERIAL,
-                            scope=KNOWLEDGE_SCOPE_TASK,
-                            task_id=payload.document_session_id,
-                        )
-                        doc_snippets = [d.get("content", "")
-                                        for d in doc_docs if d.get("content")]
-                    except Exception:
-                        pass
-                rag_snippets = [d.get("content", "")
-                                for d in rag_docs if d.get("content")]
-                combined_snippets = doc_snippets + rag_snippets
-                decision = await orchestrator.host.decide_need_fresh_search(query, combined_snippets)
-                need_fresh_search = bool(
-                    decision.get("need_fresh_search", False))
-                if not combined_snippets:
-                    need_fresh_search = True
-                if need_fresh_search:
-                    focus_query = decision.get("focus", "").strip() or query
-                    tavily_result = await orchestrator._news.search_detail(focus_query)
-                    if payload.document_session_id and doc_snippets:
-                        doc_prefix = "【文档参考】\n" + "\n".join(
-                            f"- {s[:300]}" for s in doc_snippets[:3])
-                        tavily_result = DetailedInfo(
-                            query=tavily_result.query,
-                            answer=doc_prefix + "\n\n" + tavily_result.answer,
-                            results=tavily_result.results,
-                        )
-                    detailed_info.append(tavily_result)
-                else:
-                    label = "基于文档及知识库内容整理：" if payload.document_session_id else "基于知识库历史资料整理："
-                    rag_answer = "\n\n".join(
-                        f"- {txt[:300]}" for txt in combined_snippets[:4])
-                    detailed_info.append(DetailedInfo(
-                        query=query,
-                        answer=f"{label}\n{rag_answer}" if rag_answer else "",
-                        results=[],
-                    ))
-
-            _tasks[task_id].update(
-                {"stage": "planning", "detail": "正在策划节目结构..."})
-            plan = await orchestrator.host.plan_episode(
-                topic, [info.model_dump()
-                        for info in detailed_info], selected_names
-            )
-
-            episode = Episode(
-                topic=plan.topic, title=plan.topic,
-                summary=plan.summary, guests=selected_names,
-                document_session_id=payload.document_session_id,
-                user_prompt=payload.user_prompt or "",
-            )
-            rag_context = ""
-            try:
-                rag_context = await kb.build_rag_context(plan.topic, top_k_per_collection=3)
-            except Exception:
-                logger.warning(
-                    "RAG retrieval failed in preview task, continuing without")
-
-            # Prepend uploaded-doc context in document mode
-            if payload.document_session_id:
-                try:
-                    doc_rag_docs = await kb.query(
-                        plan.topic, top_k=6,
-                        collection=BACKGROUND_MATERIAL,
-                        scope=KNOWLEDGE_SCOPE_TASK,
-                        task_id=payload.document_session_id,
-                    )
-                    doc_snippets = [d.get("content", "")
-                                    for d in doc_rag_docs if d.get("content")]
-                    if doc_snippets:
-                        doc_block = "【上传文档内容】\n" + "\n\n".join(
-                            f"- {s[:400]}" for s in doc_snippets[:6])
-                        rag_context = doc_block + "\n\n" + rag_context if rag_context else doc_block
-                except Exception:
-                    logger.warning(
-                        "Doc-scoped RAG failed in preview task, continuing without")
-
-            output_dir = settings.ensure_output_dir()
-            run_logger = EpisodeRunLogger(
-                output_dir / "logs" / f"{episode.id}.debug.jsonl")
-
-            _tasks[task_id].update(
-                {"stage": "dialogue", "detail": "正在生成对话内容..."})
-            dialogue = await orchestrator._generate_dialogue(
-                plan,
-                detailed_info,
-                {
-                    "episode": episode,
-                    "progress": None,
-                    "run_logger": run_logger,
-                    "rag_context": rag_context,
-                    "active_guests": active_guests,
-                    "speaker_voice_map": speaker_voice_map,
-                },
-            )
-
-            orchestrator.host.reset_history()
-            for guest in active_guests:
-                guest.reset_history()
-
+            result = await _run_script_preview(payload, _progress)
             _tasks[task_id].update({
                 "status": "completed",
                 "stage": "done",
                 "detail": "文稿生成完成",
-                "result": {
-                    "title": plan.topic,
-                    "topic": plan.topic,
-                    "summary": plan.summary,
-                    "guests": selected_names,
-                    "dialogue": [
-                        {"speaker": line.speaker, "text": line.text,
-                            "emotion": line.emotion}
-                        for line in dialogue
-                    ],
-                },
+                "result": result,
             })
         except asyncio.CancelledError:
             _tasks[task_id].update({
@@ -527,7 +279,8 @@ async def script_preview_task(req: ScriptPreviewRequest | None = None):
         finally:
             _task_jobs.pop(task_id, None)
 
-    _task_jobs[task_id] = asyncio.create_task(_run())
+    bind_task_id(task_id)  # inherited by the task for telemetry attribution
+    _task_jobs[task_id] = asyncio.create_task(_run(), name=task_id)
     return TaskCreatedResponse(task_id=task_id, message="文稿预览任务已创建")
 
 
@@ -543,10 +296,13 @@ async def synthesize_from_script(req: ScriptSynthesisRequest):
         "stage": "audio",
         "detail": "正在准备语音合成…",
         "episode_id": None,
+        "live_playlist": _live_playlist_url(task_id),
     }
 
     async def _run():
-        orchestrator = PodcastOrchestrator()
+        from backend.agents.orchestrator import get_orchestrator
+
+        orchestrator = get_orchestrator()
 
         async def _progress(stage: str, detail: str):
             _tasks[task_id].update({"stage": stage, "detail": detail})
@@ -602,7 +358,8 @@ async def synthesize_from_script(req: ScriptSynthesisRequest):
         finally:
             _task_jobs.pop(task_id, None)
 
-    _task_jobs[task_id] = asyncio.create_task(_run())
+    bind_task_id(task_id)  # inherited by the task for telemetry attribution
+    _task_jobs[task_id] = asyncio.create_task(_run(), name=task_id)
     return TaskCreatedResponse(task_id=task_id, message="语音合成任务已创建")
 
 
@@ -622,7 +379,9 @@ async def retime_episode_audio(episode_id: str, req: EpisodeAudioRetimeRequest):
     }
 
     async def _run():
-        orchestrator = PodcastOrchestrator()
+        from backend.agents.orchestrator import get_orchestrator
+
+        orchestrator = get_orchestrator()
 
         async def _progress(stage: str, detail: str):
             _tasks[task_id].update({"stage": stage, "detail": detail})
@@ -657,7 +416,8 @@ async def retime_episode_audio(episode_id: str, req: EpisodeAudioRetimeRequest):
         finally:
             _task_jobs.pop(task_id, None)
 
-    _task_jobs[task_id] = asyncio.create_task(_run())
+    bind_task_id(task_id)  # inherited by the task for telemetry attribution
+    _task_jobs[task_id] = asyncio.create_task(_run(), name=task_id)
     return TaskCreatedResponse(task_id=task_id, message="段级倍速处理任务已创建")
 
 
@@ -752,18 +512,21 @@ async def generate_episode(req: GenerateRequest | None = None):
 
     guest_pool_service = get_guest_pool_service()
     guest_pool = guest_pool_service.list_guests()
-    guest_names = {guest.name for guest in guest_pool}
-    unknown = [name for name in payload.selected_guests if name not in guest_names]
+    unknown = [name for name in payload.selected_guests
+               if guest_pool_service.get_guest(name) is None]
     if unknown:
         raise HTTPException(
             status_code=400, detail=f"Unknown guests: {', '.join(unknown)}")
 
     task_id = f"task_{len(_tasks) + 1}"
     _tasks[task_id] = {"status": "started",
-                       "stage": "initializing", "detail": "", "episode_id": None}
+                       "stage": "initializing", "detail": "", "episode_id": None,
+                       "live_playlist": _live_playlist_url(task_id)}
 
     async def _run():
-        orchestrator = PodcastOrchestrator(guest_personas=guest_pool)
+        from backend.agents.orchestrator import get_orchestrator
+
+        orchestrator = get_orchestrator(guest_pool)
 
         async def _progress(stage: str, detail: str):
             _tasks[task_id].update({"stage": stage, "detail": detail})
@@ -775,6 +538,7 @@ async def generate_episode(req: GenerateRequest | None = None):
                 selected_guest_names=payload.selected_guests,
                 document_session_id=payload.document_session_id,
                 user_prompt=payload.user_prompt,
+                generation_mode=payload.generation_mode,
             )
             _tasks[task_id].update({
                 "status": "completed",
@@ -799,10 +563,97 @@ async def generate_episode(req: GenerateRequest | None = None):
         finally:
             _task_jobs.pop(task_id, None)
 
-    _task_jobs[task_id] = asyncio.create_task(_run())
+    bind_task_id(task_id)  # inherited by the task for telemetry attribution
+    _task_jobs[task_id] = asyncio.create_task(_run(), name=task_id)
     return TaskCreatedResponse(task_id=task_id)
 
 
+@router.post("/generate/batch", response_model=TaskCreatedResponse)
+async def generate_batch(req: BatchGenerateRequest):
+    """Generate a slate of episodes in one background task.
+
+    Progress of every episode is streamed on ``/api/status/{task_id}`` under
+    ``episodes``; the final ``result`` reports throughput in episodes/hour.
+    """
+    topics = [topic.strip() for topic in req.topics if topic.strip()]
+    if not topics and req.count <= 0:
+        raise HTTPException(status_code=400, detail="请提供话题列表或期数")
+    if max(len(topics), req.count) > settings.batch_max_episodes:
+        raise HTTPException(
+            status_code=400, detail=f"单批最多生成{settings.batch_max_episodes}期")
+    if len(req.selected_guests) > settings.max_guests:
+        raise HTTPException(
+            status_code=400, detail=f"最多可选择{settings.max_guests}位嘉宾")
+
+    guest_pool_service = get_guest_pool_service()
+    guest_pool = guest_pool_service.list_guests()
+    unknown = [name for name in req.selected_guests
+               if guest_pool_service.get_guest(name) is None]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown guests: {', '.join(unknown)}")
+
+    task_id = f"task_{len(_tasks) + 1}"
+    _tasks[task_id] = {"status": "started", "stage": "planning",
+                       "detail": "正在规划本批节目…", "episode_id": None,
+                       "episodes": [], "result": None}
+
+    async def _run():
+        from backend.agents.batch import COMPLETED, BatchEpisode, BatchGenerator
+        from backend.agents.orchestrator import get_orchestrator
+
+        batch = BatchGenerator(get_orchestrator(guest_pool),
+                               max_concurrent_episodes=req.max_concurrent_episodes)
+        states: dict[int, dict] = {}
+
+        async def _progress(item: BatchEpisode):
+            states[item.index] = asdict(item)
+            done = sum(1 for s in states.values() if s["status"] == COMPLETED)
+            _tasks[task_id].update({
+                "stage": "generating",
+                "detail": f"第{item.index + 1}期：{item.detail or item.topic}（已完成{done}期）",
+                "episodes": [states[i] for i in sorted(states)],
+            })
+
+        try:
+            result = await batch.run(
+                topics=topics,
+                count=req.count,
+                selected_guest_names=req.selected_guests,
+                generation_mode=req.generation_mode,
+                progress=_progress,
+            )
+            summary = result.summary()
+            _tasks[task_id].update({
+                "status": "completed",
+                "stage": "done",
+                "detail": (f"完成 {summary['completed']}/{summary['requested']} 期，"
+                           f"{summary['episodes_per_hour']} 期/小时"),
+                "episodes": summary["episodes"],
+                "result": summary,
+            })
+        except asyncio.CancelledError:
+            _tasks[task_id].update({
+                "status": "cancelled",
+                "stage": "cancelled",
+                "detail": "任务已终止",
+            })
+            raise
+        except Exception as exc:
+            logger.exception("Batch generation failed")
+            _tasks[task_id].update({
+                "status": "failed",
+                "stage": "error",
+                "detail": str(exc),
+            })
+        finally:
+            _task_jobs.pop(task_id, None)
+
+    bind_task_id(task_id)  # inherited by the task for telemetry attribution
+    _task_jobs[task_id] = asyncio.create_task(_run(), name=task_id)
+    return TaskCreatedResponse(task_id=task_id, message="批量生成任务已创建")
+
+
 # ---------------------------------------------------------------------------
 # Guest pool management endpoints
 # ---------------------------------------------------------------------------
@@ -909,15 +760,10 @@ async def generate_guest(req: GuestGenerateRequest):
     ]
 
     try:
-        raw = await llm.chat(messages, temperature=0.9, max_tokens=1024)
-        raw = raw.strip()
-        # Strip markdown fences if present
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        raw = raw.strip()
-        data = json.loads(raw)
+        with llm_priority(PRIORITY_INTERACTIVE):
+            data = await chat_json(
+                llm, messages, dict[str, Any], name="guest_profile",
+                temperature=0.9, max_tokens=1024)
     except Exception as exc:
         logger.error("Guest generation failed: %s", exc)
         raise HTTPException(status_code=500, detail=f"AI生成失败：{exc}") from exc
@@ -1072,6 +918,24 @@ async def task_status(task_id: str):
     )
 
 
+@router.get("/tasks/{task_id}/live/{name}")
+async def task_live_audio(task_id: str, name: str, request: Request):
+    """Progressive playback: HLS playlist and chunks of a running synthesis."""
+    directory = live_dir_for_task(task_id)
+    if directory is None or not _LIVE_FILE_RE.fullmatch(name):
+        raise HTTPException(status_code=404, detail="Live audio not available")
+    path = directory / name
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Live audio not available")
+    if name == PLAYLIST_NAME:
+        # The playlist grows in place.
+        return FileResponse(str(path), media_type="application/vnd.apple.mpegurl",
+                            headers={"Cache-Control": "no-cache"})
+    # Task ids restart with the process, so the same chunk URL can later
+    # belong to another episode: revalidate against the file's ETag.
+    return audio_response(request, path, filename_stem=f"{task_id}_{path.stem}")
+
+
 @router.post("/tasks/{task_id}/cancel")
 async def cancel_task(task_id: str):
     """Cancel a running background task."""
@@ -1107,9 +971,9 @@ async def list_episodes():
         return []
 
     episodes: list[EpisodeSummary] = []
-    for json_path in sorted(output_dir.glob("*.json"), reverse=True):
+    for json_path in sorted(episode_meta_paths(output_dir), reverse=True):
         try:
-            ep = Episode.load_json(json_path)
+            ep = EpisodeMeta.load(json_path)
             episodes.append(
                 EpisodeSummary(
                     id=ep.id,
@@ -1179,7 +1043,7 @@ async def delete_episode(episode_id: str):
 
     audio_path: Path | None = None
     try:
-        episode = Episode.load_json(json_path)
+        episode = EpisodeMeta.load(json_path)
         if episode.audio_path:
             audio_path = Path(episode.audio_path)
     except Exception as exc:
@@ -1195,13 +1059,29 @@ async def delete_episode(episode_id: str):
         removed_files.append(path.name)
 
     _safe_unlink(json_path)
+    for body_path in episode_body_paths(settings.output_dir, episode_id):
+        _safe_unlink(body_path)
+
+    try:
+        get_knowledge_base().topic_index.remove(episode_id)
+    except Exception as exc:
+        logger.warning(
+            "Failed to drop episode %s from topic index: %s", episode_id, exc)
 
     if audio_path is not None:
         _safe_unlink(audio_path)
+        for variant in compressed_variants(audio_path):
+            _safe_unlink(variant)
 
     logs_dir = settings.output_dir / "logs"
-    _safe_unlink(logs_dir / f"{episode_id}.jsonl")
-    _safe_unlink(logs_dir / f"{episode_id}.debug.jsonl")
+    for log_name in (f"{episode_id}.jsonl", f"{episode_id}.debug.jsonl"):
+        _safe_unlink(logs_dir / log_name)
+        _safe_unlink(logs_dir / f"{log_name}.gz")
+
+    live_chunks = live_dir(episode_id)
+    if live_chunks.is_dir():
+        shutil.rmtree(live_chunks, ignore_errors=True)
+        removed_files.append(str(live_chunks))
 
     segments_dir = settings.output_dir / "segments" / episode_id
     if segments_dir.exists() and segments_dir.is_dir():
@@ -1223,19 +1103,18 @@ async def delete_episode(episode_id: str):
 
 
 @router.get("/episodes/{episode_id}/segments/{line_index}/audio")
-async def get_episode_segment_audio(episode_id: str, line_index: int):
+async def get_episode_segment_audio(
+    episode_id: str, line_index: int, request: Request, original: bool = False,
+):
     """Stream one dialogue segment audio file for real-time preview/playback."""
-    json_path = settings.output_dir / f"{episode_id}.json"
-    if not json_path.exists():
+    entry = get_audio_index().lookup(episode_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Episode not found")
 
-    ep = Episode.load_json(json_path)
-    if line_index < 0 or line_index >= len(ep.dialogue):
+    if line_index < 0 or line_index >= len(entry.segment_paths):
         raise HTTPException(status_code=404, detail="Segment not found")
 
-    line = ep.dialogue[line_index]
-    segment_path = Path(
-        line.segment_audio_path) if line.segment_audio_path else None
+    segment_path = entry.segment_paths[line_index]
     if segment_path is None or not segment_path.exists():
         fallback_dir = settings.output_dir / "segments" / episode_id
         wav_fallback = fallback_dir / f"{line_index:04d}.wav"
@@ -1248,15 +1127,11 @@ async def get_episode_segment_audio(episode_id: str, line_index: int):
             raise HTTPException(
                 status_code=404, detail="Segment audio not available")
 
-    suffix = segment_path.suffix.lower()
-    media_type = "audio/wav" if suffix == ".wav" else "audio/mpeg"
-    filename_ext = "wav" if suffix == ".wav" else "mp3"
-
-    return FileResponse(
-        str(segment_path),
-        media_type=media_type,
-        filename=f"airoundtable_{episode_id}_segment_{line_index}.{filename_ext}",
-    )
+    if not original:
+        segment_path = await get_audio_transcoder().deliverable(segment_path)
+    return audio_response(
+        request, segment_path,
+        filename_stem=f"airoundtable_{episode_id}_segment_{line_index}")
 
 
 @router.post("/episodes/{episode_id}/segments/cleanup")
@@ -1272,9 +1147,10 @@ async def cleanup_episode_segments(episode_id: str):
     for line in episode.dialogue:
         if line.segment_audio_path:
             segment_path = Path(line.segment_audio_path)
-            if segment_path.exists() and segment_path.is_file():
-                segment_path.unlink()
-                removed_count += 1
+            for path in (segment_path, *compressed_variants(segment_path)):
+                if path.exists() and path.is_file():
+                    path.unlink()
+                    removed_count += 1
             line.segment_audio_path = None
 
     segments_dir = settings.output_dir / "segments" / episode_id
@@ -1288,6 +1164,11 @@ async def cleanup_episode_segments(episode_id: str):
         except OSError:
             pass
 
+    live_chunks = live_dir(episode_id)
+    if live_chunks.is_dir():
+        removed_count += sum(1 for path in live_chunks.iterdir() if path.is_file())
+        shutil.rmtree(live_chunks, ignore_errors=True)
+
     episode.save_json(settings.ensure_output_dir())
 
     return {
@@ -1303,26 +1184,19 @@ async def cleanup_episode_segments(episode_id: str):
 # ---------------------------------------------------------------------------
 
 @router.get("/episodes/{episode_id}/audio")
-async def get_episode_audio(episode_id: str):
-    """Stream the episode audio file."""
-    json_path = settings.output_dir / f"{episode_id}.json"
-    if not json_path.exists():
+async def get_episode_audio(episode_id: str, request: Request, original: bool = False):
+    """Stream the episode audio file (compressed unless ``original``)."""
+    entry = get_audio_index().lookup(episode_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Episode not found")
 
-    ep = Episode.load_json(json_path)
-    if not ep.audio_path or not Path(ep.audio_path).exists():
+    if entry.audio_path is None or not entry.audio_path.exists():
         raise HTTPException(status_code=404, detail="Audio not available")
 
-    audio_path = Path(ep.audio_path)
-    suffix = audio_path.suffix.lower()
-    media_type = "audio/wav" if suffix == ".wav" else "audio/mpeg"
-    filename_ext = "wav" if suffix == ".wav" else "mp3"
-
-    return FileResponse(
-        str(audio_path),
-        media_type=media_type,
-        filename=f"airoundtable_{episode_id}.{filename_ext}",
-    )
+    audio_path = entry.audio_path
+    if not original:
+        audio_path = await get_audio_transcoder().deliverable(audio_path)
+    return audio_response(request, audio_path, filename_stem=f"airoundtable_{episode_id}")
 
 
 # ---------------------------------------------------------------------------
@@ -1335,12 +1209,28 @@ async def knowledge_stats():
     try:
         kb = get_knowledge_base()
         stats = kb.get_collection_stats()
-        return {"status": "ok", "collections": stats}
+        return {
+            "status": "ok",
+            "collections": stats,
+            "disk_bytes": kb.disk_usage_bytes(),
+            "last_compaction": get_compaction_job().last_report,
+        }
     except Exception as exc:
         logger.error("KB stats error: %s", exc)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@router.post("/knowledge/compact")
+async def knowledge_compact():
+    """Run TTL purge + per-collection cap eviction now and return the report."""
+    try:
+        report = await get_compaction_job().run_once()
+        return {"status": "ok", "report": report}
+    except Exception as exc:
+        logger.error("KB compaction error: %s", exc)
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
 @router.post("/knowledge/query")
 async def knowledge_query(
     text: str,
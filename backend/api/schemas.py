@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -16,6 +18,22 @@ class GenerateRequest(BaseModel):
     # Document mode
     document_session_id: str | None = None  # from /api/documents/upload
     user_prompt: str = ""                   # user brief / instructions
+    # None uses settings.dialogue_generation_mode
+    generation_mode: Literal["per_line", "segment"] | None = None
+
+
+class BatchGenerateRequest(BaseModel):
+    """Request body for generating a slate of episodes in one task.
+
+    Give explicit *topics*, or a *count* of topics for the host to pick
+    from one news fetch.
+    """
+    topics: list[str] = Field(default_factory=list, max_length=20)
+    count: int = Field(default=0, ge=0, le=20)
+    selected_guests: list[str] = Field(default_factory=list, max_length=3)
+    generation_mode: Literal["per_line", "segment"] | None = None
+    # None uses settings.batch_max_concurrent_episodes
+    max_concurrent_episodes: int | None = Field(default=None, ge=1, le=8)
 
 
 class ScriptPreviewRequest(BaseModel):
@@ -27,6 +45,7 @@ class ScriptPreviewRequest(BaseModel):
     # Document mode
     document_session_id: str | None = None
     user_prompt: str = ""
+    generation_mode: Literal["per_line", "segment"] | None = None
 
 
 class GuestProfileIn(BaseModel):
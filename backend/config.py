@@ -1,6 +1,8 @@
 """MindCast configuration management via Pydantic Settings."""
 
 from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,25 +19,131 @@ class Settings(BaseSettings):
     llm_base_url: str = "https://api.deepseek.com/v1"
     llm_api_key: str = ""
     llm_model: str = "deepseek-chat"
+    # Send response_format={"type": "json_object"} for JSON replies; turn off
+    # for OpenAI-compatible providers that reject it.
+    llm_json_mode: bool = True
+    # Scheduler: in-flight chat calls per provider (base-URL host), shared by
+    # every running episode; per-host overrides e.g. {"api.deepseek.com": 16}
+    llm_max_concurrency: int = 8
+    llm_provider_concurrency: dict[str, int] = {}
+    # Retry backoff: full jitter from base * 2^n, or the provider's Retry-After
+    llm_backoff_base_s: float = 0.5
+    llm_backoff_max_s: float = 30.0
+    # Model tiers: the model above ("strong") writes dialogue, plans and
+    # articles; the "fast" model serves control calls (query expansion,
+    # fresh-search decisions, document topic derivation, context summaries,
+    # translation).  An empty fast base URL reuses the strong provider and
+    # its key; a different base URL needs its own key (else the tier is
+    # disabled).  An empty fast model sends every call to the strong model.
+    llm_fast_base_url: str = ""
+    llm_fast_api_key: str = ""
+    llm_fast_model: str = ""
+    # Per-call-site tier overrides, e.g. {"episode_plan": "fast"}
+    llm_call_tiers: dict[str, str] = {}
+    # Secondary provider tried when a call fails on its own tier (empty model:
+    # none); same key rule as the fast tier
+    llm_fallback_base_url: str = ""
+    llm_fallback_api_key: str = ""
+    llm_fallback_model: str = ""
 
     # --- Tavily ---
     tavily_api_key: str = ""
+    # Response cache: TTL seconds keyed by time_range, then topic
+    tavily_cache_enabled: bool = True
+    tavily_cache_path: Path = Path("data/cache/tavily.sqlite3")
+    tavily_cache_ttl_seconds: dict[str, int] = {
+        "day": 3600,
+        "week": 6 * 3600,
+        "month": 24 * 3600,
+        "year": 72 * 3600,
+        "news": 3600,
+        "general": 24 * 3600,
+    }
+    # Extra window in which an expired entry is served while it refreshes
+    tavily_cache_stale_seconds: int = 6 * 3600
 
     # --- MiniMax TTS ---
     minimax_api_key: str = ""
     minimax_tts_model: str = "speech-2.8-hd"
     minimax_tts_base_url: str = "https://api.minimaxi.com/v1/t2a_v2"
     minimax_audio_format: str = "wav"
+    # Process-wide cap on in-flight synthesis requests (each episode also
+    # limits itself to 4)
+    tts_max_concurrency: int = 8
 
     # --- Podcast parameters ---
     max_guests: int = 3
     episode_duration_minutes: int = 5
     target_word_count_min: int = 1500
     target_word_count_max: int = 2000
+    # Prompt budget (estimated tokens) for each dialogue line: research brief
+    # + rolling summary of older turns + the most recent turns verbatim.
+    dialogue_context_max_tokens: int = 4500
+    dialogue_brief_max_tokens: int = 2500
+    dialogue_summary_chunk_turns: int = 6
+    # Draft weakly dependent turns (next talking-point intro, final takes)
+    # concurrently; a draft overlapping a sibling turn this much is redone.
+    dialogue_speculative_turns: bool = True
+    dialogue_speculative_max_overlap: float = 0.5
+    # "per_line": one LLM call per turn; "segment": one structured call writes
+    # each talking point's whole exchange (falls back to per-line on bad output).
+    dialogue_generation_mode: Literal["per_line", "segment"] = "per_line"
     output_dir: Path = Path("output/episodes")
+    # Episodes are stored as <id>.json (summary) + <id>.body.json[.gz]
+    episode_body_gzip: bool = True
+
+    # --- Batch generation (scripts/run_batch.py, POST /api/generate/batch) ---
+    batch_max_concurrent_episodes: int = 3
+    batch_max_episodes: int = 20
+
+    # --- Audio delivery (GET /episodes/{id}/audio and segment audio) ---
+    # WAV files are served as a compressed sibling (<name>.m4a / <name>.opus)
+    # encoded with ffmpeg once the episode is stitched (or on first request);
+    # "none" always serves the original.  AAC plays in <audio> in every
+    # browser; Ogg Opus does not in older Safari.
+    audio_delivery_codec: Literal["aac", "opus", "none"] = "aac"
+    audio_delivery_bitrate: str = "64k"
+    audio_path_cache_size: int = 256  # episodes whose audio paths stay resolved
+
+    # Progressive playback: an HLS EVENT playlist of MP3 chunks grows under
+    # output/episodes/live/<episode>/ while TTS runs (needs ffmpeg).
+    live_playback_enabled: bool = True
+    live_target_duration_s: int = 30
+    # Chunks (and the task -> playlist mapping) are removed this long after
+    # synthesis ends; the stitched file is the archival copy.
+    live_retention_s: float = 1800.0
 
     # --- Knowledge base (ChromaDB) ---
     chromadb_persist_dir: Path = Path("data/chromadb")
+    # Retention: TTLs are per document type / scope (0 disables the rule)
+    kb_tavily_ttl_days: int = 14
+    kb_task_scope_ttl_hours: int = 72
+    # Per-collection document caps; collections not listed are unbounded
+    kb_collection_caps: dict[str, int] = {"background_material": 20000}
+    kb_eviction_policy: str = "age"  # "age" | "score"
+    kb_compaction_interval_minutes: int = 360  # 0 disables the scheduled job
+    # SimHash bit distance for merging syndicated Tavily results (0 disables)
+    kb_near_duplicate_max_distance: int = 10
+    # Cosine distance to the nearest past episode topic/summary at which a
+    # newly selected topic counts as a repeat
+    topic_repetition_max_distance: float = 0.2
+
+    # --- Cost estimation (Episode.metrics); rates per 1k tokens / chars ---
+    cost_currency: str = "CNY"
+    llm_price_per_1k_prompt_tokens: float = 0.002
+    llm_price_per_1k_cached_prompt_tokens: float = 0.0005  # prefix-cache hits
+    llm_price_per_1k_completion_tokens: float = 0.008
+    tts_price_per_1k_chars: float = 0.35
+
+    # --- Episode run logs (output/logs/<episode>.jsonl) ---
+    run_log_flush_interval_s: float = 1.0
+    run_log_buffer_events: int = 100  # flush early once this many are pending
+    run_log_gzip: bool = False  # compress finished logs to .jsonl.gz
+
+    # --- Debug: event-loop stall watchdog (writes output/logs/loop-stalls-*.jsonl) ---
+    loop_watchdog_enabled: bool = False
+    loop_watchdog_threshold_ms: int = 200
+    loop_watchdog_interval_ms: int = 20
 
     # --- Server ---
     host: str = "0.0.0.0"
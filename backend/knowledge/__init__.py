@@ -1,18 +1,27 @@
 """Knowledge base package — ChromaDB-backed RAG for MindCast."""
 
+import threading
+
 from backend.knowledge.base import KnowledgeBase
 from backend.knowledge.chroma_kb import ChromaKnowledgeBase
 
 __all__ = ["KnowledgeBase", "ChromaKnowledgeBase", "get_knowledge_base"]
 
 _kb_instance: ChromaKnowledgeBase | None = None
+# Opened from the warm-up thread and from request handlers; open it once.
+_kb_lock = threading.Lock()
 
 
 def get_knowledge_base() -> ChromaKnowledgeBase:
     """Return the singleton ChromaDB knowledge base instance."""
     global _kb_instance
     if _kb_instance is None:
-        from backend.config import settings
-        _kb_instance = ChromaKnowledgeBase(
-            persist_dir=settings.chromadb_persist_dir)
+        with _kb_lock:
+            if _kb_instance is None:
+                from backend.config import settings
+                _kb_instance = ChromaKnowledgeBase(
+                    persist_dir=settings.chromadb_persist_dir,
+                    near_duplicate_max_distance=settings.kb_near_duplicate_max_distance,
+                    topic_repetition_max_distance=settings.topic_repetition_max_distance,
+                )
     return _kb_instance
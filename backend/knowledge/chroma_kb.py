@@ -11,14 +11,19 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-
-import chromadb
-from chromadb.config import Settings as ChromaSettings
+from typing import TYPE_CHECKING, Any
 
 from backend.knowledge.base import KnowledgeBase
+from backend.knowledge.dedup import SimHashIndex, simhash
+from backend.knowledge.topic_index import TOPIC_INDEX_COLLECTION, TopicIndex
+from backend.services.metrics import timed_chroma_query
+
+if TYPE_CHECKING:
+    import chromadb
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +41,22 @@ KNOWLEDGE_SCOPE_KEY = "knowledge_scope"
 KNOWLEDGE_SCOPE_GLOBAL = "global"
 KNOWLEDGE_SCOPE_TASK = "task"
 
+# Document types written by NewsService from Tavily responses (TTL-managed)
+TAVILY_DOC_TYPES = frozenset({
+    "tavily_daily_news",
+    "tavily_search_result",
+    "tavily_search_answer",
+})
+
+# Eviction policies for per-collection document caps
+EVICT_BY_AGE = "age"
+EVICT_BY_SCORE = "score"
+
+_SCAN_PAGE_SIZE = 1000
+# (doc_id, content, metadata, signature) of a doc held back as a near-duplicate
+_Duplicate = tuple[str, str, dict[str, Any], int]
+_DELETE_BATCH_SIZE = 500
+
 
 def _doc_id(text: str) -> str:
     """Deterministic short ID from text content."""
@@ -54,30 +75,75 @@ class ChromaKnowledgeBase(KnowledgeBase):
     ----------
     persist_dir:
         Directory for the ChromaDB on-disk store.
+    near_duplicate_max_distance:
+        SimHash Hamming distance under which ``store_many(dedup=True)``
+        merges a document into an existing one (0 disables merging).
+    topic_repetition_max_distance:
+        Cosine distance under which :attr:`topic_index` treats a candidate
+        topic as a repeat of a past episode.
+    embedding_function:
+        Optional ChromaDB embedding function; ``None`` keeps Chroma's
+        default model (offline benchmarks pass a local stand-in).
     """
 
-    def __init__(self, persist_dir: str | Path = "data/chromadb") -> None:
+    def __init__(
+        self,
+        persist_dir: str | Path = "data/chromadb",
+        *,
+        near_duplicate_max_distance: int = 10,
+        topic_repetition_max_distance: float = 0.2,
+        embedding_function: Any | None = None,
+    ) -> None:
         persist_path = Path(persist_dir)
         persist_path.mkdir(parents=True, exist_ok=True)
+        self._persist_path = persist_path
+        self._near_duplicate_max_distance = near_duplicate_max_distance
+        self._dedup_indexes: dict[str, SimHashIndex] = {}
+        # Ingest (event loop) and compaction (worker thread) both load indexes.
+        self._dedup_lock = threading.Lock()
+
+        # chromadb takes ~0.25 s to import; only pay for it when the KB is opened.
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
 
         self._client = chromadb.PersistentClient(
             path=str(persist_path),
             settings=ChromaSettings(anonymized_telemetry=False),
         )
 
+        collection_kwargs: dict[str, Any] = {"metadata": {"hnsw:space": "cosine"}}
+        if embedding_function is not None:
+            collection_kwargs["embedding_function"] = embedding_function
+
         # Pre-create all collections
         self._collections: dict[str, chromadb.Collection] = {}
         for name in ALL_COLLECTIONS:
             self._collections[name] = self._client.get_or_create_collection(
                 name=name,
-                metadata={"hnsw:space": "cosine"},
+                **collection_kwargs,
             )
+        self.topic_index = TopicIndex(
+            self._client.get_or_create_collection(
+                name=TOPIC_INDEX_COLLECTION,
+                **collection_kwargs,
+            ),
+            max_distance=topic_repetition_max_distance,
+        )
         logger.info(
             "ChromaDB knowledge base initialized at %s with collections: %s",
             persist_path,
             ALL_COLLECTIONS,
         )
 
+    def warm_up(self) -> None:
+        """Load the embedding model, which chromadb loads on first embed.
+
+        Queries the collection directly: :meth:`query` returns early on an
+        empty collection without embedding anything.
+        """
+        self._collections[BACKGROUND_MATERIAL].query(
+            query_texts=["warmup"], n_results=1)
+
     # ------------------------------------------------------------------
     # Abstract interface implementation
     # ------------------------------------------------------------------
@@ -109,6 +175,7 @@ class ChromaKnowledgeBase(KnowledgeBase):
         if task_id:
             metadata.setdefault("task_id", task_id)
         metadata.setdefault("stored_at", datetime.now().isoformat())
+        metadata.setdefault("stored_at_ts", time.time())
 
         coll.upsert(
             ids=[doc_id],
@@ -141,10 +208,11 @@ class ChromaKnowledgeBase(KnowledgeBase):
         # This keeps backward compatibility with old docs that may not have
         # scope metadata.
         raw_limit = min(max(top_k * 4, top_k), coll.count())
-        results = coll.query(
-            query_texts=[text],
-            n_results=raw_limit,
-        )
+        with timed_chroma_query(collection):
+            results = coll.query(
+                query_texts=[text],
+                n_results=raw_limit,
+            )
 
         docs: list[dict[str, Any]] = []
         if results and results["documents"]:
@@ -178,15 +246,25 @@ class ChromaKnowledgeBase(KnowledgeBase):
         collection: str = BACKGROUND_MATERIAL,
         scope: str = KNOWLEDGE_SCOPE_GLOBAL,
         task_id: str | None = None,
+        dedup: bool = False,
     ) -> int:
-        """Batch-upsert multiple documents.  Returns the count stored."""
+        """Batch-upsert multiple documents.  Returns the count stored.
+
+        With ``dedup=True`` a document whose SimHash is within the configured
+        distance of an already stored one (or of an earlier doc in the same
+        batch) is not stored again; its URL is merged into the existing
+        document's ``source_urls`` metadata instead.
+        """
         coll = self._collections.get(collection)
         if coll is None:
             raise ValueError(f"Unknown collection: {collection}")
 
+        index = self._dedup_index(collection) if dedup else None
         ids: list[str] = []
         texts: list[str] = []
         metas: list[dict[str, Any]] = []
+        pending: dict[str, dict[str, Any]] = {}
+        merges: dict[str, list[_Duplicate]] = {}
 
         for doc in docs:
             content = doc.get("content", "")
@@ -198,17 +276,167 @@ class ChromaKnowledgeBase(KnowledgeBase):
             if task_id:
                 metadata.setdefault("task_id", task_id)
             metadata.setdefault("stored_at", datetime.now().isoformat())
+            metadata.setdefault("stored_at_ts", time.time())
+
+            if index is not None and doc_id not in index:
+                signature = simhash(content)
+                dup_id = index.find(signature, exclude=doc_id)
+                if dup_id is not None:
+                    if dup_id in pending:
+                        self._merge_sources(pending[dup_id], metadata)
+                    else:
+                        merges.setdefault(dup_id, []).append(
+                            (doc_id, content, metadata, signature))
+                    continue
+                index.add(doc_id, signature)
+
+            ids.append(doc_id)
+            texts.append(content)
+            metas.append(metadata)
+            pending[doc_id] = metadata
+
+        merged_count, orphans = self._apply_merges(coll, merges, index)
+        for doc_id, content, metadata, _ in orphans:
             ids.append(doc_id)
             texts.append(content)
             metas.append(metadata)
+        if index is not None and (ids or merged_count):
+            index.save()
 
         if not ids:
+            if merged_count:
+                logger.info(
+                    "Merged %d near-duplicate docs in [%s]", merged_count, collection)
             return 0
 
         coll.upsert(ids=ids, documents=texts, metadatas=metas)
-        logger.info("Batch-stored %d docs in [%s]", len(ids), collection)
+        logger.info(
+            "Batch-stored %d docs in [%s] (merged %d near-duplicates)",
+            len(ids), collection, merged_count,
+        )
         return len(ids)
 
+    # ------------------------------------------------------------------
+    # Near-duplicate merging
+    # ------------------------------------------------------------------
+
+    def _dedup_index(self, collection: str) -> SimHashIndex | None:
+        """Return (loading or backfilling on first use) a collection's index."""
+        if self._near_duplicate_max_distance <= 0:
+            return None
+        index = self._dedup_indexes.get(collection)
+        if index is not None:
+            return index
+        with self._dedup_lock:
+            index = self._dedup_indexes.get(collection)
+            if index is None:
+                index = SimHashIndex(
+                    self._persist_path / f"simhash_{collection}.json",
+                    max_distance=self._near_duplicate_max_distance,
+                )
+                if not index.loaded_from_disk:
+                    self._backfill_signatures(collection, index)
+                self._dedup_indexes[collection] = index
+        return index
+
+    def _backfill_signatures(self, collection: str, index: SimHashIndex) -> None:
+        """Index Tavily documents stored before the signature file existed."""
+        coll = self._collections[collection]
+        offset = 0
+        while True:
+            page = coll.get(
+                include=["documents", "metadatas"],
+                limit=_SCAN_PAGE_SIZE,
+                offset=offset,
+            )
+            page_ids = page.get("ids") or []
+            if not page_ids:
+                break
+            documents = page.get("documents") or [""] * len(page_ids)
+            metadatas = page.get("metadatas") or [None] * len(page_ids)
+            for doc_id, content, md in zip(page_ids, documents, metadatas):
+                if (md or {}).get("type") in TAVILY_DOC_TYPES and content:
+                    index.add(doc_id, simhash(content))
+            if len(page_ids) < _SCAN_PAGE_SIZE:
+                break
+            offset += len(page_ids)
+        index.save()
+        logger.info(
+            "Backfilled %d SimHash signatures for [%s]", len(index), collection)
+
+    @staticmethod
+    def _source_urls(metadata: dict[str, Any]) -> list[str]:
+        urls = [u for u in str(metadata.get("source_urls") or "").split("\n") if u]
+        url = metadata.get("url")
+        if url and url not in urls:
+            urls.insert(0, url)
+        return urls
+
+    @classmethod
+    def _merge_sources(cls, target: dict[str, Any], duplicate: dict[str, Any]) -> None:
+        """Fold *duplicate*'s provenance into *target* metadata in place.
+
+        ChromaDB metadata values must be scalars, so the URL list is stored
+        newline-separated in ``source_urls``.
+        """
+        urls = cls._source_urls(target)
+        for url in cls._source_urls(duplicate):
+            if url not in urls:
+                urls.append(url)
+        if urls:
+            target["source_urls"] = "\n".join(urls)
+        target["duplicate_count"] = int(target.get("duplicate_count") or 0) + 1
+        target["last_seen_at"] = datetime.now().isoformat()
+        scores = [
+            v for v in (target.get("score"), duplicate.get("score"))
+            if isinstance(v, (int, float))
+        ]
+        if scores:
+            target["score"] = max(scores)
+
+    def _apply_merges(
+        self,
+        coll: Any,
+        merges: dict[str, list[_Duplicate]],
+        index: SimHashIndex | None,
+    ) -> tuple[int, list[_Duplicate]]:
+        """Update stored documents with provenance from merged duplicates.
+
+        Returns the number of duplicates merged and the documents that must
+        be stored after all: when the index points at a document that no
+        longer exists, its stale signature is dropped and the first
+        duplicate takes its place (the others merge into it).
+        """
+        if not merges:
+            return 0, []
+        existing = coll.get(ids=list(merges), include=["metadatas"])
+        update_ids: list[str] = []
+        update_metas: list[dict[str, Any]] = []
+        for doc_id, md in zip(existing.get("ids") or [], existing.get("metadatas") or []):
+            target = dict(md or {})
+            for _, _, duplicate, _ in merges.get(doc_id, []):
+                self._merge_sources(target, duplicate)
+            update_ids.append(doc_id)
+            update_metas.append(target)
+        if update_ids:
+            coll.update(ids=update_ids, metadatas=update_metas)
+        merged = sum(len(merges[doc_id]) for doc_id in update_ids)
+
+        orphans: list[_Duplicate] = []
+        found = set(update_ids)
+        for stale_id in [doc_id for doc_id in merges if doc_id not in found]:
+            first, *rest = merges[stale_id]
+            for _, _, duplicate, _ in rest:
+                self._merge_sources(first[2], duplicate)
+            if index is not None:
+                index.discard([stale_id])
+                index.add(first[0], first[3])
+            logger.warning("SimHash index pointed at missing doc %s; storing %s",
+                           stale_id, first[0])
+            orphans.append(first)
+            merged += len(rest)
+        return merged, orphans
+
     async def query_multiple_collections(
         self,
         text: str,
@@ -292,6 +520,12 @@ class ChromaKnowledgeBase(KnowledgeBase):
             scope=KNOWLEDGE_SCOPE_GLOBAL,
         )
 
+        try:
+            self.topic_index.add(episode_id, topic, summary)
+        except Exception as exc:
+            logger.warning(
+                "Failed to index topic of episode %s: %s", episode_id, exc)
+
         # Store key dialogue lines (skip very short lines)
         notable_lines = [
             line for line in dialogue_lines
@@ -477,3 +711,222 @@ class ChromaKnowledgeBase(KnowledgeBase):
     def get_collection_stats(self) -> dict[str, int]:
         """Return document count per collection (for monitoring)."""
         return {name: coll.count() for name, coll in self._collections.items()}
+
+    # ------------------------------------------------------------------
+    # Retention: TTL purge, per-collection caps, compaction
+    # ------------------------------------------------------------------
+    # These helpers are synchronous because they scan and delete in bulk;
+    # the scheduled job in ``backend.knowledge.retention`` runs them in a
+    # worker thread so the event loop is never blocked by a full scan.
+
+    @staticmethod
+    def _doc_timestamp(metadata: dict[str, Any] | None) -> float | None:
+        """Return the store time of a document as a UNIX timestamp.
+
+        Older documents only carry the ISO ``stored_at`` string, newer ones
+        also carry the numeric ``stored_at_ts``.
+        """
+        md = metadata or {}
+        ts = md.get("stored_at_ts")
+        if isinstance(ts, (int, float)):
+            return float(ts)
+        stored_at = md.get("stored_at")
+        if isinstance(stored_at, str) and stored_at:
+            try:
+                return datetime.fromisoformat(stored_at).timestamp()
+            except ValueError:
+                return None
+        return None
+
+    @staticmethod
+    def _expiry_ttl(
+        metadata: dict[str, Any] | None,
+        *,
+        tavily_ttl: float,
+        task_ttl: float,
+    ) -> float:
+        """Return the TTL (seconds) that applies to a document, 0 = keep forever."""
+        md = metadata or {}
+        if md.get(KNOWLEDGE_SCOPE_KEY) == KNOWLEDGE_SCOPE_TASK:
+            return task_ttl
+        if md.get("type") in TAVILY_DOC_TYPES:
+            return tavily_ttl
+        return 0.0
+
+    def _scan_metadata(self, coll: Any) -> list[tuple[str, dict[str, Any]]]:
+        """Page through a collection and return ``(id, metadata)`` pairs."""
+        entries: list[tuple[str, dict[str, Any]]] = []
+        offset = 0
+        while True:
+            page = coll.get(
+                include=["metadatas"],
+                limit=_SCAN_PAGE_SIZE,
+                offset=offset,
+            )
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            metadatas = page.get("metadatas") or [None] * len(ids)
+            entries.extend(
+                (doc_id, md or {}) for doc_id, md in zip(ids, metadatas)
+            )
+            if len(ids) < _SCAN_PAGE_SIZE:
+                break
+            offset += len(ids)
+        return entries
+
+    def _delete_ids(self, name: str, ids: list[str]) -> int:
+        """Delete *ids* in batches and return the removed content size (chars)."""
+        coll = self._collections[name]
+        removed_chars = 0
+        for start in range(0, len(ids), _DELETE_BATCH_SIZE):
+            batch = ids[start:start + _DELETE_BATCH_SIZE]
+            page = coll.get(ids=batch, include=["documents"])
+            removed_chars += sum(len(doc or "")
+                                 for doc in page.get("documents") or [])
+            coll.delete(ids=batch)
+
+        index = self._dedup_index(name)
+        if index is not None and index.discard(ids):
+            index.save()
+        return removed_chars
+
+    def purge_expired(
+        self,
+        *,
+        tavily_ttl_seconds: float,
+        task_ttl_seconds: float,
+        now: float | None = None,
+    ) -> dict[str, dict[str, int]]:
+        """Delete Tavily-sourced and task-scoped documents older than their TTL.
+
+        Documents without any timestamp are left untouched.  Returns removed
+        document / character counts per collection.
+        """
+        current = time.time() if now is None else now
+        report: dict[str, dict[str, int]] = {}
+        for name, coll in self._collections.items():
+            expired: list[str] = []
+            for doc_id, md in self._scan_metadata(coll):
+                ttl = self._expiry_ttl(
+                    md, tavily_ttl=tavily_ttl_seconds, task_ttl=task_ttl_seconds,
+                )
+                if ttl <= 0:
+                    continue
+                ts = self._doc_timestamp(md)
+                if ts is not None and current - ts > ttl:
+                    expired.append(doc_id)
+            if expired:
+                removed_chars = self._delete_ids(name, expired)
+                report[name] = {"docs": len(expired), "chars": removed_chars}
+                logger.info(
+                    "Purged %d expired docs from [%s]", len(expired), name)
+        return report
+
+    def enforce_caps(
+        self,
+        caps: dict[str, int],
+        *,
+        policy: str = EVICT_BY_AGE,
+    ) -> dict[str, dict[str, int]]:
+        """Evict global-scope documents from collections above their cap.
+
+        ``age`` evicts the oldest documents first; ``score`` evicts the
+        lowest Tavily score first (ties and unscored docs by age).
+        Task-scoped documents are never evicted here — they expire via TTL.
+        """
+        report: dict[str, dict[str, int]] = {}
+        for name, cap in caps.items():
+            coll = self._collections.get(name)
+            if coll is None or cap <= 0:
+                continue
+            total = coll.count()
+            if total <= cap:
+                continue
+
+            candidates = [
+                (doc_id, md) for doc_id, md in self._scan_metadata(coll)
+                if md.get(KNOWLEDGE_SCOPE_KEY, KNOWLEDGE_SCOPE_GLOBAL)
+                == KNOWLEDGE_SCOPE_GLOBAL
+            ]
+
+            def _age_key(entry: tuple[str, dict[str, Any]]) -> float:
+                ts = self._doc_timestamp(entry[1])
+                return ts if ts is not None else 0.0
+
+            if policy == EVICT_BY_SCORE:
+                def _score_key(entry: tuple[str, dict[str, Any]]) -> tuple[float, float]:
+                    score = entry[1].get("score")
+                    value = float(score) if isinstance(
+                        score, (int, float)) else 0.0
+                    return (value, _age_key(entry))
+                candidates.sort(key=_score_key)
+            else:
+                candidates.sort(key=_age_key)
+
+            overflow = total - cap
+            victims = [doc_id for doc_id, _ in candidates[:overflow]]
+            if victims:
+                removed_chars = self._delete_ids(name, victims)
+                report[name] = {"docs": len(victims), "chars": removed_chars}
+                logger.info(
+                    "Evicted %d docs from [%s] (cap=%d, policy=%s)",
+                    len(victims), name, cap, policy,
+                )
+        return report
+
+    def disk_usage_bytes(self) -> int:
+        """Return the total size of the on-disk ChromaDB store."""
+        return sum(
+            path.stat().st_size
+            for path in self._persist_path.rglob("*")
+            if path.is_file()
+        )
+
+    def compact(
+        self,
+        *,
+        tavily_ttl_seconds: float,
+        task_ttl_seconds: float,
+        caps: dict[str, int],
+        policy: str = EVICT_BY_AGE,
+    ) -> dict[str, Any]:
+        """Run TTL purge + cap eviction and report what was reclaimed."""
+        started = time.perf_counter()
+        counts_before = self.get_collection_stats()
+        bytes_before = self.disk_usage_bytes()
+
+        expired = self.purge_expired(
+            tavily_ttl_seconds=tavily_ttl_seconds,
+            task_ttl_seconds=task_ttl_seconds,
+        )
+        evicted = self.enforce_caps(caps, policy=policy)
+
+        counts_after = self.get_collection_stats()
+        bytes_after = self.disk_usage_bytes()
+        report = {
+            "finished_at": datetime.now().isoformat(),
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "expired": expired,
+            "evicted": evicted,
+            "docs_removed": sum(
+                item["docs"] for item in [*expired.values(), *evicted.values()]
+            ),
+            "content_chars_removed": sum(
+                item["chars"] for item in [*expired.values(), *evicted.values()]
+            ),
+            "counts_before": counts_before,
+            "counts_after": counts_after,
+            "disk_bytes_before": bytes_before,
+            "disk_bytes_after": bytes_after,
+            # SQLite reuses freed pages rather than shrinking the file, so
+            # this can be 0 even when many documents were removed.
+            "disk_bytes_reclaimed": max(0, bytes_before - bytes_after),
+        }
+        logger.info(
+            "KB compaction removed %d docs (%d chars) in %.3fs",
+            report["docs_removed"],
+            report["content_chars_removed"],
+            report["elapsed_seconds"],
+        )
+        return report
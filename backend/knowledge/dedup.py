@@ -0,0 +1,204 @@
+"""Near-duplicate detection for knowledge-base ingest (64-bit SimHash).
+
+The same news story syndicated across outlets arrives from Tavily with
+different URLs but near-identical text.  Each document gets a SimHash
+signature over character shingles; two documents whose signatures differ in
+at most ``max_distance`` bits are treated as the same story.
+
+Signatures live in a small JSON file next to the ChromaDB store.  Lookups use
+banded LSH: the 64 bits are split into ``max_distance + 1`` bands, so by the
+pigeonhole principle any signature within the distance shares at least one
+band exactly with the query and no near-duplicate is missed.
+
+The bands are narrow at the default distance, so they filter little: at
+``max_distance=10`` there are 11 bands of 5 bits, and an unrelated signature
+shares some band with the query with probability 1 - (31/32)**11, about
+30%.  :meth:`SimHashIndex.find` therefore compares against roughly a third
+of the index (one XOR and popcount each), i.e. O(n) with a small constant.
+That is cheap for the few thousand Tavily documents a knowledge base holds;
+a lower ``max_distance`` gives wider bands and far fewer candidates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+
+from backend.services.json_store import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_BITS = 64
+_SHINGLE_SIZE = 3
+_NOISE_RE = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def _normalize(text: str) -> str:
+    return _NOISE_RE.sub("", (text or "").lower())
+
+
+def simhash(text: str, *, shingle_size: int = _SHINGLE_SIZE) -> int:
+    """Return the 64-bit SimHash of *text* over character shingles.
+
+    Character shingles work for Chinese text without a word segmenter and
+    are robust to the small edits syndication usually introduces.
+    """
+    normalized = _normalize(text)
+    if not normalized:
+        return 0
+    if len(normalized) <= shingle_size:
+        shingles = Counter([normalized])
+    else:
+        shingles = Counter(
+            normalized[i:i + shingle_size]
+            for i in range(len(normalized) - shingle_size + 1)
+        )
+
+    weights = [0] * SIGNATURE_BITS
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(
+            shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIGNATURE_BITS):
+            weights[bit] += count if (value >> bit) & 1 else -count
+
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return (left ^ right).bit_count()
+
+
+class SimHashIndex:
+    """Persistent ``doc_id -> signature`` map with banded LSH lookup.
+
+    Parameters
+    ----------
+    path:
+        JSON file holding the signatures (created on first save).
+    max_distance:
+        Largest Hamming distance treated as a near-duplicate.
+    """
+
+    def __init__(self, path: str | Path, *, max_distance: int = 10) -> None:
+        self.path = Path(path)
+        self.max_distance = max(0, max_distance)
+        self._bands = self.max_distance + 1
+        self._band_bits = SIGNATURE_BITS // self._bands
+        self._signatures: dict[str, int] = {}
+        self._buckets: dict[tuple[int, int], set[str]] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.loaded_from_disk = False
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            for doc_id, hex_sig in raw.get("signatures", {}).items():
+                self._insert(doc_id, int(hex_sig, 16))
+            self.loaded_from_disk = True
+        except Exception as exc:
+            logger.warning(
+                "Failed to load SimHash index %s, starting empty: %s", self.path, exc)
+            self._signatures.clear()
+            self._buckets.clear()
+
+    def save(self) -> None:
+        """Write the index atomically (unique temp file + rename).
+
+        Ingest (event loop) and compaction (worker thread) both save;
+        ``_save_lock`` keeps snapshot and write together, so the file
+        always ends with the newest snapshot.
+        """
+        with self._save_lock:
+            with self._lock:
+                payload = {
+                    "version": 1,
+                    "max_distance": self.max_distance,
+                    "signatures": {
+                        doc_id: f"{sig:016x}" for doc_id, sig in self._signatures.items()
+                    },
+                }
+            atomic_write_bytes(self.path, json.dumps(
+                payload, separators=(",", ":")).encode("utf-8"))
+
+    # ------------------------------------------------------------------
+    # Index operations
+    # ------------------------------------------------------------------
+
+    def _band_keys(self, signature: int) -> list[tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [
+            (band, (signature >> (band * self._band_bits)) & mask)
+            for band in range(self._bands)
+        ]
+
+    def _insert(self, doc_id: str, signature: int) -> None:
+        self._discard(doc_id)
+        self._signatures[doc_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(doc_id)
+
+    def _discard(self, doc_id: str) -> None:
+        old = self._signatures.pop(doc_id, None)
+        if old is None:
+            return
+        for key in self._band_keys(old):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def add(self, doc_id: str, signature: int) -> None:
+        with self._lock:
+            self._insert(doc_id, signature)
+
+    def discard(self, doc_ids: list[str]) -> int:
+        """Forget signatures for deleted documents; returns how many were known."""
+        with self._lock:
+            known = [doc_id for doc_id in doc_ids if doc_id in self._signatures]
+            for doc_id in known:
+                self._discard(doc_id)
+            return len(known)
+
+    def find(self, signature: int, *, exclude: str | None = None) -> str | None:
+        """Return the closest indexed doc within ``max_distance``, if any."""
+        if signature == 0:
+            return None
+        with self._lock:
+            candidates: set[str] = set()
+            for key in self._band_keys(signature):
+                candidates |= self._buckets.get(key, set())
+            best_id: str | None = None
+            best_distance = self.max_distance + 1
+            for doc_id in candidates:
+                if doc_id == exclude:
+                    continue
+                distance = hamming_distance(
+                    signature, self._signatures[doc_id])
+                if distance < best_distance:
+                    best_id, best_distance = doc_id, distance
+            return best_id
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
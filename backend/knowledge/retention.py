@@ -0,0 +1,92 @@
+"""Scheduled retention / compaction job for the ChromaDB knowledge base.
+
+Tavily results and task-scoped upload chunks would otherwise accumulate in
+``background_material`` forever.  The job periodically:
+
+1. purges documents past their per-type TTL (Tavily news, task scope),
+2. evicts the oldest / lowest-scored documents from capped collections,
+3. records a report with removed counts and disk usage before/after.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgeCompactionJob:
+    """Run :meth:`ChromaKnowledgeBase.compact` once or on a fixed interval."""
+
+    def __init__(self, interval_minutes: int | None = None) -> None:
+        self.interval_minutes = (
+            settings.kb_compaction_interval_minutes
+            if interval_minutes is None else interval_minutes
+        )
+        self.last_report: dict[str, Any] | None = None
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def run_once(self) -> dict[str, Any]:
+        """Compact the knowledge base now (serialized with the scheduled run)."""
+        from backend.knowledge import get_knowledge_base
+
+        async with self._lock:
+            kb = await asyncio.to_thread(get_knowledge_base)  # may open ChromaDB
+            report = await asyncio.to_thread(
+                kb.compact,
+                tavily_ttl_seconds=settings.kb_tavily_ttl_days * 86400,
+                task_ttl_seconds=settings.kb_task_scope_ttl_hours * 3600,
+                caps=dict(settings.kb_collection_caps),
+                policy=settings.kb_eviction_policy,
+            )
+            self.last_report = report
+            return report
+
+    async def _loop(self) -> None:
+        interval = self.interval_minutes * 60
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Scheduled KB compaction failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start the periodic job (no-op when disabled or already running)."""
+        if self.interval_minutes <= 0:
+            logger.info("KB compaction schedule disabled")
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info(
+            "KB compaction scheduled every %d minutes", self.interval_minutes)
+
+    async def stop(self) -> None:
+        """Cancel the periodic job and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_compaction_job: KnowledgeCompactionJob | None = None
+
+
+def get_compaction_job() -> KnowledgeCompactionJob:
+    """Return the process-wide compaction job."""
+    global _compaction_job
+    if _compaction_job is None:
+        _compaction_job = KnowledgeCompactionJob()
+    return _compaction_job
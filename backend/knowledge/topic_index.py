@@ -0,0 +1,157 @@
+"""Vector index of past episode topics for topic de-duplication.
+
+Every saved episode contributes two vectors to a dedicated ChromaDB
+collection: its topic sentence and its summary.  Checking whether a
+candidate topic repeats the back catalogue is then one nearest-neighbour
+query, independent of how many episodes exist, and catches paraphrases that
+a token-overlap comparison against the last few topics misses.
+
+The collection is kept out of ``ALL_COLLECTIONS`` so it never shows up in
+RAG retrieval or retention sweeps.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from backend.services.metrics import timed_chroma_query
+
+logger = logging.getLogger(__name__)
+
+TOPIC_INDEX_COLLECTION = "episode_topics"
+
+_KIND_TOPIC = "topic"
+_KIND_SUMMARY = "summary"
+
+
+class TopicMatch(NamedTuple):
+    episode_id: str
+    topic: str
+    distance: float
+
+
+class TopicIndex:
+    """Nearest-neighbour lookup over every past episode topic and summary.
+
+    Parameters
+    ----------
+    collection:
+        ChromaDB collection (cosine space) holding the vectors.
+    max_distance:
+        Cosine distance at or below which a candidate counts as a repeat.
+    """
+
+    def __init__(self, collection: Any, *, max_distance: float = 0.2) -> None:
+        self._collection = collection
+        self.max_distance = max_distance
+        self._backfilled = False
+
+    @staticmethod
+    def _vector_ids(episode_id: str) -> list[str]:
+        return [f"{episode_id}:{_KIND_TOPIC}", f"{episode_id}:{_KIND_SUMMARY}"]
+
+    def add(self, episode_id: str, topic: str, summary: str = "") -> None:
+        """Index (or re-index) one episode's topic and summary."""
+        topic = (topic or "").strip()
+        if not episode_id or not topic:
+            return
+        ids, documents, metadatas = [], [], []
+        for vector_id, kind, text in zip(
+            self._vector_ids(episode_id),
+            (_KIND_TOPIC, _KIND_SUMMARY),
+            (topic, (summary or "").strip()),
+        ):
+            if not text:
+                continue
+            ids.append(vector_id)
+            documents.append(text)
+            metadatas.append(
+                {"episode_id": episode_id, "topic": topic, "kind": kind})
+        self._collection.upsert(
+            ids=ids, documents=documents, metadatas=metadatas)
+
+    def remove(self, episode_id: str) -> None:
+        self._collection.delete(ids=self._vector_ids(episode_id))
+
+    def nearest_many(
+        self,
+        texts: list[str],
+        *,
+        exclude_episode_id: str | None = None,
+    ) -> list[TopicMatch | None]:
+        """Return the closest past episode for each text (one batched query)."""
+        results: list[TopicMatch | None] = [None] * len(texts)
+        queries = [(i, t.strip()) for i, t in enumerate(texts) if t and t.strip()]
+        total = self._collection.count()
+        if not queries or total == 0:
+            return results
+
+        # A couple of spare neighbours so excluding the current episode's own
+        # vectors still leaves a real candidate.
+        with timed_chroma_query(TOPIC_INDEX_COLLECTION):
+            response = self._collection.query(
+                query_texts=[text for _, text in queries],
+                n_results=min(total, 3),
+                include=["metadatas", "distances"],
+            )
+        for (position, _), metadatas, distances in zip(
+            queries, response.get("metadatas") or [], response.get("distances") or [],
+        ):
+            for metadata, distance in zip(metadatas or [], distances or []):
+                metadata = metadata or {}
+                episode_id = str(metadata.get("episode_id", ""))
+                if exclude_episode_id and episode_id == exclude_episode_id:
+                    continue
+                results[position] = TopicMatch(
+                    episode_id, str(metadata.get("topic", "")), float(distance))
+                break
+        return results
+
+    def nearest(
+        self, text: str, *, exclude_episode_id: str | None = None,
+    ) -> TopicMatch | None:
+        return self.nearest_many([text], exclude_episode_id=exclude_episode_id)[0]
+
+    def find_repeats(
+        self,
+        texts: list[str],
+        *,
+        exclude_episode_id: str | None = None,
+    ) -> list[TopicMatch | None]:
+        """Like :meth:`nearest_many`, keeping only matches within the threshold."""
+        return [
+            match if match is not None and match.distance <= self.max_distance else None
+            for match in self.nearest_many(texts, exclude_episode_id=exclude_episode_id)
+        ]
+
+    def backfill(self, output_dir: Path) -> int:
+        """Index saved episodes that predate the index (runs once per process)."""
+        if self._backfilled:
+            return 0
+        self._backfilled = True
+        if not output_dir.exists():
+            return 0
+
+        from backend.models import EpisodeMeta, episode_meta_paths
+
+        indexed = {
+            str((md or {}).get("episode_id", ""))
+            for md in (self._collection.get(include=["metadatas"]).get("metadatas") or [])
+        }
+        added = 0
+        for json_path in episode_meta_paths(output_dir):
+            if json_path.stem in indexed:
+                continue
+            try:
+                episode = EpisodeMeta.load(json_path)
+            except Exception:
+                continue
+            topic = (episode.topic or episode.title or "").strip()
+            if topic:
+                self.add(episode.id, topic, episode.summary)
+                added += 1
+        if added:
+            logger.info("Backfilled topic index with %d past episodes", added)
+        return added
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import gzip
 import uuid
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from backend.config import settings
+from backend.services.json_store import atomic_write_bytes
 
 
 # ---------------------------------------------------------------------------
@@ -71,6 +75,59 @@ class DialogueLine(BaseModel):
     pause_after: float = 0.3   # seconds
 
 
+# ---------------------------------------------------------------------------
+# Structured LLM replies (validated by backend.services.structured_output)
+# ---------------------------------------------------------------------------
+
+class LineDraft(BaseModel):
+    """A single line as returned by ``generate_line``."""
+    text: str
+    ssml_text: str = ""
+    emotion: str = "neutral"
+
+
+class SegmentLineDraft(LineDraft):
+    """One line of a whole-segment reply; unknown speakers are dropped later."""
+    speaker: str
+    text: str = ""
+
+
+class SegmentDraft(BaseModel):
+    """Reply of ``HostAgent.generate_segment``."""
+    lines: list[SegmentLineDraft]
+
+
+class TopicChoice(BaseModel):
+    """Reply of ``HostAgent.select_topic``; extra keys are kept."""
+    model_config = {"extra": "allow"}
+
+    index: int = 0
+    topic: str
+    reason: str = ""
+    conflict_points: list[str] | str = Field(default_factory=list)
+    search_queries: list[str] = Field(default_factory=list)
+    angle_hint: str = ""
+
+
+class TopicSlate(BaseModel):
+    """Reply of ``HostAgent.select_topics`` (batch generation)."""
+    topics: list[TopicChoice] = Field(default_factory=list)
+
+
+class FreshSearchDecision(BaseModel):
+    """Reply of ``HostAgent.decide_need_fresh_search``."""
+    need_fresh_search: bool = False
+    reason: str = ""
+    focus: str = ""
+
+
+class DocumentTopic(BaseModel):
+    """Topic derived from uploaded documents (document mode)."""
+    topic: str
+    reason: str = ""
+    search_queries: list[str] = Field(default_factory=list)
+
+
 # ---------------------------------------------------------------------------
 # Episode
 # ---------------------------------------------------------------------------
@@ -148,6 +205,65 @@ class EpisodePlan(BaseModel):
         return [self.talking_point_text(i) for i in range(len(self.talking_points)) if self.talking_point_text(i)]
 
 
+# Episode storage: ``<id>.json`` is a small :class:`EpisodeMeta` record; the
+# full episode (dialogue, sources, article, metrics) lives in a body file
+# next to it.  Listing, topic de-dup and audio lookups read only the record.
+EPISODE_BODY_SUFFIX = ".body.json"
+EPISODE_BODY_SUFFIX_GZ = ".body.json.gz"
+
+
+def episode_meta_paths(output_dir: Path) -> list[Path]:
+    """Summary records in *output_dir* (body files excluded)."""
+    return [path for path in output_dir.glob("*.json")
+            if not path.name.endswith(EPISODE_BODY_SUFFIX)]
+
+
+def episode_body_paths(output_dir: Path, episode_id: str) -> list[Path]:
+    """Every body file name an episode may have (for cleanup)."""
+    return [output_dir / f"{episode_id}{suffix}"
+            for suffix in (EPISODE_BODY_SUFFIX, EPISODE_BODY_SUFFIX_GZ)]
+
+
+class EpisodeMeta(BaseModel):
+    """Summary record of an episode, stored as ``<id>.json``."""
+    id: str
+    title: str = ""
+    topic: str = ""
+    summary: str = ""
+    created_at: datetime = Field(default_factory=datetime.now)
+    guests: list[str] = Field(default_factory=list)
+    audio_path: str | None = None
+    generation_log_path: str | None = None
+    duration_seconds: float | None = None
+    word_count: int = 0
+    document_session_id: str | None = None
+    user_prompt: str = ""
+    line_count: int = 0
+    segment_audio_paths: list[str | None] = Field(default_factory=list)
+    # Body file name next to the record; None for legacy single-file episodes
+    body_file: str | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _derive_from_legacy(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "dialogue" in data:
+            lines = data.get("dialogue") or []
+            data = {
+                **data,
+                "line_count": len(lines),
+                "segment_audio_paths": [
+                    line.get("segment_audio_path") if isinstance(line, dict) else None
+                    for line in lines
+                ],
+            }
+        return data
+
+    @classmethod
+    def load(cls, path: Path) -> "EpisodeMeta":
+        """Load the summary record without touching the episode body."""
+        return cls.model_validate_json(path.read_bytes())
+
+
 class Episode(BaseModel):
     """A complete podcast episode."""
     id: str = Field(default_factory=lambda: uuid.uuid4().hex[:12])
@@ -163,20 +279,48 @@ class Episode(BaseModel):
     duration_seconds: float | None = None
     word_count: int = 0
     article: str = ""  # High-quality long-form article generated after episode
+    # Latency / token / cost breakdown from the run's telemetry spans
+    metrics: dict[str, Any] = Field(default_factory=dict)
     # --- Document mode ---
     # Set when generated from uploaded documents
     document_session_id: str | None = None
     # User-supplied prompt / brief for document mode
     user_prompt: str = ""
 
-    def save_json(self, output_dir: Path) -> Path:
-        """Persist episode metadata as JSON."""
-        output_dir.mkdir(parents=True, exist_ok=True)
+    def meta(self, *, body_file: str | None = None) -> EpisodeMeta:
+        return EpisodeMeta.model_validate(
+            {**self.model_dump(exclude={"news_sources", "article", "metrics"}),
+             "body_file": body_file})
+
+    def save_json(self, output_dir: Path, *, compress: bool | None = None) -> Path:
+        """Persist the episode as a summary record plus a body file.
+
+        The body (compact JSON, gzipped unless ``settings.episode_body_gzip``
+        is off) is written before the record, both atomically, so a reader
+        never finds a record whose body is missing.  Returns the record path.
+        """
+        compress = settings.episode_body_gzip if compress is None else compress
+        suffix = EPISODE_BODY_SUFFIX_GZ if compress else EPISODE_BODY_SUFFIX
+        body_path = output_dir / f"{self.id}{suffix}"
+        body = self.model_dump_json().encode("utf-8")
+        atomic_write_bytes(body_path, gzip.compress(body, mtime=0) if compress else body)
+
         path = output_dir / f"{self.id}.json"
-        path.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        record = self.meta(body_file=body_path.name).model_dump_json(indent=2)
+        atomic_write_bytes(path, record.encode("utf-8"))
+        for stale in episode_body_paths(output_dir, self.id):
+            if stale != body_path:
+                stale.unlink(missing_ok=True)
         return path
 
     @classmethod
     def load_json(cls, path: Path) -> "Episode":
-        """Load an episode from a JSON file."""
-        return cls.model_validate_json(path.read_text(encoding="utf-8"))
+        """Load a full episode from its summary record path."""
+        raw = path.read_bytes()
+        meta = EpisodeMeta.model_validate_json(raw)
+        if meta.body_file is None:  # legacy single-file episode
+            return cls.model_validate_json(raw)
+        body = (path.parent / meta.body_file).read_bytes()
+        if meta.body_file.endswith(".gz"):
+            body = gzip.decompress(body)
+        return cls.model_validate_json(body)
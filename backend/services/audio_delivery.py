@@ -0,0 +1,246 @@
+"""Serving episode and segment audio to players.
+
+Two costs used to dominate audio playback: every request re-parsed the
+episode JSON just to find a file path, and the files themselves were WAV,
+5-10x larger than a speech codec needs.
+
+- :class:`EpisodeAudioIndex` keeps the resolved audio paths of recently
+  played episodes, read from the small summary record only.  An entry is
+  reused while the record's stat signature is unchanged.
+- :class:`AudioTranscoder` encodes a WAV into a compressed sibling file
+  (``<name>.m4a`` or ``<name>.opus``, ``settings.audio_delivery_codec``)
+  with ffmpeg.  The orchestrator starts the encode as soon as an episode is
+  stitched (:meth:`AudioTranscoder.prepare`); a request that arrives
+  earlier waits for it.  A URL therefore always serves one representation:
+  a player must never get compressed bytes at WAV byte offsets on a later
+  Range request.  Without ffmpeg, or if the encode fails, the original
+  file is served.
+- :func:`audio_response` adds a validator ETag, ``Cache-Control`` and
+  ``304 Not Modified``.  Range requests (player seeking) are handled by
+  Starlette's ``FileResponse``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import shutil
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from backend.config import settings
+from backend.models import EpisodeMeta
+from backend.services.json_store import FileSignature, file_signature
+
+logger = logging.getLogger(__name__)
+
+# codec -> (file suffix, ffmpeg encoder)
+_CODECS: dict[str, tuple[str, str]] = {
+    "opus": (".opus", "libopus"),
+    "aac": (".m4a", "aac"),
+}
+# MP4 needs its index up front for progressive playback and seeking.
+_EXTRA_ARGS: dict[str, tuple[str, ...]] = {"aac": ("-movflags", "+faststart")}
+_MEDIA_TYPES = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".opus": "audio/ogg",
+    ".m4a": "audio/mp4",
+}
+# Audio at a URL can change in place (retime), so clients revalidate.
+_CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class EpisodeAudio:
+    """Audio files referenced by one episode JSON."""
+
+    audio_path: Path | None
+    segment_paths: tuple[Path | None, ...]
+
+
+class EpisodeAudioIndex:
+    """LRU of resolved episode audio paths, invalidated by JSON signature."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries or settings.audio_path_cache_size
+        self._entries: OrderedDict[Path, tuple[FileSignature, EpisodeAudio]] = OrderedDict()
+
+    def lookup(self, episode_id: str) -> EpisodeAudio | None:
+        """Return the episode's audio paths, or ``None`` if it does not exist."""
+        json_path = settings.output_dir / f"{episode_id}.json"
+        signature = file_signature(json_path)
+        if signature is None:
+            self._entries.pop(json_path, None)
+            return None
+
+        cached = self._entries.get(json_path)
+        if cached is not None and cached[0] == signature:
+            self._entries.move_to_end(json_path)
+            return cached[1]
+
+        meta = EpisodeMeta.load(json_path)
+        entry = EpisodeAudio(
+            audio_path=Path(meta.audio_path) if meta.audio_path else None,
+            segment_paths=tuple(
+                Path(path) if path else None for path in meta.segment_audio_paths),
+        )
+        self._entries[json_path] = (signature, entry)
+        self._entries.move_to_end(json_path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+
+@functools.cache
+def _ffmpeg() -> str | None:
+    return shutil.which("ffmpeg")
+
+
+def compressed_variants(source: Path) -> list[Path]:
+    """Every compressed sibling that may exist for *source* (for cleanup)."""
+    return [source.with_suffix(suffix) for suffix, _ in _CODECS.values()]
+
+
+class AudioTranscoder:
+    """Encodes WAV files into compressed siblings, once per source version."""
+
+    def __init__(self, codec: str | None = None, bitrate: str | None = None,
+                 max_concurrency: int = 2) -> None:
+        self.codec = codec or settings.audio_delivery_codec
+        self.bitrate = bitrate or settings.audio_delivery_bitrate
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: dict[Path, asyncio.Task[bool]] = {}
+        self._failed: dict[Path, int] = {}  # variant -> source mtime_ns
+
+    def variant_path(self, source: Path) -> Path | None:
+        if self.codec not in _CODECS or source.suffix.lower() != ".wav":
+            return None
+        return source.with_suffix(_CODECS[self.codec][0])
+
+    @staticmethod
+    def _is_fresh(variant: Path, source: Path) -> bool:
+        try:
+            return variant.stat().st_mtime_ns >= source.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+
+    def _encode_task(self, source: Path, variant: Path) -> asyncio.Task[bool]:
+        task = self._pending.get(variant)
+        if task is None:
+            task = asyncio.create_task(self._encode(source, variant))
+            self._pending[variant] = task
+            task.add_done_callback(lambda _t, key=variant: self._pending.pop(key, None))
+        return task
+
+    def _needs_encode(self, source: Path, variant: Path | None) -> bool:
+        if variant is None or _ffmpeg() is None or self._is_fresh(variant, source):
+            return False
+        return self._failed.get(variant) != source.stat().st_mtime_ns
+
+    def prepare(self, source: Path) -> None:
+        """Start encoding *source* in the background if it has no fresh variant."""
+        variant = self.variant_path(source)
+        if source.exists() and self._needs_encode(source, variant):
+            self._encode_task(source, variant)
+
+    async def deliverable(self, source: Path) -> Path:
+        """Return the file to serve for *source*: its fresh variant or itself.
+
+        Waits for a missing or stale variant to be encoded, so every request
+        for the same source version gets the same file.
+        """
+        variant = self.variant_path(source)
+        if variant is None or _ffmpeg() is None:
+            return source
+        if self._is_fresh(variant, source):
+            return variant
+        if not self._needs_encode(source, variant):
+            return source  # this source version failed to encode
+        # Shielded: a client hanging up must not abort the shared encode.
+        if await asyncio.shield(self._encode_task(source, variant)):
+            return variant
+        return source
+
+    async def _encode(self, source: Path, variant: Path) -> bool:
+        partial = variant.with_name(f".{variant.stem}.partial{variant.suffix}")
+        while True:
+            source_mtime = source.stat().st_mtime_ns
+            ok, stderr = await self._run_ffmpeg(source, partial)
+            if source.stat().st_mtime_ns == source_mtime:
+                break
+            # Rewritten mid-encode (e.g. retimed): the output may predate or
+            # mix both versions, yet would look fresh once renamed.
+            logger.info("%s changed while transcoding, encoding it again", source)
+            partial.unlink(missing_ok=True)
+        if not ok:
+            logger.warning("Transcoding %s to %s failed: %s", source, self.codec,
+                           stderr.decode("utf-8", "replace").strip()[-500:])
+            self._failed[variant] = source_mtime
+            partial.unlink(missing_ok=True)
+            return False
+        os.replace(partial, variant)
+        self._failed.pop(variant, None)
+        return True
+
+    async def _run_ffmpeg(self, source: Path, output: Path) -> tuple[bool, bytes]:
+        async with self._semaphore:
+            process = await asyncio.create_subprocess_exec(
+                _ffmpeg(), "-y", "-v", "error", "-i", str(source), "-vn",
+                "-c:a", _CODECS[self.codec][1], "-b:a", self.bitrate,
+                *_EXTRA_ARGS.get(self.codec, ()), str(output),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                if process.returncode is None:
+                    process.kill()
+                output.unlink(missing_ok=True)
+                raise
+        return process.returncode == 0, stderr
+
+
+def audio_response(request: Request, path: Path, *, filename_stem: str) -> Response:
+    """Serve *path* with validators; ``Range`` is handled by ``FileResponse``."""
+    stat = path.stat()
+    suffix = path.suffix.lower()
+    headers = {
+        "ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        "Cache-Control": _CACHE_CONTROL,
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        str(path),
+        media_type=_MEDIA_TYPES.get(suffix, "application/octet-stream"),
+        filename=f"{filename_stem}{suffix}",
+        headers=headers,
+        stat_result=stat,
+    )
+
+
+_audio_index: EpisodeAudioIndex | None = None
+_audio_transcoder: AudioTranscoder | None = None
+
+
+def get_audio_index() -> EpisodeAudioIndex:
+    global _audio_index
+    if _audio_index is None:
+        _audio_index = EpisodeAudioIndex()
+    return _audio_index
+
+
+def get_audio_transcoder() -> AudioTranscoder:
+    global _audio_transcoder
+    if _audio_transcoder is None:
+        _audio_transcoder = AudioTranscoder()
+    return _audio_transcoder
@@ -1,13 +1,18 @@
-"""Audio stitching service — combine TTS segments into a complete episode."""
+"""Audio stitching service — combine TTS segments into a complete episode.
+
+pydub is imported inside the methods that use it, so importing this module
+(e.g. via the API routes) does not load it.
+"""
 
 from __future__ import annotations
 
 import io
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pydub import AudioSegment
-from pydub import effects
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +43,8 @@ class AudioService:
         float
             Duration of the final audio in seconds.
         """
+        from pydub import AudioSegment
+
         combined = AudioSegment.silent(duration=0)
 
         for idx, (audio_bytes, pause_after) in enumerate(audio_segments):
@@ -45,19 +52,7 @@ class AudioService:
                 logger.warning("Segment %d has empty audio, skipping.", idx)
                 continue
             try:
-                audio_stream = io.BytesIO(audio_bytes)
-                try:
-                    segment = AudioSegment.from_wav(audio_stream)
-                except Exception:
-                    audio_stream.seek(0)
-                    segment = AudioSegment.from_mp3(audio_stream)
-
-                # Volume normalization
-                if segment.dBFS != float("-inf"):
-                    change = target_dbfs - segment.dBFS
-                    segment = segment.apply_gain(change)
-
-                combined += segment
+                combined += self._load_normalized(audio_bytes, target_dbfs)
 
                 # Insert pause between segments
                 pause_ms = int(max(pause_after, 0.1) * 1000)
@@ -86,6 +81,46 @@ class AudioService:
         )
         return duration_seconds
 
+    @staticmethod
+    def _load_normalized(audio_bytes: bytes, target_dbfs: float) -> AudioSegment:
+        """Decode a TTS segment (WAV, falling back to MP3) and normalize volume."""
+        from pydub import AudioSegment
+
+        audio_stream = io.BytesIO(audio_bytes)
+        try:
+            segment = AudioSegment.from_wav(audio_stream)
+        except Exception:
+            audio_stream.seek(0)
+            segment = AudioSegment.from_mp3(audio_stream)
+
+        if segment.dBFS != float("-inf"):
+            change = target_dbfs - segment.dBFS
+            segment = segment.apply_gain(change)
+        return segment
+
+    def render_chunk(
+        self,
+        audio_bytes: bytes,
+        pause_after: float,
+        output_path: Path,
+        *,
+        target_dbfs: float = -20.0,
+    ) -> float:
+        """Export one segment exactly as it sounds in the stitched episode.
+
+        The segment is normalized and its trailing pause is baked in, so
+        playing the chunks back to back matches :meth:`stitch_episode`.
+        This is blocking; call it via ``asyncio.to_thread``.  Returns the
+        chunk duration in seconds.
+        """
+        from pydub import AudioSegment
+
+        segment = self._load_normalized(audio_bytes, target_dbfs)
+        segment += AudioSegment.silent(duration=int(max(pause_after, 0.1) * 1000))
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        segment.export(str(output_path), format="mp3", bitrate="128k")
+        return len(segment) / 1000.0
+
     @staticmethod
     def _apply_speed(segment: AudioSegment, speed: float) -> AudioSegment:
         if speed <= 0:
@@ -95,6 +130,8 @@ class AudioService:
 
         # Prefer speedup for >1x; fallback to frame-rate transform for all ranges.
         if speed > 1.0:
+            from pydub import effects
+
             try:
                 return effects.speedup(
                     segment,
@@ -129,6 +166,8 @@ class AudioService:
         target_dbfs:
             Target loudness for volume normalization.
         """
+        from pydub import AudioSegment
+
         combined = AudioSegment.silent(duration=0)
 
         for idx, (segment_path, pause_after, speed) in enumerate(segment_items):
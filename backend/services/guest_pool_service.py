@@ -1,12 +1,23 @@
-"""Persistent guest pool management for user-defined podcast guests."""
+"""Persistent guest pool management for user-defined podcast guests.
+
+The pool is parsed once and served from memory; it is reloaded only when
+the file's stat signature changes (see :mod:`backend.services.json_store`).
+CRUD runs under a lock and writes atomically, so concurrent edits neither
+lose updates nor leave a truncated file behind.
+"""
 
 from __future__ import annotations
 
 import json
+import logging
+import threading
 from pathlib import Path
 
 from backend.agents.personas import GUEST_PERSONAS
 from backend.models import Gender, PersonaConfig
+from backend.services.json_store import FileSignature, atomic_write_json, file_signature
+
+logger = logging.getLogger(__name__)
 
 
 class GuestPoolService:
@@ -14,74 +25,92 @@ class GuestPoolService:
 
     def __init__(self, storage_path: Path | None = None) -> None:
         self.storage_path = storage_path or Path("data/guest_pool.json")
-
-    def _ensure_parent_dir(self) -> None:
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._guests: list[PersonaConfig] = []
+        self._by_name: dict[str, PersonaConfig] = {}
+        self._signature: FileSignature | None = None
+        self._loaded = False
 
     def _default_guests(self) -> list[PersonaConfig]:
         return [p.model_copy(deep=True) for p in GUEST_PERSONAS]
 
+    def _set_cache(self, guests: list[PersonaConfig],
+                   signature: FileSignature | None) -> None:
+        self._guests = guests
+        self._by_name = {guest.name: guest for guest in guests}
+        self._signature = signature
+        self._loaded = True
+
+    def _load(self) -> list[PersonaConfig]:
+        """Return the cached pool, re-reading the file only if it changed."""
+        signature = file_signature(self.storage_path)
+        if self._loaded and signature is not None and signature == self._signature:
+            return self._guests
+
+        guests: list[PersonaConfig] = []
+        if signature is not None:
+            try:
+                raw = json.loads(self.storage_path.read_text(encoding="utf-8"))
+                guests = [PersonaConfig.model_validate(item) for item in raw]
+            except Exception as exc:
+                logger.warning("Invalid guest pool %s, restoring defaults: %s",
+                               self.storage_path, exc)
+        if not guests:
+            self._write(self._default_guests())
+        else:
+            self._set_cache(guests, signature)
+        return self._guests
+
+    def _write(self, guests: list[PersonaConfig]) -> None:
+        payload = [guest.model_dump(mode="json") for guest in guests]
+        self._set_cache(guests, atomic_write_json(self.storage_path, payload))
+
     def list_guests(self) -> list[PersonaConfig]:
-        if not self.storage_path.exists():
-            guests = self._default_guests()
-            self.save_guests(guests)
-            return guests
-
-        try:
-            raw = json.loads(self.storage_path.read_text(encoding="utf-8"))
-            guests = [PersonaConfig.model_validate(item) for item in raw]
-            if not guests:
-                guests = self._default_guests()
-                self.save_guests(guests)
-            return guests
-        except Exception:
-            guests = self._default_guests()
-            self.save_guests(guests)
-            return guests
+        with self._lock:
+            return list(self._load())
+
+    def get_guest(self, name: str) -> PersonaConfig | None:
+        with self._lock:
+            self._load()
+            return self._by_name.get(name)
 
     def save_guests(self, guests: list[PersonaConfig]) -> None:
-        self._ensure_parent_dir()
-        payload = [guest.model_dump(mode="json") for guest in guests]
-        self.storage_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        with self._lock:
+            self._write(list(guests))
 
     def add_guest(self, guest: PersonaConfig) -> list[PersonaConfig]:
-        guests = self.list_guests()
-        if any(existing.name == guest.name for existing in guests):
-            raise ValueError(f"Guest '{guest.name}' already exists")
-        guests.append(guest)
-        self.save_guests(guests)
-        return guests
+        with self._lock:
+            self._load()
+            if guest.name in self._by_name:
+                raise ValueError(f"Guest '{guest.name}' already exists")
+            self._write([*self._guests, guest])
+            return list(self._guests)
 
     def update_guest(self, original_name: str, updated: PersonaConfig) -> list[PersonaConfig]:
-        guests = self.list_guests()
-        target_index = next(
-            (index for index, guest in enumerate(
-                guests) if guest.name == original_name),
-            None,
-        )
-        if target_index is None:
-            raise ValueError(f"Guest '{original_name}' not found")
-
-        if (
-            updated.name != original_name
-            and any(existing.name == updated.name for existing in guests)
-        ):
-            raise ValueError(f"Guest '{updated.name}' already exists")
-
-        guests[target_index] = updated
-        self.save_guests(guests)
-        return guests
+        with self._lock:
+            guests = list(self._load())
+            target_index = next(
+                (index for index, guest in enumerate(
+                    guests) if guest.name == original_name),
+                None,
+            )
+            if target_index is None:
+                raise ValueError(f"Guest '{original_name}' not found")
+
+            if updated.name != original_name and updated.name in self._by_name:
+                raise ValueError(f"Guest '{updated.name}' already exists")
+
+            guests[target_index] = updated
+            self._write(guests)
+            return list(self._guests)
 
     def delete_guest(self, name: str) -> list[PersonaConfig]:
-        guests = self.list_guests()
-        filtered = [guest for guest in guests if guest.name != name]
-        if len(filtered) == len(guests):
-            raise ValueError(f"Guest '{name}' not found")
-        self.save_guests(filtered)
-        return filtered
+        with self._lock:
+            guests = self._load()
+            if name not in self._by_name:
+                raise ValueError(f"Guest '{name}' not found")
+            self._write([guest for guest in guests if guest.name != name])
+            return list(self._guests)
 
 
 _guest_pool_service: GuestPoolService | None = None
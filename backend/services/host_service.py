@@ -1,12 +1,21 @@
-"""Persistent host persona management."""
+"""Persistent host persona management.
+
+The host is parsed once and served from memory until the file's stat
+signature changes; saves are atomic (see :mod:`backend.services.json_store`).
+"""
 
 from __future__ import annotations
 
 import json
+import logging
+import threading
 from pathlib import Path
 
 from backend.agents.personas import HOST_PERSONA
 from backend.models import PersonaConfig
+from backend.services.json_store import FileSignature, atomic_write_json, file_signature
+
+logger = logging.getLogger(__name__)
 
 
 class HostService:
@@ -14,36 +23,41 @@ class HostService:
 
     def __init__(self, storage_path: Path | None = None) -> None:
         self.storage_path = storage_path or Path("data/host.json")
-
-    def _ensure_parent_dir(self) -> None:
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._host: PersonaConfig | None = None
+        self._signature: FileSignature | None = None
 
     def _default_host(self) -> PersonaConfig:
         return HOST_PERSONA.model_copy(deep=True)
 
     def get_host(self) -> PersonaConfig:
-        if not self.storage_path.exists():
-            host = self._default_host()
-            self.save_host(host)
-            return host
-
-        try:
-            raw = json.loads(self.storage_path.read_text(encoding="utf-8"))
-            return PersonaConfig.model_validate(raw)
-        except Exception:
-            host = self._default_host()
-            self.save_host(host)
-            return host
+        with self._lock:
+            signature = file_signature(self.storage_path)
+            if (self._host is not None and signature is not None
+                    and signature == self._signature):
+                return self._host
 
-    def save_host(self, host: PersonaConfig) -> PersonaConfig:
-        self._ensure_parent_dir()
-        payload = host.model_dump(mode="json")
-        self.storage_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+            if signature is not None:
+                try:
+                    raw = json.loads(self.storage_path.read_text(encoding="utf-8"))
+                    self._host = PersonaConfig.model_validate(raw)
+                    self._signature = signature
+                    return self._host
+                except Exception as exc:
+                    logger.warning("Invalid host profile %s, restoring default: %s",
+                                   self.storage_path, exc)
+            return self._write(self._default_host())
+
+    def _write(self, host: PersonaConfig) -> PersonaConfig:
+        self._signature = atomic_write_json(
+            self.storage_path, host.model_dump(mode="json"))
+        self._host = host
         return host
 
+    def save_host(self, host: PersonaConfig) -> PersonaConfig:
+        with self._lock:
+            return self._write(host)
+
 
 _host_service: HostService | None = None
 
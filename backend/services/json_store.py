@@ -0,0 +1,60 @@
+"""Helpers for small JSON files that are cached in memory.
+
+The persona stores keep their file parsed in memory and reload it only when
+:func:`file_signature` changes.  That happens when the file is edited by
+hand or replaced by another process.  Writes (including episode files) go
+through :func:`atomic_write_bytes`, so a reader never sees a half-written
+file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+FileSignature = tuple[int, int, int]
+
+
+def file_signature(path: Path) -> FileSignature | None:
+    """``(mtime_ns, size, inode)`` of *path*, or ``None`` when it is missing.
+
+    The inode changes on every atomic replace, so writes that land within
+    the filesystem's mtime granularity are still detected.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> FileSignature | None:
+    """Write *data* to *path* via a temp file and rename.
+
+    Returns the signature of the new file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return file_signature(path)
+
+
+def atomic_write_json(path: Path, payload: Any) -> FileSignature | None:
+    """Atomically write *payload* as indented JSON (see :func:`atomic_write_bytes`)."""
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    return atomic_write_bytes(path, text.encode("utf-8"))
@@ -0,0 +1,180 @@
+"""Progressive (HLS) playback of an episode while its audio is synthesized.
+
+TTS finishes segments out of order.  :class:`LivePlaylist` holds them until
+the next one in dialogue order is available, renders each as a normalized
+MP3 chunk with its pause baked in (``AudioService.render_chunk``), and
+appends it to an HLS ``EVENT`` playlist::
+
+    output/episodes/live/<episode_id>/index.m3u8
+    output/episodes/live/<episode_id>/0000.mp3 ...
+
+A player can start on the first line instead of waiting for
+``stitch_audio``.  ``#EXT-X-ENDLIST`` is written when synthesis ends
+(or fails), and the stitched file remains the archival artifact.  Live
+output is best effort: if a chunk cannot be rendered (e.g. no ffmpeg),
+the playlist is closed and generation continues untouched.
+
+API tasks are mapped to their playlist in memory (:func:`live_dir_for_task`)
+so clients can follow ``/api/tasks/{task_id}/live/index.m3u8`` before the
+episode id is known.
+
+Live chunks duplicate the stitched audio, so they are temporary: a closed
+playlist's directory and its task mapping are removed
+``settings.live_retention_s`` after synthesis ends (long enough for a
+listener who started on the first chunk to finish).  Directories left by a
+previous process are swept when the next playlist opens
+(:func:`sweep_live_dirs`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import shutil
+import time
+from pathlib import Path
+
+from backend.config import settings
+from backend.services.audio_service import AudioService
+from backend.services.telemetry import current_task_id
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_NAME = "index.m3u8"
+
+_task_live_dirs: dict[str, Path] = {}
+# Newest playlist per directory, so a re-synthesis is not removed by the
+# retention timer of the run it replaced.
+_owners: dict[Path, "LivePlaylist"] = {}
+
+
+def live_dir(episode_id: str) -> Path:
+    return settings.output_dir / "live" / episode_id
+
+
+def live_dir_for_task(task_id: str) -> Path | None:
+    """Live playlist directory of the episode an API task is synthesizing."""
+    return _task_live_dirs.get(task_id)
+
+
+def sweep_live_dirs(now: float | None = None) -> int:
+    """Remove live directories untouched for ``settings.live_retention_s``.
+
+    Catches playlists whose removal was scheduled by a process that has
+    since exited.  Returns the number of directories removed.
+    """
+    root = settings.output_dir / "live"
+    if not root.is_dir():
+        return 0
+    cutoff = (time.time() if now is None else now) - settings.live_retention_s
+    removed = 0
+    for directory in root.iterdir():
+        try:
+            if not directory.is_dir() or directory.stat().st_mtime >= cutoff:
+                continue
+            playlist = directory / PLAYLIST_NAME
+            if playlist.exists() and playlist.stat().st_mtime >= cutoff:
+                continue
+        except FileNotFoundError:
+            continue
+        shutil.rmtree(directory, ignore_errors=True)
+        removed += 1
+    for task_id, directory in list(_task_live_dirs.items()):
+        if not directory.exists():
+            _task_live_dirs.pop(task_id, None)
+    return removed
+
+
+class LivePlaylist:
+    """Growing HLS EVENT playlist for one synthesis run."""
+
+    def __init__(self, episode_id: str, audio: AudioService) -> None:
+        self.directory = live_dir(episode_id)
+        self._audio = audio
+        self._pending: dict[int, tuple[bytes, float]] = {}
+        self._next_index = 0
+        self._entries: list[tuple[str, float]] = []
+        self._target_duration = settings.live_target_duration_s
+        self._closed = False
+        sweep_live_dirs()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write_playlist(ended=False)
+        _owners[self.directory] = self
+        self._task_id = current_task_id()
+        if self._task_id:
+            _task_live_dirs[self._task_id] = self.directory
+
+    @property
+    def playlist_path(self) -> Path:
+        return self.directory / PLAYLIST_NAME
+
+    async def add(self, index: int, audio_bytes: bytes, pause_after: float) -> None:
+        """Queue segment *index* and publish every chunk now in order."""
+        if self._closed:
+            return
+        self._pending[index] = (audio_bytes, pause_after)
+        published = False
+        while self._next_index in self._pending:
+            chunk_bytes, pause = self._pending.pop(self._next_index)
+            name = f"{self._next_index:04d}.mp3"
+            self._next_index += 1
+            if not chunk_bytes:
+                continue
+            try:
+                duration = await asyncio.to_thread(
+                    self._audio.render_chunk, chunk_bytes, pause, self.directory / name)
+            except Exception as exc:
+                logger.warning("Live playback disabled for %s: %s", self.directory.name, exc)
+                self.close()
+                return
+            self._entries.append((name, duration))
+            published = True
+        if published:
+            self._write_playlist(ended=False)
+
+    def close(self) -> None:
+        """Mark the playlist complete and schedule its removal.
+
+        Later segments are ignored.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.clear()
+        self._write_playlist(ended=True)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.expire()
+            return
+        loop.call_later(settings.live_retention_s, self.expire)
+
+    def expire(self) -> None:
+        """Delete the chunks and forget the task mapping."""
+        if self._task_id and _task_live_dirs.get(self._task_id) == self.directory:
+            del _task_live_dirs[self._task_id]
+        if _owners.get(self.directory) is self:
+            del _owners[self.directory]
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write_playlist(self, *, ended: bool) -> None:
+        longest = max((duration for _, duration in self._entries), default=0.0)
+        # Never lower the target duration once published; raise it only if a
+        # chunk outgrows it (players tolerate that better than a violation).
+        self._target_duration = max(self._target_duration, math.ceil(longest))
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{self._target_duration}",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for name, duration in self._entries:
+            lines += [f"#EXTINF:{duration:.3f},", name]
+        if ended:
+            lines.append("#EXT-X-ENDLIST")
+        tmp = self.playlist_path.with_name(f".{PLAYLIST_NAME}.tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp, self.playlist_path)
@@ -1,32 +1,304 @@
-"""OpenAI-compatible LLM client with retry logic."""
+"""OpenAI-compatible LLM client with model tiers and a request scheduler.
+
+Every :class:`LLMService` sends its calls through the :class:`LLMScheduler`
+of its provider (keyed by base-URL host).  The scheduler bounds the calls in
+flight per provider (``settings.llm_max_concurrency``, overridable per host
+in ``settings.llm_provider_concurrency``) and admits waiting calls by
+priority class, then arrival order: interactive requests (script preview,
+guest generation) go before normal episode generation, which goes before
+batch generation.  Set the class for a block of work with
+:func:`llm_priority`; tasks spawned inside it inherit it.
+
+Failed attempts are retried with jittered exponential backoff.  A
+``Retry-After`` (or ``retry-after-ms``) header on a rate-limit response sets
+the delay instead.  The slot is released while backing off, so a throttled
+call does not hold back others.  Client errors that cannot succeed on retry
+(400/401/403/404/422) fail at once.  The OpenAI client's own retries are
+disabled so that every attempt is scheduled.
+
+Calls are routed by *call site* to a model tier (:func:`tier_for`).  The
+strong tier (``settings.llm_model``) writes dialogue, plans and articles;
+the fast tier (``settings.llm_fast_*``) serves short control calls such as
+query expansion and fresh-search decisions, see :data:`DEFAULT_CALL_TIERS`
+and the ``settings.llm_call_tiers`` overrides.  A call that fails on the
+fast tier is retried on the strong one, and a call that fails there on the
+fallback provider (``settings.llm_fallback_*``) when one is configured.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
 import logging
-from collections.abc import AsyncGenerator
+import random
+import time
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from typing import Any
-
-from openai import AsyncOpenAI
+from urllib.parse import urlparse
 
 from backend.config import settings
+from backend.services import metrics
+from backend.services.telemetry import SPAN_LLM, mark_queue_wait, span
 
 logger = logging.getLogger(__name__)
 
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive",
+                   PRIORITY_NORMAL: "normal", PRIORITY_BATCH: "batch"}
+
+TIER_STRONG = "strong"
+TIER_FAST = "fast"
+
+# Control-plane calls: short, structured and on the research critical path.
+# Every other call site (dialogue lines and segments, topic picks, episode
+# plans, articles, guest profiles) runs on the strong tier.
+DEFAULT_CALL_TIERS: dict[str, str] = {
+    "search_queries": TIER_FAST,
+    "fresh_search_decision": TIER_FAST,
+    "document_topic": TIER_FAST,
+    "context_summary": TIER_FAST,
+    "translation": TIER_FAST,
+}
+
+_NON_RETRYABLE_STATUS = frozenset({400, 401, 403, 404, 422})
+
+_llm_priority: ContextVar[int] = ContextVar(
+    "mindcast_llm_priority", default=PRIORITY_NORMAL)
+
+
+@contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """Schedule LLM calls made in this block (and its tasks) at *priority*."""
+    token = _llm_priority.set(priority)
+    try:
+        yield
+    finally:
+        _llm_priority.reset(token)
+
+
+def current_llm_priority() -> int:
+    return _llm_priority.get()
+
+
+def tier_for(call_site: str | None) -> str:
+    """Model tier for *call_site*: the settings override, else the default."""
+    if not call_site:
+        return TIER_STRONG
+    tier = settings.llm_call_tiers.get(call_site) or DEFAULT_CALL_TIERS.get(call_site)
+    return TIER_FAST if tier == TIER_FAST else TIER_STRONG
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Prompt tokens the provider served from its prefix cache.
+
+    DeepSeek reports ``prompt_cache_hit_tokens``; OpenAI-style providers
+    report ``prompt_tokens_details.cached_tokens``.
+    """
+    hit = getattr(usage, "prompt_cache_hit_tokens", None)
+    if hit is None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        hit = getattr(details, "cached_tokens", None)
+        if hit is None and isinstance(details, dict):
+            hit = details.get("cached_tokens")
+    return int(hit or 0)
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Delay requested by the provider's ``Retry-After`` headers, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        milliseconds = headers.get("retry-after-ms")
+        if milliseconds:
+            return max(0.0, float(milliseconds) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, exc: BaseException | None = None) -> float:
+    """Seconds to wait before retry number *attempt* (1-based).
+
+    Honors ``Retry-After`` (plus up to 10% jitter so throttled callers do
+    not return in lockstep); otherwise full-jitter exponential backoff.
+    Both are capped at ``settings.llm_backoff_max_s``.
+    """
+    cap = settings.llm_backoff_max_s
+    requested = retry_after_seconds(exc) if exc is not None else None
+    if requested is not None:
+        return min(cap, requested * random.uniform(1.0, 1.1))
+    return random.uniform(0, min(cap, settings.llm_backoff_base_s * 2 ** (attempt - 1)))
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) not in _NON_RETRYABLE_STATUS
+
+
+class LLMScheduler:
+    """Bounded, priority-ordered admission of calls to one LLM provider."""
+
+    def __init__(self, max_concurrency: int, *, name: str = "") -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.name = name
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL) -> float:
+        """Wait for a slot and return the seconds spent waiting."""
+        label = _PRIORITY_NAMES.get(priority, str(priority))
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)  # abandoned by a cancelled caller
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            metrics.llm_queue_wait.observe(0.0, provider=self.name, priority=label)
+            return 0.0
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        metrics.llm_queued.inc(provider=self.name, priority=label)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot was handed over as we were cancelled
+            raise
+        finally:
+            metrics.llm_queued.dec(provider=self.name, priority=label)
+        waited = time.perf_counter() - started
+        metrics.llm_queue_wait.observe(waited, provider=self.name, priority=label)
+        return waited
+
+    def release(self) -> None:
+        """Hand the slot to the most urgent waiter, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+_schedulers: dict[str, LLMScheduler] = {}
+
+
+def provider_key(base_url: str) -> str:
+    return urlparse(base_url).hostname or base_url
+
+
+def get_llm_scheduler(base_url: str | None = None) -> LLMScheduler:
+    """The process-wide scheduler of the provider at *base_url*."""
+    key = provider_key(base_url or settings.llm_base_url)
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        limit = settings.llm_provider_concurrency.get(key, settings.llm_max_concurrency)
+        scheduler = _schedulers[key] = LLMScheduler(limit, name=key)
+    return scheduler
+
+
+@dataclass
+class LLMEndpoint:
+    """One model on one provider, with that provider's scheduler."""
+
+    model: str
+    client: Any
+    scheduler: LLMScheduler
+
+    @classmethod
+    def connect(cls, base_url: str, api_key: str, model: str) -> LLMEndpoint:
+        from openai import AsyncOpenAI  # heavy; kept off the API import path
+
+        client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            max_retries=0,  # retries go back through the scheduler
+        )
+        return cls(model, client, get_llm_scheduler(base_url))
+
+
+def _tier_endpoint(tier: str, base_url: str, api_key: str, model: str) -> LLMEndpoint | None:
+    """Endpoint for an optional tier; ``None`` when unset or misconfigured.
+
+    The primary API key is only reused on the primary base URL: a tier
+    pointing at another provider must bring its own key.
+    """
+    if not model:
+        return None
+    if base_url and base_url != settings.llm_base_url and not api_key:
+        logger.warning(
+            "LLM %s tier disabled: LLM_%s_BASE_URL points at another provider "
+            "but LLM_%s_API_KEY is empty", tier, tier.upper(), tier.upper())
+        return None
+    return LLMEndpoint.connect(
+        base_url or settings.llm_base_url,
+        api_key or settings.llm_api_key,
+        model,
+    )
+
+
+def _fast_endpoint() -> LLMEndpoint | None:
+    return _tier_endpoint(TIER_FAST, settings.llm_fast_base_url,
+                          settings.llm_fast_api_key, settings.llm_fast_model)
+
+
+def _fallback_endpoint() -> LLMEndpoint | None:
+    return _tier_endpoint("fallback", settings.llm_fallback_base_url,
+                          settings.llm_fallback_api_key, settings.llm_fallback_model)
+
 
 class LLMService:
-    """Thin wrapper around an OpenAI-compatible async client."""
+    """Thin wrapper around OpenAI-compatible async clients, one per tier.
+
+    *base_url*, *api_key* and *model* configure the strong tier; the fast
+    tier and the fallback provider come from settings unless passed in.
+    """
 
     def __init__(
         self,
         base_url: str | None = None,
         api_key: str | None = None,
         model: str | None = None,
+        *,
+        fast: LLMEndpoint | None = None,
+        fallback: LLMEndpoint | None = None,
     ) -> None:
-        self.model = model or settings.llm_model
-        self._client = AsyncOpenAI(
-            base_url=base_url or settings.llm_base_url,
-            api_key=api_key or settings.llm_api_key,
+        strong = LLMEndpoint.connect(
+            base_url or settings.llm_base_url,
+            api_key or settings.llm_api_key,
+            model or settings.llm_model,
         )
+        self.model = strong.model
+        self._client = strong.client
+        self._scheduler = strong.scheduler
+        self._fast = fast or _fast_endpoint()
+        self._fallback = fallback or _fallback_endpoint()
+
+    def endpoints(self, tier: str = TIER_STRONG) -> list[LLMEndpoint]:
+        """Endpoints a call on *tier* is tried on, in order."""
+        strong = LLMEndpoint(self.model, self._client, self._scheduler)
+        chain = [self._fast, strong] if tier == TIER_FAST and self._fast else [strong]
+        if self._fallback is not None:
+            chain.append(self._fallback)
+        return chain
 
     # ------------------------------------------------------------------
     # Core chat
@@ -40,30 +312,106 @@ class LLMService:
         max_tokens: int = 4096,
         response_format: dict[str, Any] | None = None,
         retries: int = 3,
+        priority: int | None = None,
+        call_site: str | None = None,
     ) -> str:
-        """Send a chat completion request and return the assistant content."""
-        last_error: Exception | None = None
-        for attempt in range(1, retries + 1):
+        """Send a chat completion request and return the assistant content.
+
+        *call_site* names the caller (``"search_queries"``, ``"host_line"``,
+        ...) and selects the model tier; *priority* defaults to the class set
+        by :func:`llm_priority`.
+        """
+        priority = current_llm_priority() if priority is None else priority
+        tier = tier_for(call_site)
+        chain = self.endpoints(tier)
+        for endpoint, following in zip(chain, [*chain[1:], None]):
             try:
-                kwargs: dict[str, Any] = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                }
-                if response_format is not None:
-                    kwargs["response_format"] = response_format
-
-                resp = await self._client.chat.completions.create(**kwargs)
-                content = resp.choices[0].message.content or ""
-                return content.strip()
-            except Exception as exc:
-                last_error = exc
-                logger.warning(
-                    "LLM request failed (attempt %d/%d): %s", attempt, retries, exc
+                content = await self._chat_on(
+                    endpoint, messages, temperature=temperature,
+                    max_tokens=max_tokens, response_format=response_format,
+                    retries=retries, priority=priority,
                 )
-        raise RuntimeError(
-            f"LLM request failed after {retries} retries") from last_error
+            except RuntimeError:
+                if following is None:
+                    raise
+                logger.warning("LLM %s call failed on %s, falling back to %s",
+                               call_site or "chat", endpoint.model, following.model)
+                metrics.llm_fallbacks.inc(
+                    from_model=endpoint.model, to_model=following.model)
+                continue
+            metrics.llm_calls.inc(tier=tier, model=endpoint.model)
+            return content
+
+    async def _chat_on(
+        self,
+        endpoint: LLMEndpoint,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict[str, Any] | None,
+        retries: int,
+        priority: int,
+    ) -> str:
+        """One call on *endpoint*, with scheduled retries and backoff."""
+        scheduler = endpoint.scheduler
+        last_error: Exception | None = None
+        bytes_in = sum(len(m.get("content", "").encode("utf-8")) for m in messages)
+        mark_queue_wait(await scheduler.acquire(priority))
+        holding = True
+        try:
+            async with span(SPAN_LLM, endpoint.model, bytes_in=bytes_in) as record:
+                for attempt in range(1, retries + 1):
+                    if not holding:
+                        record.queue_wait_s += await scheduler.acquire(priority)
+                        holding = True
+                    try:
+                        kwargs: dict[str, Any] = {
+                            "model": endpoint.model,
+                            "messages": messages,
+                            "temperature": temperature,
+                            "max_tokens": max_tokens,
+                        }
+                        if response_format is not None:
+                            kwargs["response_format"] = response_format
+
+                        resp = await endpoint.client.chat.completions.create(**kwargs)
+                        content = resp.choices[0].message.content or ""
+                        usage = getattr(resp, "usage", None)
+                        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+                        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+                        cached_tokens = cached_prompt_tokens(usage)
+                        record.set(
+                            prompt_tokens=prompt_tokens,
+                            cached_prompt_tokens=cached_tokens,
+                            completion_tokens=completion_tokens,
+                            retries=attempt - 1,
+                            bytes_out=len(content.encode("utf-8")),
+                        )
+                        metrics.llm_prompt_tokens.inc(cached_tokens, cache="hit")
+                        metrics.llm_prompt_tokens.inc(
+                            prompt_tokens - cached_tokens, cache="miss")
+                        metrics.llm_completion_tokens.inc(completion_tokens)
+                        return content.strip()
+                    except Exception as exc:
+                        last_error = exc
+                        logger.warning(
+                            "LLM request to %s failed (attempt %d/%d): %s",
+                            endpoint.model, attempt, retries, exc,
+                        )
+                        if attempt == retries or not _is_retryable(exc):
+                            break
+                        delay = backoff_delay(attempt, exc)
+                        metrics.llm_backoff.inc(delay, provider=scheduler.name)
+                        scheduler.release()
+                        holding = False
+                        await asyncio.sleep(delay)
+                record.set(retries=attempt - 1)
+                raise RuntimeError(
+                    f"LLM request failed after {attempt} attempts") from last_error
+        finally:
+            if holding:
+                scheduler.release()
 
     # ------------------------------------------------------------------
     # Streaming (reserved for future use)
@@ -75,19 +423,25 @@ class LLMService:
         *,
         temperature: float = 0.8,
         max_tokens: int = 4096,
+        call_site: str | None = None,
     ) -> AsyncGenerator[str, None]:
-        """Yield streamed content chunks from the LLM."""
-        stream = await self._client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            stream=True,
-        )
-        async for chunk in stream:
-            delta = chunk.choices[0].delta
-            if delta.content:
-                yield delta.content
+        """Yield streamed content chunks from the LLM (one scheduler slot)."""
+        endpoint = self.endpoints(tier_for(call_site))[0]
+        await endpoint.scheduler.acquire(current_llm_priority())
+        try:
+            stream = await endpoint.client.chat.completions.create(
+                model=endpoint.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    yield delta.content
+        finally:
+            endpoint.scheduler.release()
 
 
 # Module-level convenience instance (lazy)
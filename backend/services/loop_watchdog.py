@@ -0,0 +1,183 @@
+"""Debug watchdog that catches synchronous work blocking the event loop.
+
+A heartbeat callback on the loop stamps ``time.monotonic()`` every
+``interval_s``.  A daemon thread checks the stamp; once it is older than
+``threshold_s`` the loop is stuck inside one callback, so the thread samples
+the loop thread's Python stack (``sys._current_frames``) until the heartbeat
+resumes.  Each stall is appended as one JSON line to
+``output/logs/loop-stalls-YYYYMMDD.jsonl`` with its duration, the most
+frequently sampled stack and the API task id / graph node / episode of the
+task that was running (see :func:`backend.services.telemetry.task_attribution`).
+
+Enable with ``LOOP_WATCHDOG_ENABLED=true``; sampling costs one thread wake-up
+per interval, so it is meant for debugging and short production captures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from backend.config import settings
+from backend.services import metrics
+from backend.services.telemetry import task_attribution
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames kept per sampled stack.
+_STACK_DEPTH = 25
+
+event_loop_stalls = metrics.registry.counter(
+    "mindcast_event_loop_stalls_total",
+    "Event-loop stalls longer than the watchdog threshold.",
+)
+
+
+class LoopWatchdog:
+    """Detects event-loop stalls and records what was blocking.
+
+    Parameters
+    ----------
+    threshold_s:
+        Minimum heartbeat delay reported as a stall.
+    interval_s:
+        Heartbeat period; also the stack sampling period during a stall.
+    report_dir:
+        Directory for the ``loop-stalls-*.jsonl`` reports.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_s: float = 0.2,
+        interval_s: float = 0.02,
+        report_dir: Path | None = None,
+    ) -> None:
+        self.threshold_s = threshold_s
+        self.interval_s = interval_s
+        self.report_dir = report_dir
+        self.stall_count = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = 0.0
+        self._beat_handle: asyncio.TimerHandle | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # -- loop side -------------------------------------------------------
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        self._beat_handle = self._loop.call_later(self.interval_s, self._beat)
+
+    def start(self) -> None:
+        """Start watching the running loop (no-op when already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(
+            target=self._watch, name="mindcast-loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("Loop watchdog started (threshold %.0f ms)",
+                    self.threshold_s * 1000)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._beat_handle is not None:
+            self._beat_handle.cancel()
+            self._beat_handle = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # -- watchdog thread ---------------------------------------------------
+
+    def _sample(self) -> tuple[tuple[str, ...], dict[str, str]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack: tuple[str, ...] = ()
+        if frame is not None:
+            stack = tuple(
+                line.rstrip()
+                for line in traceback.format_stack(frame)[-_STACK_DEPTH:]
+            )
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        return stack, task_attribution(task)
+
+    def _watch(self) -> None:
+        stacks: Counter[tuple[str, ...]] = Counter()
+        attribution: dict[str, str] = {}
+        stall_started: float | None = None
+        while not self._stop.wait(self.interval_s):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat - self.interval_s
+            if overdue >= self.threshold_s:
+                if stall_started is None:
+                    stall_started = beat + self.interval_s
+                stack, owner = self._sample()
+                stacks[stack] += 1
+                attribution = attribution or owner
+            elif stall_started is not None:
+                self._report(beat - stall_started, stacks, attribution)
+                stacks = Counter()
+                attribution = {}
+                stall_started = None
+
+    def _report(
+        self,
+        blocked_s: float,
+        stacks: Counter[tuple[str, ...]],
+        attribution: dict[str, str],
+    ) -> None:
+        self.stall_count += 1
+        event_loop_stalls.inc()
+        stack, hits = stacks.most_common(1)[0] if stacks else ((), 0)
+        record: dict[str, Any] = {
+            "ts": datetime.now().isoformat(),
+            "blocked_ms": round(blocked_s * 1000, 1),
+            "samples": sum(stacks.values()),
+            "top_stack_samples": hits,
+            **attribution,
+            "stack": list(stack),
+        }
+        where = stack[-1].splitlines()[0].strip() if stack else "?"
+        logger.warning("Event loop blocked for %.0f ms at %s (task=%s node=%s)",
+                       record["blocked_ms"], where,
+                       attribution.get("task_id") or "-",
+                       attribution.get("node") or "-")
+        report_dir = self.report_dir or settings.ensure_output_dir() / "logs"
+        try:
+            report_dir.mkdir(parents=True, exist_ok=True)
+            path = report_dir / f"loop-stalls-{datetime.now():%Y%m%d}.jsonl"
+            with path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as exc:
+            logger.warning("Failed to write loop stall report: %s", exc)
+
+
+_watchdog: LoopWatchdog | None = None
+
+
+def get_loop_watchdog() -> LoopWatchdog:
+    """Return the process-wide watchdog configured from settings."""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = LoopWatchdog(
+            threshold_s=settings.loop_watchdog_threshold_ms / 1000,
+            interval_s=settings.loop_watchdog_interval_ms / 1000,
+        )
+    return _watchdog
@@ -0,0 +1,375 @@
+"""Process-wide metrics in the Prometheus text exposition format.
+
+A deliberately small registry (counters, gauges, histograms with labels)
+instead of ``prometheus_client`` so the API image keeps its dependency set.
+Hot paths only do a dict update under a lock; everything that needs I/O
+(collection counts, task table, cache stats) is gathered at scrape time by
+``GET /metrics`` in ``main.py``.
+
+Metric families
+---------------
+- ``mindcast_http_request_duration_seconds{method,route,status}``
+- ``mindcast_external_call_duration_seconds{service,status}`` and
+  ``mindcast_external_calls_inflight{service}`` for LLM / TTS / Tavily,
+  fed by :func:`backend.services.telemetry.span`
+- ``mindcast_llm_prompt_tokens_total{cache}`` (``hit`` / ``miss``)
+- ``mindcast_llm_queue_wait_seconds{provider,priority}``,
+  ``mindcast_llm_queued{provider,priority}`` and
+  ``mindcast_llm_backoff_seconds_total{provider}`` from the LLM scheduler
+- ``mindcast_llm_calls_total{tier,model}`` and
+  ``mindcast_llm_fallbacks_total{from_model,to_model}`` from model routing
+- ``mindcast_chroma_query_duration_seconds{collection}``
+- ``mindcast_event_loop_lag_seconds`` from :class:`LoopLagMonitor`
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 120.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+                for key, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def replace(self, values: dict[tuple[str, ...], float]) -> None:
+        """Swap in a complete snapshot (for gauges computed at scrape time)."""
+        with self._lock:
+            self._values = {tuple(map(str, k)): float(v) for k, v in values.items()}
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+                for key, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Iterable[str] = (), *,
+                 buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> ([count per bucket], sum, count)
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> list[str]:
+        lines: list[str] = []
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(names, key + (_format_value(bound),))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str,
+                  labelnames: Iterable[str] = (), *,
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames,
+                                        buckets=buckets))
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "mindcast_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+external_call_duration = registry.histogram(
+    "mindcast_external_call_duration_seconds",
+    "Latency of LLM / TTS / Tavily calls including retries.",
+    ("service", "status"),
+)
+external_calls_inflight = registry.gauge(
+    "mindcast_external_calls_inflight",
+    "LLM / TTS / Tavily calls currently in flight.",
+    ("service",),
+)
+external_call_retries = registry.counter(
+    "mindcast_external_call_retries_total",
+    "Retried attempts of LLM / TTS / Tavily calls.",
+    ("service",),
+)
+external_queue_wait = registry.counter(
+    "mindcast_external_queue_wait_seconds_total",
+    "Time spent waiting for a concurrency slot before an external call.",
+    ("service",),
+)
+llm_prompt_tokens = registry.counter(
+    "mindcast_llm_prompt_tokens_total",
+    "LLM prompt tokens by provider prefix-cache outcome.",
+    ("cache",),
+)
+llm_queue_wait = registry.histogram(
+    "mindcast_llm_queue_wait_seconds",
+    "Time LLM calls waited for a scheduler slot, by provider and priority class.",
+    ("provider", "priority"),
+)
+llm_queued = registry.gauge(
+    "mindcast_llm_queued",
+    "LLM calls waiting for a scheduler slot.",
+    ("provider", "priority"),
+)
+llm_backoff = registry.counter(
+    "mindcast_llm_backoff_seconds_total",
+    "Time LLM calls spent backing off before a retry.",
+    ("provider",),
+)
+llm_calls = registry.counter(
+    "mindcast_llm_calls_total",
+    "LLM chat calls by model tier and the model that answered.",
+    ("tier", "model"),
+)
+llm_fallbacks = registry.counter(
+    "mindcast_llm_fallbacks_total",
+    "LLM calls retried on the next provider after failing on one.",
+    ("from_model", "to_model"),
+)
+llm_completion_tokens = registry.counter(
+    "mindcast_llm_completion_tokens_total",
+    "LLM completion tokens.",
+)
+chroma_query_duration = registry.histogram(
+    "mindcast_chroma_query_duration_seconds",
+    "ChromaDB nearest-neighbour query latency.",
+    ("collection",),
+)
+chroma_documents = registry.gauge(
+    "mindcast_chroma_documents",
+    "Documents per knowledge-base collection.",
+    ("collection",),
+)
+tasks_by_stage = registry.gauge(
+    "mindcast_tasks",
+    "Background tasks by status and stage.",
+    ("status", "stage"),
+)
+tasks_active = registry.gauge(
+    "mindcast_tasks_active",
+    "Background tasks still running (generation queue depth).",
+)
+cache_events = registry.gauge(
+    "mindcast_cache_events",
+    "Cache counters since process start.",
+    ("cache", "event"),
+)
+cache_hit_ratio = registry.gauge(
+    "mindcast_cache_hit_ratio",
+    "Fraction of lookups served from cache.",
+    ("cache",),
+)
+event_loop_lag = registry.histogram(
+    "mindcast_event_loop_lag_seconds",
+    "How late a periodic event-loop tick fires.",
+    buckets=LOOP_LAG_BUCKETS,
+)
+event_loop_lag_last = registry.gauge(
+    "mindcast_event_loop_lag_last_seconds",
+    "Most recent event-loop lag sample.",
+)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag by timing a periodic ``asyncio.sleep``."""
+
+    def __init__(self, interval_s: float = 0.5) -> None:
+        self.interval_s = interval_s
+        self._task: asyncio.Task | None = None
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_s)
+            lag = max(0.0, loop.time() - started - self.interval_s)
+            event_loop_lag.observe(lag)
+            event_loop_lag_last.set(lag)
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_loop_lag_monitor: LoopLagMonitor | None = None
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    global _loop_lag_monitor
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = LoopLagMonitor()
+    return _loop_lag_monitor
+
+
+def observe_external_call(service: str, wall_s: float, *, status: str,
+                          retries: int = 0, queue_wait_s: float = 0.0) -> None:
+    external_call_duration.observe(wall_s, service=service, status=status)
+    if retries:
+        external_call_retries.inc(retries, service=service)
+    if queue_wait_s:
+        external_queue_wait.inc(queue_wait_s, service=service)
+
+
+@contextmanager
+def timed_chroma_query(collection: str) -> Iterator[None]:
+    """Record the latency of the ChromaDB query run inside the block."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        chroma_query_duration.observe(
+            time.perf_counter() - started, collection=collection)
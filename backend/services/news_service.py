@@ -4,15 +4,16 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
 import logging
 import re
 from math import ceil
 
-from tavily import AsyncTavilyClient
-
 from backend.config import settings
 from backend.models import DetailedInfo, NewsItem
+from backend.services.relevance import get_topic_matcher, normalize_text
+from backend.services.search_cache import SearchCache, get_search_cache
+from backend.services.structured_output import chat_json
+from backend.services.telemetry import SPAN_SEARCH, span
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +35,18 @@ _EXPAND_QUERIES_SYSTEM = """\
 class NewsService:
     """Fetch topic-based news and perform deep searches via Tavily."""
 
-    def __init__(self, api_key: str | None = None, llm=None) -> None:
+    def __init__(
+        self,
+        api_key: str | None = None,
+        llm=None,
+        cache: SearchCache | None = None,
+    ) -> None:
+        from tavily import AsyncTavilyClient  # heavy; kept off the API import path
+
         self._client = AsyncTavilyClient(
             api_key=api_key or settings.tavily_api_key)
         self._llm = llm  # optional LLMService; injected lazily if None
+        self._cache = cache  # optional response cache; None = always live
 
     @staticmethod
     def _doc_id(*parts: str) -> str:
@@ -46,7 +55,7 @@ class NewsService:
 
     @staticmethod
     def _normalize_text(text: str) -> str:
-        return re.sub(r"\s+", "", (text or "")).lower()
+        return normalize_text(text)
 
     @staticmethod
     def _extract_topic_terms(topic: str) -> list[str]:
@@ -72,30 +81,25 @@ class NewsService:
 
     @staticmethod
     def _topic_match_count(item: NewsItem, topic_terms: list[str]) -> int:
-        haystack = NewsService._normalize_text(f"{item.title} {item.content}")
-        if not haystack or not topic_terms:
+        if not topic_terms:
             return 0
-
-        return sum(
-            1
-            for term in topic_terms
-            if NewsService._normalize_text(term) in haystack
-        )
+        return get_topic_matcher("", tuple(topic_terms)).score(item).match_count
 
     @staticmethod
     def _is_relevant_item(item: NewsItem, topic: str, topic_terms: list[str]) -> bool:
-        haystack = NewsService._normalize_text(f"{item.title} {item.content}")
-        normalized_topic = NewsService._normalize_text(topic)
-        if not haystack or not normalized_topic:
-            return False
+        return get_topic_matcher(topic, tuple(topic_terms)).score(item).relevant
 
-        if normalized_topic in haystack:
-            return True
+    async def _search(self, **params) -> dict:
+        """Run a Tavily search, served from the response cache when possible."""
+        if self._cache is None:
+            return await self._fetch_search(params)
+        return await self._cache.get_or_fetch(
+            params, lambda: self._fetch_search(params))
 
-        matched_terms = NewsService._topic_match_count(item, topic_terms)
-        if len(topic_terms) <= 1:
-            return matched_terms >= 1
-        return matched_terms >= ceil(len(topic_terms) / 2)
+    async def _fetch_search(self, params: dict) -> dict:
+        async with span(SPAN_SEARCH, "tavily",
+                        bytes_in=len(str(params.get("query", "")).encode("utf-8"))):
+            return await self._client.search(**params)
 
     def _get_llm(self):
         if self._llm is None:
@@ -111,18 +115,14 @@ class NewsService:
                 {"role": "system", "content": _EXPAND_QUERIES_SYSTEM},
                 {"role": "user", "content": f"话题：{topic}"},
             ]
-            raw = await llm.chat(messages, temperature=0.5, max_tokens=256)
-            raw = raw.strip()
-            # Strip markdown fences if present
-            raw = re.sub(r"^```[a-z]*\n?", "", raw,
-                         flags=re.IGNORECASE).rstrip("`").strip()
-            queries: list[str] = json.loads(raw)
-            if isinstance(queries, list) and all(isinstance(q, str) for q in queries):
-                valid = [q.strip() for q in queries if q.strip()]
-                if valid:
-                    logger.info(
-                        "LLM expanded queries for '%s': %s", topic, valid)
-                    return valid[:4]
+            queries: list[str] = await chat_json(
+                llm, messages, list[str], name="search_queries",
+                json_object=False, temperature=0.5, max_tokens=256)
+            valid = [q.strip() for q in queries if q.strip()]
+            if valid:
+                logger.info(
+                    "LLM expanded queries for '%s': %s", topic, valid)
+                return valid[:4]
         except Exception as exc:
             logger.warning("LLM query expansion failed: %s", exc)
         # Fallback: hand-crafted queries
@@ -135,7 +135,7 @@ class NewsService:
     async def _fetch_one_query(self, query: str, per_query_max: int) -> list[NewsItem]:
         """Run a single Tavily search and return NewsItem list."""
         try:
-            response = await self._client.search(
+            response = await self._search(
                 query=query,
                 topic="news",
                 time_range="week",
@@ -196,6 +196,7 @@ class NewsService:
                     docs,
                     collection=BACKGROUND_MATERIAL,
                     scope=KNOWLEDGE_SCOPE_GLOBAL,
+                    dedup=True,
                 )
         except Exception as exc:
             logger.warning("Persist daily news to KB failed: %s", exc)
@@ -257,6 +258,7 @@ class NewsService:
                     docs,
                     collection=BACKGROUND_MATERIAL,
                     scope=KNOWLEDGE_SCOPE_GLOBAL,
+                    dedup=True,
                 )
         except Exception as exc:
             logger.warning("Persist detailed search to KB failed: %s", exc)
@@ -282,7 +284,7 @@ class NewsService:
             # Simple path: single general query
             logger.info(
                 "Fetching general trending news (max %d)…", max_results)
-            response = await self._client.search(
+            response = await self._search(
                 query="今日热点 最新资讯",
                 topic="news",
                 time_range="week",
@@ -335,28 +337,28 @@ class NewsService:
 
         # ── Relevance filter + sort ───────────────────────────────────────
         topic_terms = self._extract_topic_terms(normalized_topic)
-        relevant = [
-            item for item in pool
-            if self._is_relevant_item(item, normalized_topic, topic_terms)
-        ]
-
-        relevant.sort(
-            key=lambda item: (
-                self._topic_match_count(item, topic_terms),
-                item.score if item.score is not None else 0.0,
+        matcher = get_topic_matcher(normalized_topic, tuple(topic_terms))
+        scored = matcher.score_items(pool)
+
+        ranked = sorted(
+            (entry for entry in scored if entry.relevant),
+            key=lambda entry: (
+                entry.match_count,
+                entry.item.score if entry.item.score is not None else 0.0,
             ),
             reverse=True,
         )
+        relevant = [entry.item for entry in ranked]
 
         # If strict filter left too few, fill remaining slots from the
         # unfiltered pool sorted by Tavily score (avoid returning 0)
         if len(relevant) < max_results:
-            irrelevant = [i for i in pool if i not in relevant]
+            irrelevant = [entry.item for entry in scored if not entry.relevant]
             irrelevant.sort(
                 key=lambda item: item.score if item.score is not None else 0.0,
                 reverse=True,
             )
-            fill_count = max_results - len(relevant)
+            fill_count = min(max_results - len(relevant), len(irrelevant))
             relevant.extend(irrelevant[:fill_count])
             logger.warning(
                 "Topic filter kept %d/%d; padded with %d fallback items",
@@ -380,7 +382,7 @@ class NewsService:
     ) -> DetailedInfo:
         """Perform an in-depth search for a specific topic / angle."""
         logger.info("Deep search: %s", query)
-        response = await self._client.search(
+        response = await self._search(
             query=query,
             search_depth=search_depth,
             max_results=max_results,
@@ -415,7 +417,7 @@ _news_service: NewsService | None = None
 def get_news_service() -> NewsService:
     global _news_service
     if _news_service is None:
-        _news_service = NewsService()
+        _news_service = NewsService(cache=get_search_cache())
     return _news_service
 
 
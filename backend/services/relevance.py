@@ -0,0 +1,80 @@
+"""Single-pass topic relevance scoring for pooled news items.
+
+``NewsService.get_topic_news`` pools several Tavily queries and needs, for
+every item, (a) whether it is relevant to the topic and (b) how many topic
+terms it mentions.  :class:`TopicMatcher` normalizes the topic and its terms
+once per topic, then scores each item from a single normalization of its
+``title + content``.
+
+Matching uses CPython's substring search per pattern rather than a
+multi-pattern automaton: a topic yields only a handful of terms, and for that
+many patterns the C search is far faster than walking an Aho-Corasick
+automaton character by character in Python (see
+``benchmarks/bench_relevance.py``).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import ceil
+from typing import Iterable, NamedTuple
+
+from backend.models import NewsItem
+
+
+def normalize_text(text: str) -> str:
+    """Drop whitespace and lowercase (the form relevance matching runs on).
+
+    ``str.split()`` splits on exactly the characters ``re``'s ``\\s`` matches,
+    at roughly half the cost of ``re.sub``.
+    """
+    return "".join((text or "").split()).lower()
+
+
+class ScoredItem(NamedTuple):
+    item: NewsItem
+    relevant: bool
+    match_count: int
+
+
+class TopicMatcher:
+    """Relevance rules for one topic, prepared once and applied per item.
+
+    An item is relevant when its text contains the whole normalized topic,
+    or when it mentions at least half of the topic terms (one term when
+    there is only a single term).
+    """
+
+    def __init__(self, topic: str, topic_terms: list[str]) -> None:
+        self.topic = normalize_text(topic)
+        self.term_count = len(topic_terms)
+        self._terms = tuple(normalize_text(term) for term in topic_terms)
+        self._required = (
+            1 if self.term_count <= 1 else ceil(self.term_count / 2)
+        )
+
+    def score_text(self, haystack: str) -> tuple[bool, int]:
+        """Return ``(relevant, match_count)`` for already-normalized text."""
+        if not haystack:
+            return False, 0
+        match_count = sum(1 for term in self._terms if term in haystack)
+        if not self.topic:
+            return False, match_count
+        if self.topic in haystack:
+            return True, match_count
+        return match_count >= self._required, match_count
+
+    def score(self, item: NewsItem) -> ScoredItem:
+        relevant, match_count = self.score_text(
+            normalize_text(f"{item.title} {item.content}"))
+        return ScoredItem(item, relevant, match_count)
+
+    def score_items(self, items: Iterable[NewsItem]) -> list[ScoredItem]:
+        """Score every item in one pass (each item is normalized once)."""
+        return [self.score(item) for item in items]
+
+
+@lru_cache(maxsize=64)
+def get_topic_matcher(topic: str, topic_terms: tuple[str, ...]) -> TopicMatcher:
+    """Return a cached matcher for *topic* (terms normalized once per topic)."""
+    return TopicMatcher(topic, list(topic_terms))
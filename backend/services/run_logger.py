@@ -1,21 +1,115 @@
-"""Structured run logger for full podcast generation trace."""
+"""Structured run logger for full podcast generation trace.
+
+Events are serialized on the caller's side and buffered in memory; a
+shared background thread appends them to the JSONL file every
+``run_log_flush_interval_s`` seconds, or as soon as a logger has
+``run_log_buffer_events`` pending lines.  Error events and :meth:`close`
+flush synchronously, so a run that fails or finishes never loses its tail.
+With ``run_log_gzip`` enabled, :meth:`close` moves the finished log into
+``<name>.jsonl.gz`` (appending a new gzip member when the file already
+exists, e.g. after a retime).
+"""
 
 from __future__ import annotations
 
+import atexit
+import gzip
 import json
+import logging
+import shutil
+import threading
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Loggers nobody closed are dropped from the flusher after this much idle time.
+_ABANDONED_AFTER_S = 600.0
+
+
+class _BackgroundFlusher:
+    """One daemon thread flushing every open :class:`EpisodeRunLogger`."""
+
+    def __init__(self) -> None:
+        self._loggers: set[EpisodeRunLogger] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, run_logger: EpisodeRunLogger) -> None:
+        with self._lock:
+            self._loggers.add(run_logger)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="mindcast-run-log-flusher", daemon=True)
+                self._thread.start()
+
+    def unregister(self, run_logger: EpisodeRunLogger) -> None:
+        with self._lock:
+            self._loggers.discard(run_logger)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def flush_all(self) -> None:
+        with self._lock:
+            loggers = list(self._loggers)
+        now = time.monotonic()
+        for run_logger in loggers:
+            try:
+                run_logger.flush()
+            except Exception as exc:
+                logger.warning("Failed to flush run log %s: %s",
+                               run_logger.log_path, exc)
+            if now - run_logger.last_event_at > _ABANDONED_AFTER_S:
+                self.unregister(run_logger)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(settings.run_log_flush_interval_s)
+            self._wake.clear()
+            self.flush_all()
+
+
+_flusher = _BackgroundFlusher()
+atexit.register(_flusher.flush_all)
+
 
 class EpisodeRunLogger:
     """Write end-to-end generation logs to a JSONL file."""
 
-    def __init__(self, log_path: Path) -> None:
+    def __init__(
+        self,
+        log_path: Path,
+        *,
+        buffer_events: int | None = None,
+        compress_on_close: bool | None = None,
+    ) -> None:
         self.log_path = log_path
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_events = (
+            settings.run_log_buffer_events if buffer_events is None else buffer_events)
+        self.compress_on_close = (
+            settings.run_log_gzip if compress_on_close is None else compress_on_close)
+        self.last_event_at = time.monotonic()
         self._seq = 0
+        self._buffer: list[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        _flusher.register(self)
+
+    @property
+    def final_path(self) -> Path:
+        """Where the log will live once closed (``.gz`` when compressing)."""
+        if self.compress_on_close:
+            return self.log_path.with_name(self.log_path.name + ".gz")
+        return self.log_path
 
     def event(
         self,
@@ -37,8 +131,18 @@ class EpisodeRunLogger:
         if payload is not None:
             item["payload"] = payload
 
-        with self.log_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        line = json.dumps(item, ensure_ascii=False) + "\n"
+        with self._buffer_lock:
+            self._buffer.append(line)
+            pending = len(self._buffer)
+        self.last_event_at = time.monotonic()
+        if self._closed:
+            # Late events after close() (e.g. from a straggling task).
+            self.flush()
+        elif status == "error":
+            self.flush()
+        elif pending >= self.buffer_events:
+            _flusher.wake()
 
     def exception(self, stage: str, exc: Exception, *, payload: Any | None = None) -> None:
         """Append an exception event with traceback."""
@@ -52,3 +156,29 @@ class EpisodeRunLogger:
             merged_payload["context"] = payload
         self.event(stage, "pipeline exception",
                    status="error", payload=merged_payload)
+
+    def flush(self) -> None:
+        """Write buffered events to disk now."""
+        with self._write_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+            if not lines:
+                return
+            with self.log_path.open("a", encoding="utf-8") as f:
+                f.write("".join(lines))
+
+    def close(self) -> None:
+        """Flush, stop background flushing and optionally gzip the log."""
+        self._closed = True
+        _flusher.unregister(self)
+        self.flush()
+        if not self.compress_on_close or not self.log_path.exists():
+            return
+        with self._write_lock:
+            try:
+                with self.log_path.open("rb") as src, gzip.open(self.final_path, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+                self.log_path.unlink()
+            except OSError as exc:
+                logger.warning("Failed to compress run log %s: %s",
+                               self.log_path, exc)
@@ -0,0 +1,253 @@
+"""Persistent request-level cache for Tavily search responses.
+
+Identical searches repeat across episodes, the debug endpoints and batch runs
+on related topics.  :class:`SearchCache` keys each response on the
+normalized query plus the remaining search parameters and stores it in a
+small SQLite file, so the cache survives restarts and is shared by every
+``NewsService`` in the process.
+
+Freshness rules:
+
+* younger than the TTL for its ``time_range``/``topic`` → served directly;
+* within the stale window after that → served immediately while a single
+  background refresh replaces it (stale-while-revalidate);
+* older → fetched synchronously.
+
+Concurrent callers asking for the same key while a fetch is in flight share
+that one request instead of issuing their own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PRUNE_EVERY_WRITES = 50
+
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").split()).lower()
+
+
+def cache_key(params: dict[str, Any]) -> str:
+    """Stable hash of the search parameters (query normalized)."""
+    normalized = dict(params)
+    normalized["query"] = normalize_query(str(params.get("query", "")))
+    raw = json.dumps(normalized, sort_keys=True,
+                     ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def ttl_for(params: dict[str, Any], ttls: dict[str, int] | None = None) -> int:
+    """Freshness window (seconds) for a search, by ``time_range`` then ``topic``.
+
+    Narrow time ranges go stale quickly; untimed general searches (the deep
+    ``search_detail`` lookups) stay valid the longest.
+    """
+    ttls = settings.tavily_cache_ttl_seconds if ttls is None else ttls
+    time_range = params.get("time_range")
+    if time_range and time_range in ttls:
+        return int(ttls[time_range])
+    topic = params.get("topic") or "general"
+    return int(ttls.get(topic, ttls.get("general", 0)))
+
+
+class SearchCache:
+    """SQLite-backed response cache with stale-while-revalidate + coalescing.
+
+    Parameters
+    ----------
+    path:
+        SQLite file (created with its parent directory on first use).
+    stale_seconds:
+        How long past its TTL an entry may still be served while it is
+        refreshed in the background.
+    ttls:
+        ``time_range``/``topic`` → TTL seconds; defaults to settings.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        stale_seconds: int | None = None,
+        ttls: dict[str, int] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.stale_seconds = (
+            settings.tavily_cache_stale_seconds
+            if stale_seconds is None else stale_seconds
+        )
+        self._ttls = ttls
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "errors": 0,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._db_lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " params TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " ttl REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _read(self, key: str) -> tuple[dict, float, float] | None:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT response, fetched_at, ttl FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1], row[2]
+        except ValueError:
+            return None
+
+    def _write(self, key: str, params: dict, response: dict, ttl: float) -> None:
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(params, ensure_ascii=False, default=str),
+                 json.dumps(response, ensure_ascii=False, default=str), now, ttl),
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_EVERY_WRITES == 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE fetched_at + ttl + ? < ?",
+                    (self.stale_seconds, now),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._db_lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _fetch(
+        self,
+        key: str,
+        params: dict,
+        fetch: Callable[[], Awaitable[dict]],
+        ttl: float,
+    ) -> asyncio.Task:
+        """Start (or join) the single in-flight fetch for *key*."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return task
+
+        async def _run() -> dict:
+            try:
+                response = await fetch()
+                self._write(key, params, response, ttl)
+                return response
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(_run())
+        self._inflight[key] = task
+        return task
+
+    async def get_or_fetch(
+        self,
+        params: dict[str, Any],
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Return the cached response for *params*, calling *fetch* when needed."""
+        ttl = ttl_for(params, self._ttls)
+        if ttl <= 0:
+            self.stats["misses"] += 1
+            return await fetch()
+
+        key = cache_key(params)
+        cached = self._read(key)
+        if cached is not None:
+            response, fetched_at, _ = cached
+            age = time.time() - fetched_at
+            if age < ttl:
+                self.stats["hits"] += 1
+                return response
+            if age < ttl + self.stale_seconds:
+                self.stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.stats["refreshes"] += 1
+                    refresh = self._fetch(key, params, fetch, ttl)
+                    refresh.add_done_callback(_log_refresh_failure)
+                return response
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._fetch(key, params, fetch, ttl))
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = (self.stats["hits"] + self.stats["stale_hits"]
+                   + self.stats["misses"])
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        with self._db_lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            **self.stats,
+            "entries": entries,
+            "inflight": len(self._inflight),
+            "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background Tavily cache refresh failed: %s",
+                       task.exception())
+
+
+_search_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache | None:
+    """Return the process-wide Tavily cache, or ``None`` when disabled."""
+    global _search_cache
+    if not settings.tavily_cache_enabled:
+        return None
+    if _search_cache is None:
+        _search_cache = SearchCache(settings.tavily_cache_path)
+    return _search_cache
@@ -0,0 +1,72 @@
+"""Research lookups shared by the episodes of one batch.
+
+Episodes generated together ask the same questions: the news for one topic,
+the same knowledge-base queries, the same Tavily deep searches.  While a
+:class:`SharedResearch` is active (see :meth:`SharedResearch.activate`),
+:func:`shared` runs each distinct lookup once and hands its result to every
+caller, including callers that arrive while it is still in flight.  Outside
+a batch :func:`shared` simply awaits the lookup.
+
+Results are a snapshot for the batch: an episode ingested into the knowledge
+base mid-batch is not visible to lookups that were already answered.  Failed
+lookups are not kept, so the next caller retries.  Callers must treat the
+shared results as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from contextvars import ContextVar, Token
+from typing import TypeVar
+
+_T = TypeVar("_T")
+
+_current: ContextVar["SharedResearch | None"] = ContextVar(
+    "mindcast_shared_research", default=None)
+
+
+class SharedResearch:
+    """Memo of lookup results keyed by ``(kind, *arguments)``."""
+
+    def __init__(self) -> None:
+        self._results: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def activate(self) -> Token:
+        """Share lookups made by the current context and the tasks it spawns."""
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token: Token) -> None:
+        _current.reset(token)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    async def get(self, key: Hashable, factory: Callable[[], Awaitable[_T]]) -> _T:
+        task = self._results.get(key)
+        if task is not None and task.done() and (task.cancelled() or task.exception()):
+            task = None
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(factory())
+            self._results[key] = task
+        else:
+            self.hits += 1
+        # Shielded: one episode being cancelled must not fail its siblings.
+        return await asyncio.shield(task)
+
+
+def current_shared_research() -> SharedResearch | None:
+    return _current.get()
+
+
+async def shared(key: Hashable, factory: Callable[[], Awaitable[_T]]) -> _T:
+    """Await ``factory()``, reusing the batch's result for *key* if any."""
+    research = _current.get()
+    if research is None:
+        return await factory()
+    return await research.get(key, factory)
+
@@ -0,0 +1,221 @@
+"""Structured (JSON) output from LLM responses.
+
+Every agent call that expects JSON goes through :func:`chat_json` (or
+:meth:`backend.agents.base.BaseAgent.think_json`), which
+
+1. asks the provider for JSON mode via ``response_format`` when
+   ``settings.llm_json_mode`` is on and the expected value is an object;
+2. parses the reply with :func:`extract_json`.  Code fences are stripped
+   first.  Near-JSON is then repaired locally with one incremental scan:
+   surrounding prose is cut and trailing commas are removed.  Python
+   literals and raw newlines inside strings are fixed, and a truncated
+   tail is closed;
+3. validates the value against a pydantic schema.
+
+Outcomes are counted in ``mindcast_llm_structured_output_total{schema,outcome}``
+(``ok`` / ``repaired`` / ``invalid`` / ``unparseable``), so the failure and
+repair rates of each prompt can be watched on ``/metrics``.  A failure raises
+:class:`StructuredOutputError`; callers keep their existing fallbacks, but
+no longer need a second LLM round trip for output that was merely
+fenced, chatty or cut off.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import re
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from backend.config import settings
+from backend.services import metrics
+
+if TYPE_CHECKING:
+    from backend.services.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+structured_outputs = metrics.registry.counter(
+    "mindcast_llm_structured_output_total",
+    "Structured LLM replies by schema and parse outcome.",
+    ("schema", "outcome"),
+)
+
+_FENCE_OPEN_RE = re.compile(r"^```[A-Za-z]*[ \t]*\n?")
+_FENCE_CLOSE_RE = re.compile(r"\n?```\s*$")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StructuredOutputError(ValueError):
+    """The LLM reply could not be turned into the expected structure."""
+
+
+def _strip_fences(text: str) -> str:
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = _FENCE_OPEN_RE.sub("", cleaned, count=1)
+    return _FENCE_CLOSE_RE.sub("", cleaned).strip()
+
+
+def _repair(fragment: str) -> list[str]:
+    """Scan *fragment* (starting at ``{`` / ``[``) once and return candidates.
+
+    The first candidate is the scanned value, closed if the text ended
+    inside it.  A truncated value also yields a second candidate cut back
+    to the last complete member.
+    """
+    out: list[str] = []
+    stack: list[str] = []
+    in_string = escaped = False
+    last_member: tuple[int, tuple[str, ...]] | None = None
+    i = 0
+    while i < len(fragment):
+        ch = fragment[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                ch = "\\n"
+            elif ch == "\t":
+                ch = "\\t"
+            out.append(ch)
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+            out.append(ch)
+        elif ch in "}]":
+            while out and out[-1] in " \t\r\n,":  # trailing comma
+                out.pop()
+            if stack and stack[-1] == ch:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                return ["".join(out)]  # ignore prose after the value
+        elif ch == ",":
+            last_member = (len(out), tuple(stack))
+            out.append(ch)
+        elif ch.isalpha():
+            j = i
+            while j < len(fragment) and fragment[j].isalpha():
+                j += 1
+            word = fragment[i:j]
+            out.append(_PY_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # Truncated: close the open string and containers.
+    tail = '"' if in_string else ""
+    text = "".join(out) + tail
+    candidates = [text.rstrip(" \t\r\n,:") + "".join(reversed(stack))]
+    if last_member is not None:
+        cut, open_stack = last_member
+        candidates.append("".join(out[:cut]) + "".join(reversed(open_stack)))
+    return candidates
+
+
+def extract_json(text: str) -> tuple[Any, bool]:
+    """Parse the JSON value in an LLM reply.
+
+    Returns ``(value, repaired)`` where *repaired* tells whether local repair
+    was needed.  Raises :class:`StructuredOutputError` when no JSON value can
+    be recovered.
+    """
+    cleaned = _strip_fences(text or "")
+    try:
+        return json.loads(cleaned), False
+    except json.JSONDecodeError:
+        pass
+
+    starts = [pos for pos in (cleaned.find("{"), cleaned.find("[")) if pos >= 0]
+    if not starts:
+        raise StructuredOutputError("no JSON value in reply")
+    for candidate in _repair(cleaned[min(starts):]):
+        try:
+            return json.loads(candidate), True
+        except json.JSONDecodeError:
+            continue
+    raise StructuredOutputError("reply is not repairable JSON")
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def parse_structured(
+    text: str,
+    schema: Any,
+    *,
+    name: str,
+    normalize: Callable[[Any], Any] | None = None,
+) -> Any:
+    """Extract, optionally *normalize* and validate JSON against *schema*.
+
+    *schema* is anything pydantic's ``TypeAdapter`` accepts (a model class,
+    ``list[str]``, ...).  *name* labels the outcome metric.
+    """
+    try:
+        data, repaired = extract_json(text)
+    except StructuredOutputError:
+        structured_outputs.inc(schema=name, outcome="unparseable")
+        logger.warning("Unparseable %s reply: %.300s", name, text)
+        raise
+    try:
+        if normalize is not None:
+            data = normalize(data)
+        value = _adapter(schema).validate_python(data)
+    except (ValidationError, TypeError, ValueError, AttributeError) as exc:
+        structured_outputs.inc(schema=name, outcome="invalid")
+        logger.warning("Invalid %s reply: %s", name, exc)
+        raise StructuredOutputError(f"{name} reply failed validation: {exc}") from exc
+    structured_outputs.inc(schema=name, outcome="repaired" if repaired else "ok")
+    if repaired:
+        logger.info("Repaired near-JSON %s reply", name)
+    return value
+
+
+def json_response_format(json_object: bool = True) -> dict[str, str] | None:
+    """``response_format`` requesting JSON mode, or ``None`` when unsupported.
+
+    Provider JSON mode only guarantees a top-level object, so replies that
+    are arrays (``json_object=False``) rely on local repair alone.
+    """
+    if json_object and settings.llm_json_mode:
+        return {"type": "json_object"}
+    return None
+
+
+async def chat_json(
+    llm: LLMService,
+    messages: list[dict[str, str]],
+    schema: Any,
+    *,
+    name: str,
+    json_object: bool = True,
+    normalize: Callable[[Any], Any] | None = None,
+    **chat_kwargs: Any,
+) -> Any:
+    """Chat and return the reply validated against *schema*.
+
+    *name* also serves as the call site for model-tier routing.
+    """
+    chat_kwargs.setdefault("call_site", name)
+    response_format = json_response_format(json_object)
+    if response_format is not None:
+        chat_kwargs["response_format"] = response_format
+    raw = await llm.chat(messages, **chat_kwargs)
+    return parse_structured(raw, schema, name=name, normalize=normalize)
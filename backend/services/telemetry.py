@@ -0,0 +1,247 @@
+"""Per-run spans for pipeline stages and LLM / TTS / Tavily calls.
+
+A :class:`RunTelemetry` is activated for the duration of one episode run
+(``generate_episode``, ``synthesize_episode_from_script``,
+``retime_episode_audio``).  Graph nodes open ``"node"`` spans; every
+``LLMService.chat``, ``TTSService.synthesize`` and Tavily search opens a
+leaf span that is attributed to the enclosing node through a context
+variable, so concurrent runs never mix their numbers.
+
+Each finished span is appended to the run log (stage ``"telemetry"``) and
+:meth:`RunTelemetry.summary` folds them into the per-episode latency and
+cost breakdown stored on ``Episode.metrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from backend.config import settings
+from backend.services import metrics
+
+if TYPE_CHECKING:
+    from backend.services.run_logger import EpisodeRunLogger
+
+SPAN_NODE = "node"
+SPAN_LLM = "llm"
+SPAN_TTS = "tts"
+SPAN_SEARCH = "search"
+
+_UNATTRIBUTED = "(other)"
+
+
+@dataclass
+class Span:
+    kind: str
+    name: str
+    node: str = _UNATTRIBUTED
+    started_at: float = field(default_factory=time.time)
+    wall_s: float = 0.0
+    queue_wait_s: float = 0.0
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    chars: int = 0
+    status: str = "ok"
+    error: str = ""
+
+    def set(self, **fields: Any) -> None:
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+
+_current_run: ContextVar["RunTelemetry | None"] = ContextVar(
+    "mindcast_run_telemetry", default=None)
+_current_node: ContextVar[str] = ContextVar(
+    "mindcast_current_node", default=_UNATTRIBUTED)
+_pending_queue_wait: ContextVar[float] = ContextVar(
+    "mindcast_pending_queue_wait", default=0.0)
+_current_task_id: ContextVar[str] = ContextVar(
+    "mindcast_task_id", default="")
+
+
+def _new_bucket() -> dict[str, float]:
+    return {
+        "wall_s": 0.0,
+        "llm_calls": 0,
+        "llm_wall_s": 0.0,
+        "prompt_tokens": 0,
+        "cached_prompt_tokens": 0,
+        "completion_tokens": 0,
+        "tts_calls": 0,
+        "tts_wall_s": 0.0,
+        "tts_chars": 0,
+        "tts_bytes": 0,
+        "queue_wait_s": 0.0,
+        "retries": 0,
+        "errors": 0,
+    }
+
+
+class RunTelemetry:
+    """Span collector for one episode run."""
+
+    def __init__(self, run_logger: EpisodeRunLogger | None = None) -> None:
+        self.run_logger = run_logger
+        self.spans: list[Span] = []
+        self._started = time.perf_counter()
+
+    def activate(self):
+        """Make this the current run; returns a token for :meth:`deactivate`."""
+        return _current_run.set(self)
+
+    @staticmethod
+    def deactivate(token) -> None:
+        _current_run.reset(token)
+
+    def record(self, span: Span) -> None:
+        self.spans.append(span)
+        if self.run_logger is not None:
+            self.run_logger.event(
+                "telemetry",
+                f"{span.kind} span",
+                status="error" if span.status != "ok" else "info",
+                payload={k: v for k, v in asdict(span).items() if v not in ("", 0, 0.0)},
+            )
+
+    def summary(self) -> dict[str, Any]:
+        """Aggregate spans into per-node and total latency / token / cost figures."""
+        nodes: dict[str, dict[str, float]] = {}
+        totals = _new_bucket()
+        for item in self.spans:
+            is_node = item.kind == SPAN_NODE
+            bucket = nodes.setdefault(
+                item.name if is_node else item.node, _new_bucket())
+            for target in (bucket,) if is_node else (bucket, totals):
+                if is_node:
+                    target["wall_s"] += item.wall_s
+                    continue
+                if item.kind == SPAN_LLM:
+                    target["llm_calls"] += 1
+                    target["llm_wall_s"] += item.wall_s
+                    target["prompt_tokens"] += item.prompt_tokens
+                    target["cached_prompt_tokens"] += item.cached_prompt_tokens
+                    target["completion_tokens"] += item.completion_tokens
+                elif item.kind == SPAN_TTS:
+                    target["tts_calls"] += 1
+                    target["tts_wall_s"] += item.wall_s
+                    target["tts_chars"] += item.chars
+                    target["tts_bytes"] += item.bytes_out
+                target["queue_wait_s"] += item.queue_wait_s
+                target["retries"] += item.retries
+                target["errors"] += int(item.status != "ok")
+
+        totals["wall_s"] = time.perf_counter() - self._started
+        for bucket in (*nodes.values(), totals):
+            bucket["cost"] = estimate_cost(bucket)
+            bucket["prompt_cache_hit_ratio"] = (
+                bucket["cached_prompt_tokens"] / bucket["prompt_tokens"]
+                if bucket["prompt_tokens"] else 0.0)
+            for key, value in bucket.items():
+                if isinstance(value, float):
+                    bucket[key] = round(value, 6)
+        return {
+            "currency": settings.cost_currency,
+            "totals": totals,
+            "nodes": nodes,
+        }
+
+
+def estimate_cost(bucket: dict[str, float]) -> float:
+    """Price a bucket with the configured per-1k-token / per-1k-char rates."""
+    cached = bucket.get("cached_prompt_tokens", 0)
+    return (
+        (bucket.get("prompt_tokens", 0) - cached) / 1000
+        * settings.llm_price_per_1k_prompt_tokens
+        + cached / 1000 * settings.llm_price_per_1k_cached_prompt_tokens
+        + bucket.get("completion_tokens", 0) / 1000
+        * settings.llm_price_per_1k_completion_tokens
+        + bucket.get("tts_chars", 0) / 1000 * settings.tts_price_per_1k_chars
+    )
+
+
+def current_run() -> RunTelemetry | None:
+    return _current_run.get()
+
+
+def bind_task_id(task_id: str) -> None:
+    """Tag the current context (and tasks spawned from it) with an API task id."""
+    _current_task_id.set(task_id)
+
+
+def current_task_id() -> str:
+    """API task id bound to the current context, or ``""``."""
+    return _current_task_id.get()
+
+
+def task_attribution(task: asyncio.Task | None) -> dict[str, str]:
+    """Return the API task id, graph node and episode an asyncio task serves."""
+    if task is None:
+        return {}
+    ctx = task.get_context()
+    run = ctx.get(_current_run)
+    log_path = getattr(getattr(run, "run_logger", None), "log_path", None)
+    return {
+        "task_name": task.get_name(),
+        "task_id": ctx.get(_current_task_id, ""),
+        "node": ctx.get(_current_node, _UNATTRIBUTED),
+        "episode_id": log_path.stem if log_path is not None else "",
+    }
+
+
+def mark_queue_wait(seconds: float) -> None:
+    """Attribute time spent waiting for a concurrency slot to the next span."""
+    _pending_queue_wait.set(_pending_queue_wait.get() + max(0.0, seconds))
+
+
+@asynccontextmanager
+async def span(kind: str, name: str, **fields: Any) -> AsyncIterator[Span]:
+    """Time a block as a span of the current run.
+
+    Leaf spans always feed the process-wide metrics; they are only recorded
+    per episode while a :class:`RunTelemetry` is active.
+    """
+    record = Span(kind=kind, name=name, node=_current_node.get(), **fields)
+    record.queue_wait_s += _pending_queue_wait.get()
+    _pending_queue_wait.set(0.0)
+    node_token = _current_node.set(name) if kind == SPAN_NODE else None
+    if kind != SPAN_NODE:
+        metrics.external_calls_inflight.inc(service=kind)
+    started = time.perf_counter()
+    try:
+        yield record
+    except BaseException as exc:
+        record.status = "error"
+        record.error = f"{exc.__class__.__name__}: {exc}"[:300]
+        raise
+    finally:
+        record.wall_s = time.perf_counter() - started
+        if node_token is not None:
+            _current_node.reset(node_token)
+        else:
+            metrics.external_calls_inflight.dec(service=kind)
+            metrics.observe_external_call(
+                kind, record.wall_s, status=record.status,
+                retries=record.retries, queue_wait_s=record.queue_wait_s)
+        run = _current_run.get()
+        if run is not None:
+            run.record(record)
+
+
+def traced_node(name: str, fn):
+    """Wrap a LangGraph node coroutine in a ``"node"`` span."""
+
+    async def _node(state):
+        async with span(SPAN_NODE, name):
+            return await fn(state)
+
+    _node.__name__ = getattr(fn, "__name__", name)
+    return _node
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
 import httpx
 
 from backend.config import settings
+from backend.services.telemetry import SPAN_TTS, mark_queue_wait, span
 
 logger = logging.getLogger(__name__)
 
 
 class TTSService:
-    """Synthesize speech via MiniMax T2A HTTP API."""
+    """Synthesize speech via MiniMax T2A HTTP API.
+
+    At most *max_concurrency* (``settings.tts_max_concurrency``) requests are
+    in flight at once, however many episodes are being synthesized.
+    """
 
     def __init__(
         self,
@@ -20,12 +27,15 @@ class TTSService:
         model: str | None = None,
         base_url: str | None = None,
         audio_format: str | None = None,
+        max_concurrency: int | None = None,
     ) -> None:
         self.api_key = api_key or settings.minimax_api_key
         self.model = model or settings.minimax_tts_model
         self.base_url = base_url or settings.minimax_tts_base_url
         self.audio_format = (
             audio_format or settings.minimax_audio_format).lower()
+        self._slots = asyncio.Semaphore(
+            max_concurrency or settings.tts_max_concurrency)
 
     async def synthesize(
         self,
@@ -87,44 +97,63 @@ class TTSService:
             "Content-Type": "application/json",
         }
 
+        queued_at = time.perf_counter()
+        async with self._slots:
+            mark_queue_wait(time.perf_counter() - queued_at)
+            return await self._post(payload, headers, text=text,
+                                    voice_id=voice_id, retries=retries)
+
+    async def _post(
+        self,
+        payload: dict,
+        headers: dict[str, str],
+        *,
+        text: str,
+        voice_id: str,
+        retries: int,
+    ) -> bytes:
         last_error: Exception | None = None
-        for attempt in range(1, retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    resp = await client.post(
-                        self.base_url,
-                        json=payload,
-                        headers=headers,
+        async with span(SPAN_TTS, voice_id, chars=len(text),
+                        bytes_in=len(text.encode("utf-8"))) as record:
+            for attempt in range(1, retries + 1):
+                try:
+                    async with httpx.AsyncClient(timeout=60.0) as client:
+                        resp = await client.post(
+                            self.base_url,
+                            json=payload,
+                            headers=headers,
+                        )
+                        resp.raise_for_status()
+                        data = resp.json()
+
+                    # Check API-level errors
+                    base_resp = data.get("base_resp", {})
+                    if base_resp.get("status_code", 0) != 0:
+                        raise RuntimeError(
+                            f"MiniMax API error: {base_resp.get('status_msg', 'unknown')}"
+                        )
+
+                    hex_audio = data.get("data", {}).get("audio", "")
+                    if not hex_audio:
+                        raise RuntimeError("Empty audio data in MiniMax response")
+
+                    audio_bytes = bytes.fromhex(hex_audio)
+                    logger.info(
+                        "TTS synthesized %d bytes for voice=%s", len(
+                            audio_bytes), voice_id
                     )
-                    resp.raise_for_status()
-                    data = resp.json()
-
-                # Check API-level errors
-                base_resp = data.get("base_resp", {})
-                if base_resp.get("status_code", 0) != 0:
-                    raise RuntimeError(
-                        f"MiniMax API error: {base_resp.get('status_msg', 'unknown')}"
+                    record.set(retries=attempt - 1, bytes_out=len(audio_bytes))
+                    return audio_bytes
+
+                except Exception as exc:
+                    last_error = exc
+                    logger.warning(
+                        "TTS attempt %d/%d failed: %s", attempt, retries, exc
                     )
 
-                hex_audio = data.get("data", {}).get("audio", "")
-                if not hex_audio:
-                    raise RuntimeError("Empty audio data in MiniMax response")
-
-                audio_bytes = bytes.fromhex(hex_audio)
-                logger.info(
-                    "TTS synthesized %d bytes for voice=%s", len(
-                        audio_bytes), voice_id
-                )
-                return audio_bytes
-
-            except Exception as exc:
-                last_error = exc
-                logger.warning(
-                    "TTS attempt %d/%d failed: %s", attempt, retries, exc
-                )
-
-        raise RuntimeError(
-            f"TTS failed after {retries} retries") from last_error
+            record.set(retries=retries - 1)
+            raise RuntimeError(
+                f"TTS failed after {retries} retries") from last_error
 
 
 # Module-level convenience instance (lazy)
@@ -0,0 +1,130 @@
+"""Background warm-up of heavy dependencies, reported as readiness.
+
+The API imports only what it needs to accept requests.  Importing
+langgraph, the LLM, Tavily and pydub clients, opening ChromaDB and building
+the orchestrator are deferred.  The lifespan hook starts :class:`WarmUp`,
+which does that work in worker threads once the server is up.  ``/healthz``
+(liveness) answers at once.  ``/readyz`` (readiness) answers 503 until every
+step has succeeded.  A request that arrives earlier still works; it just
+pays for the first use itself.
+
+Failed steps are retried with exponential backoff until they succeed: an
+API key entered in the settings panel after startup, or a transient
+ChromaDB error, must not leave the process unready until a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+def _import_pipeline() -> None:
+    for module in ("backend.agents.orchestrator", "pydub"):
+        importlib.import_module(module)
+
+
+def _open_knowledge_base() -> None:
+    from backend.knowledge import get_knowledge_base
+
+    # Opening collections does not load the embedding model; embed a query too.
+    get_knowledge_base().warm_up()
+
+
+def _build_orchestrator() -> None:
+    from backend.agents.orchestrator import get_orchestrator
+
+    get_orchestrator()
+
+
+DEFAULT_STEPS: tuple[tuple[str, Callable[[], None]], ...] = (
+    ("imports", _import_pipeline),
+    ("knowledge_base", _open_knowledge_base),
+    ("orchestrator", _build_orchestrator),
+)
+
+
+class WarmUp:
+    """Runs warm-up steps in order, off the event loop, and tracks their state."""
+
+    def __init__(
+        self,
+        steps: tuple[tuple[str, Callable[[], None]], ...] = DEFAULT_STEPS,
+        *,
+        retry_base_s: float = 2.0,
+        retry_max_s: float = 60.0,
+    ) -> None:
+        self._steps = steps
+        self._retry_base_s = retry_base_s
+        self._retry_max_s = retry_max_s
+        self.components: dict[str, dict[str, Any]] = {
+            name: {"status": PENDING} for name, _ in steps}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return all(c["status"] == READY for c in self.components.values())
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"ready": self.ready, "components": self.components}
+
+    async def run(self) -> None:
+        """Run every step, retrying failed ones with backoff until all are ready."""
+        retry = 0
+        while not await self.run_once():
+            retry += 1
+            delay = min(self._retry_max_s, self._retry_base_s * 2 ** (retry - 1))
+            logger.info("Retrying failed warm-up steps in %.1fs", delay)
+            await asyncio.sleep(delay)
+
+    async def run_once(self) -> bool:
+        """One pass over the steps not yet ready; returns :attr:`ready`."""
+        for name, step in self._steps:
+            if self.components[name]["status"] == READY:
+                continue
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(step)
+            except Exception as exc:
+                logger.warning("Warm-up step %s failed: %s", name, exc)
+                self.components[name] = {"status": FAILED, "error": str(exc)}
+                continue
+            elapsed = round(time.perf_counter() - started, 3)
+            self.components[name] = {"status": READY, "seconds": elapsed}
+            logger.info("Warm-up step %s ready in %.3fs", name, elapsed)
+        return self.ready
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self.run(), name="warmup")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_warmup: WarmUp | None = None
+
+
+def get_warmup() -> WarmUp:
+    global _warmup
+    if _warmup is None:
+        _warmup = WarmUp()
+    return _warmup
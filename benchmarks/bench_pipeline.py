@@ -0,0 +1,376 @@
+"""Offline end-to-end benchmark for ``PodcastOrchestrator``.
+
+Drives ``generate_episode``, ``synthesize_episode_from_script`` and
+``retime_episode_audio`` against the fakes in :mod:`benchmarks.fakes` and a
+real ``ChromaKnowledgeBase`` in a temp directory (local hashing embedder),
+then reports per-node / per-step wall time, peak RSS and event-loop lag.
+
+Usage::
+
+    python -m benchmarks.bench_pipeline --runs 3 --out bench-results/HEAD.json
+    python -m benchmarks.compare bench-results/base.json bench-results/HEAD.json
+
+Dialogue generation modes are compared the same way; each scenario's
+``llm`` block reports its LLM calls and prompt / completion characters,
+in total and spent in the dialogue step, plus the dialogue lines
+produced::
+
+    python -m benchmarks.bench_pipeline --generation-mode per_line --out per_line.json
+    python -m benchmarks.bench_pipeline --generation-mode segment --out segment.json
+    python -m benchmarks.compare per_line.json segment.json
+
+``--batch N`` adds a ``generate_batch`` scenario: N host-picked episodes
+through :class:`~backend.agents.batch.BatchGenerator`, reporting
+``episodes_per_hour`` and the shared-research hits::
+
+    python -m benchmarks.bench_pipeline --batch 6 --batch-concurrency 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import backend.knowledge as knowledge  # noqa: E402
+from backend.agents.batch import BatchGenerator  # noqa: E402
+from backend.agents.orchestrator import PodcastOrchestrator  # noqa: E402
+from backend.config import settings  # noqa: E402
+from backend.knowledge.chroma_kb import ChromaKnowledgeBase  # noqa: E402
+from benchmarks.fakes import (  # noqa: E402
+    FakeLLM,
+    FakeNews,
+    FakeTTS,
+    HashingEmbeddingFunction,
+    LLMUsage,
+    llm_usage,
+)
+
+# Orchestrator coroutines timed in addition to the graph nodes.
+_TIMED_STEPS = (
+    "_generate_dialogue",
+    "_synthesize_dialogue_segments",
+    "_generate_article_text",
+)
+
+
+class Timings:
+    """Collects wall-time samples per label."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {}
+
+    def wrap(self, label: str, fn):
+        @functools.wraps(fn)
+        async def _timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.samples.setdefault(label, []).append(
+                    time.perf_counter() - start)
+        return _timed
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            label: {
+                "calls": len(values),
+                "total_s": round(sum(values), 6),
+                "mean_s": round(statistics.fmean(values), 6),
+                "max_s": round(max(values), 6),
+            }
+            for label, values in sorted(self.samples.items())
+        }
+
+
+class LoopLagSampler:
+    """Measures how late a periodic ``asyncio.sleep`` wakes up.
+
+    A sleep still pending on exit is counted too, so a scenario that blocks
+    the loop from start to finish still reports its stall.
+    """
+
+    def __init__(self, interval_s: float = 0.01) -> None:
+        self.interval_s = interval_s
+        self.lags_ms: list[float] = []
+        self._task: asyncio.Task | None = None
+        self._sleep_started: float | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._sleep_started = loop.time()
+            await asyncio.sleep(self.interval_s)
+            self.lags_ms.append(max(
+                0.0, (loop.time() - self._sleep_started - self.interval_s) * 1000))
+            self._sleep_started = None
+
+    async def __aenter__(self) -> "LoopLagSampler":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        await asyncio.sleep(0)  # let the sampler arm its first sleep
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        loop = asyncio.get_running_loop()
+        if self._sleep_started is not None:
+            overdue = loop.time() - self._sleep_started - self.interval_s
+            if overdue > 0:
+                self.lags_ms.append(overdue * 1000)
+        if self._task is not None:
+            self._task.cancel()
+
+    def summary(self) -> dict[str, float]:
+        if not self.lags_ms:
+            return {"samples": 0}
+        ordered = sorted(self.lags_ms)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+        return {
+            "samples": len(ordered),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1], 3),
+        }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _count_llm_usage(fn, runs: list[tuple[LLMUsage, int]]):
+    """Append ``(usage, lines)`` for each dialogue *fn* generates.
+
+    The usage only counts the calling task's LLM calls, so episodes running
+    concurrently in a batch do not leak into each other's numbers.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        lines = 0
+        with llm_usage() as usage:
+            try:
+                dialogue = await fn(*args, **kwargs)
+                lines = len(dialogue)
+                return dialogue
+            finally:
+                runs.append((usage, lines))
+    return wrapper
+
+
+def build_orchestrator(
+    args: argparse.Namespace, workdir: Path,
+) -> tuple[PodcastOrchestrator, Timings, dict[str, Any]]:
+    settings.output_dir = workdir / "episodes"
+    settings.minimax_audio_format = "wav"
+    knowledge._kb_instance = ChromaKnowledgeBase(
+        persist_dir=workdir / "chromadb",
+        embedding_function=HashingEmbeddingFunction(),
+    )
+
+    fakes = {
+        "llm": FakeLLM(first_token_s=args.llm_first_token_s,
+                       tokens_per_s=args.llm_tokens_per_s),
+        "news": FakeNews(latency_s=args.news_latency_s),
+        "tts": FakeTTS(latency_s=args.tts_latency_s,
+                       realtime_factor=args.tts_realtime_factor),
+    }
+    orchestrator = PodcastOrchestrator(
+        llm=fakes["llm"], news=fakes["news"], tts=fakes["tts"])
+
+    timings = Timings()
+    for attr in dir(orchestrator):
+        if attr.startswith("_node_"):
+            setattr(orchestrator, attr, timings.wrap(
+                f"node.{attr[len('_node_'):]}", getattr(orchestrator, attr)))
+    for attr in _TIMED_STEPS:
+        setattr(orchestrator, attr, timings.wrap(
+            f"step.{attr.lstrip('_')}", getattr(orchestrator, attr)))
+    audio = orchestrator._audio
+    for attr in ("stitch_episode", "stitch_episode_from_local_segments"):
+        setattr(audio, attr, timings.wrap(f"step.{attr}", getattr(
+            type(audio), attr).__get__(audio)))
+    orchestrator._generate_dialogue = _count_llm_usage(
+        orchestrator._generate_dialogue, fakes.setdefault("dialogue_runs", []))
+    # Nodes are bound when the graph is compiled; rebuild with the wrappers.
+    orchestrator._app = orchestrator._build_graph().compile()
+    return orchestrator, timings, fakes
+
+
+async def run_scenarios(args: argparse.Namespace, workdir: Path) -> dict[str, Any]:
+    # Guest selection and voice assignment are random; pin them per seed.
+    random.seed(args.seed)
+    orchestrator, timings, fakes = build_orchestrator(args, workdir)
+    scenarios: dict[str, dict[str, Any]] = {}
+
+    async def _measure(name: str, coro_factory) -> Any:
+        walls: list[float] = []
+        result = None
+        dialogue_runs = fakes["dialogue_runs"]
+        first_run = len(dialogue_runs)  # scenarios run one after another
+        with llm_usage() as usage:
+            async with LoopLagSampler() as sampler:
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    result = await coro_factory()
+                    walls.append(time.perf_counter() - start)
+        dialogue, lines = LLMUsage(), 0
+        for run_usage, run_lines in dialogue_runs[first_run:]:
+            dialogue.add(run_usage)
+            lines += run_lines
+        scenarios[name] = {
+            "runs": args.runs,
+            "wall_mean_s": round(statistics.fmean(walls), 6),
+            "wall_max_s": round(max(walls), 6),
+            "peak_rss_mb": _peak_rss_mb(),
+            "loop_lag": sampler.summary(),
+            # Totals over all runs of the scenario.
+            "llm": {
+                **usage.as_dict(),
+                **{f"dialogue_{k}": v for k, v in dialogue.as_dict().items()},
+                "dialogue_lines": lines,
+            },
+        }
+        return result
+
+    episode = await _measure(
+        "generate_episode",
+        lambda: orchestrator.generate_episode(
+            topic=args.topic, generation_mode=args.generation_mode),
+    )
+    scripted = await _measure(
+        "synthesize_episode_from_script",
+        lambda: orchestrator.synthesize_episode_from_script(
+            title=episode.title,
+            topic=episode.topic,
+            summary=episode.summary,
+            guests=episode.guests,
+            dialogue=[line.model_copy() for line in episode.dialogue],
+        ),
+    )
+    await _measure(
+        "retime_episode_audio",
+        lambda: orchestrator.retime_episode_audio(
+            scripted, line_speeds=[1.25] * len(scripted.dialogue)),
+    )
+
+    if args.batch:
+        batch = await _measure(
+            "generate_batch",
+            lambda: BatchGenerator(
+                orchestrator, max_concurrent_episodes=args.batch_concurrency,
+            ).run(count=args.batch, generation_mode=args.generation_mode),
+        )
+        scenarios["generate_batch"].update({
+            "episodes": len(batch.completed),
+            "episodes_per_hour": round(batch.episodes_per_hour, 1),
+            "shared_research": batch.shared_research,
+        })
+
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {k: v for k, v in vars(args).items() if k != "out"},
+        },
+        "scenarios": scenarios,
+        "timings": timings.summary(),
+        "services": {
+            "llm_calls": fakes["llm"].calls,
+            "llm_prompt_chars": fakes["llm"].prompt_chars,
+            "llm_completion_chars": fakes["llm"].completion_chars,
+            "news_calls": fakes["news"].calls,
+            "tts_calls": fakes["tts"].calls,
+            "tts_bytes": fakes["tts"].bytes_out,
+        },
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"revision {report['meta']['revision']}")
+    for name, data in report["scenarios"].items():
+        lag = data["loop_lag"]
+        print(f"{name:<34} wall {data['wall_mean_s'] * 1000:9.1f} ms  "
+              f"rss {data['peak_rss_mb']:7.1f} MB  "
+              f"lag p99 {lag.get('p99_ms', 0):7.2f} ms  max {lag.get('max_ms', 0):7.2f} ms")
+        print(f"{'':<34} llm " + ", ".join(
+            f"{k}={v}" for k, v in data["llm"].items()))
+        if "episodes_per_hour" in data:
+            print(f"{'':<34} {data['episodes']} episodes, "
+                  f"{data['episodes_per_hour']:.1f} episodes/hour, "
+                  f"shared research {data['shared_research']}")
+    print()
+    for label, data in report["timings"].items():
+        print(f"  {label:<40} {data['calls']:4d} x {data['mean_s'] * 1000:9.2f} ms"
+              f"  (total {data['total_s'] * 1000:9.1f} ms)")
+    print()
+    print("  " + ", ".join(f"{k}={v}" for k, v in report["services"].items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--topic", default="",
+                        help="user topic; empty exercises LLM topic selection")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="write the JSON report here")
+    parser.add_argument("--generation-mode", choices=("per_line", "segment"),
+                        default=None,
+                        help="dialogue generation mode (default: settings)")
+    parser.add_argument("--llm-first-token-s", type=float, default=0.02)
+    parser.add_argument("--llm-tokens-per-s", type=float, default=2000.0)
+    parser.add_argument("--news-latency-s", type=float, default=0.05)
+    parser.add_argument("--tts-latency-s", type=float, default=0.03)
+    parser.add_argument("--tts-realtime-factor", type=float, default=0.01)
+    parser.add_argument("--batch", type=int, default=0,
+                        help="also run a batch of this many host-picked episodes")
+    parser.add_argument("--batch-concurrency", type=int, default=None,
+                        help="episodes in flight during --batch (default: settings)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix="mindcast-bench-") as tmp:
+        report = asyncio.run(run_scenarios(args, Path(tmp)))
+
+    _print_report(report)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2),
+                            encoding="utf-8")
+        print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
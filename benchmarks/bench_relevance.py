@@ -0,0 +1,129 @@
+"""Micro-benchmark: topic relevance scoring over pooled news items.
+
+Compares the previous per-item / per-term implementation (regex normalize +
+one substring scan per term, re-run in the sort key, O(n²) fill step) with
+the single-pass ``TopicMatcher`` (each item normalized once, terms
+normalized once per topic, id-free fill step).
+
+Usage::
+
+    python benchmarks/bench_relevance.py [--sizes 1000 10000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from math import ceil
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.models import NewsItem  # noqa: E402
+from backend.services.news_service import NewsService  # noqa: E402
+from backend.services.relevance import get_topic_matcher  # noqa: E402
+
+TOPIC = "特朗普 关税 贸易战"
+_VOCAB = [
+    "特朗普", "关税", "贸易战", "美联储", "降息", "芯片", "出口管制", "欧盟",
+    "人工智能", "新能源", "股市", "通胀", "就业", "选举", "外交", "供应链",
+    "市场", "政策", "分析师", "表示", "预计", "本周", "声明", "谈判",
+]
+
+
+def _make_pool(size: int, seed: int = 7) -> list[NewsItem]:
+    rng = random.Random(seed)
+    pool = []
+    for i in range(size):
+        title = " ".join(rng.choices(_VOCAB, k=6))
+        content = "，".join(" ".join(rng.choices(_VOCAB, k=12)) for _ in range(6))
+        pool.append(NewsItem(
+            title=f"{title} #{i}", url=f"https://example.com/{i}",
+            content=content, published_date=None, score=rng.random(),
+        ))
+    return pool
+
+
+def _legacy_normalize(text: str) -> str:
+    return re.sub(r"\s+", "", (text or "")).lower()
+
+
+def _legacy_match_count(item: NewsItem, terms: list[str]) -> int:
+    haystack = _legacy_normalize(f"{item.title} {item.content}")
+    if not haystack or not terms:
+        return 0
+    return sum(1 for t in terms if _legacy_normalize(t) in haystack)
+
+
+def _legacy_is_relevant(item: NewsItem, topic: str, terms: list[str]) -> bool:
+    haystack = _legacy_normalize(f"{item.title} {item.content}")
+    normalized_topic = _legacy_normalize(topic)
+    if not haystack or not normalized_topic:
+        return False
+    if normalized_topic in haystack:
+        return True
+    matched = _legacy_match_count(item, terms)
+    if len(terms) <= 1:
+        return matched >= 1
+    return matched >= ceil(len(terms) / 2)
+
+
+def legacy_rank(pool: list[NewsItem], topic: str, max_results: int) -> list[NewsItem]:
+    terms = NewsService._extract_topic_terms(topic)
+    relevant = [i for i in pool if _legacy_is_relevant(i, topic, terms)]
+    relevant.sort(key=lambda i: (_legacy_match_count(i, terms), i.score or 0.0),
+                  reverse=True)
+    if len(relevant) < max_results:
+        irrelevant = [i for i in pool if i not in relevant]
+        irrelevant.sort(key=lambda i: i.score or 0.0, reverse=True)
+        relevant.extend(irrelevant[:max_results - len(relevant)])
+    return relevant[:max_results]
+
+
+def single_pass_rank(pool: list[NewsItem], topic: str, max_results: int) -> list[NewsItem]:
+    terms = NewsService._extract_topic_terms(topic)
+    scored = get_topic_matcher(topic, tuple(terms)).score_items(pool)
+    ranked = sorted((e for e in scored if e.relevant),
+                    key=lambda e: (e.match_count, e.item.score or 0.0), reverse=True)
+    result = [e.item for e in ranked]
+    if len(result) < max_results:
+        rest = sorted((e.item for e in scored if not e.relevant),
+                      key=lambda i: i.score or 0.0, reverse=True)
+        result.extend(rest[:max_results - len(result)])
+    return result[:max_results]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-results", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'legacy ms':>12} {'single-pass ms':>16} {'speedup':>9}")
+    for size in args.sizes:
+        pool = _make_pool(size)
+        expected = legacy_rank(pool, TOPIC, args.max_results)
+        assert [i.url for i in single_pass_rank(pool, TOPIC, args.max_results)] == \
+            [i.url for i in expected]
+        legacy = _best_of(lambda: legacy_rank(pool, TOPIC, args.max_results), args.repeat)
+        fast = _best_of(lambda: single_pass_rank(pool, TOPIC, args.max_results), args.repeat)
+        print(f"{size:>8} {legacy * 1000:>12.1f} {fast * 1000:>16.1f} {legacy / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
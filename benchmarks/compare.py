@@ -0,0 +1,101 @@
+"""Compare two ``bench_pipeline`` JSON reports.
+
+Usage::
+
+    python -m benchmarks.compare base.json head.json [--threshold 0.2]
+
+Prints per-scenario and per-node deltas plus the ``services``
+counters and each scenario's ``llm`` usage (calls, prompt / completion
+characters, ...) and exits with status 1 when any
+mean wall time regressed by more than ``--threshold`` (fractional).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ignore regressions on timings too small to measure reliably.
+_MIN_BASE_S = 0.05
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _rows(base: dict, head: dict) -> list[tuple[str, float, float]]:
+    rows: list[tuple[str, float, float]] = []
+    for name in sorted(set(base["scenarios"]) | set(head["scenarios"])):
+        rows.append((
+            f"scenario.{name}",
+            base["scenarios"].get(name, {}).get("wall_mean_s", float("nan")),
+            head["scenarios"].get(name, {}).get("wall_mean_s", float("nan")),
+        ))
+    for label in sorted(set(base["timings"]) | set(head["timings"])):
+        rows.append((
+            label,
+            base["timings"].get(label, {}).get("mean_s", float("nan")),
+            head["timings"].get(label, {}).get("mean_s", float("nan")),
+        ))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    base, head = _load(args.base), _load(args.head)
+    print(f"base {base['meta']['revision']}  ->  head {head['meta']['revision']}\n")
+    print(f"{'metric':<48} {'base ms':>10} {'head ms':>10} {'delta':>8}")
+
+    regressions: list[str] = []
+    for label, before, after in _rows(base, head):
+        if before != before or after != after:  # NaN: only in one report
+            print(f"{label:<48} {'-' if before != before else f'{before * 1000:10.1f}':>10}"
+                  f" {'-' if after != after else f'{after * 1000:10.1f}':>10}")
+            continue
+        delta = (after - before) / before if before else 0.0
+        flag = ""
+        if before >= _MIN_BASE_S and delta > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(label)
+        print(f"{label:<48} {before * 1000:10.1f} {after * 1000:10.1f} {delta:+7.1%}{flag}")
+
+    for name in sorted(set(base["scenarios"]) & set(head["scenarios"])):
+        b_rss = base["scenarios"][name].get("peak_rss_mb")
+        h_rss = head["scenarios"][name].get("peak_rss_mb")
+        b_lag = base["scenarios"][name].get("loop_lag", {}).get("p99_ms")
+        h_lag = head["scenarios"][name].get("loop_lag", {}).get("p99_ms")
+        print(f"\n{name}: peak RSS {b_rss} -> {h_rss} MB, loop lag p99 {b_lag} -> {h_lag} ms",
+              end="")
+    print()
+
+    counters = [(key, base["services"][key], head["services"][key])
+                for key in base.get("services", {}) if key in head.get("services", {})]
+    for name in base["scenarios"]:
+        if name not in head["scenarios"]:
+            continue
+        base_llm = base["scenarios"][name].get("llm", {})
+        head_llm = head["scenarios"][name].get("llm", {})
+        counters += [(f"{name}.llm.{key}", base_llm[key], head_llm[key])
+                     for key in base_llm if key in head_llm]
+    if counters:
+        print(f"\n{'service counter':<48} {'base':>10} {'head':>10} {'delta':>8}")
+    for key, before, after in counters:
+        delta = f"{(after - before) / before:+7.1%}" if before else ""
+        print(f"{key:<48} {before:>10} {after:>10} {delta:>8}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
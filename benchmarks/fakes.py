@@ -0,0 +1,380 @@
+"""Deterministic offline stand-ins for the external services.
+
+Each fake mirrors the public surface ``PodcastOrchestrator`` uses from the
+real service and simulates its latency, so a benchmark run exercises the
+real graph, agents, JSON parsing, audio stitching and ChromaDB code paths
+without any network access.
+"""
+
+from __future__ import annotations
+
+import array
+import asyncio
+import hashlib
+import io
+import json
+import math
+import re
+import wave
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from backend.models import DetailedInfo, NewsItem
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# ---------------------------------------------------------------------------
+# LLM
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class LLMUsage:
+    """LLM calls made inside one :func:`llm_usage` block (and its tasks)."""
+
+    calls: int = 0
+    prompt_chars: int = 0
+    completion_chars: int = 0
+    parent: LLMUsage | None = field(default=None, repr=False)
+
+    def record(self, prompt_chars: int, completion_chars: int) -> None:
+        usage: LLMUsage | None = self
+        while usage is not None:  # enclosing blocks count the call too
+            usage.calls += 1
+            usage.prompt_chars += prompt_chars
+            usage.completion_chars += completion_chars
+            usage = usage.parent
+
+    def add(self, other: LLMUsage) -> None:
+        self.calls += other.calls
+        self.prompt_chars += other.prompt_chars
+        self.completion_chars += other.completion_chars
+
+    def as_dict(self) -> dict[str, int]:
+        return {"calls": self.calls, "prompt_chars": self.prompt_chars,
+                "completion_chars": self.completion_chars}
+
+
+_current_usage: ContextVar[LLMUsage | None] = ContextVar(
+    "bench_llm_usage", default=None)
+
+
+@contextmanager
+def llm_usage() -> Iterator[LLMUsage]:
+    """Count the :class:`FakeLLM` calls made by this context and its tasks.
+
+    Concurrent episodes each run in their own task, so a block opened inside
+    one episode only sees that episode's calls.
+    """
+    usage = LLMUsage(parent=_current_usage.get())
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+class FakeLLM:
+    """``LLMService`` stand-in answering by prompt shape.
+
+    Latency is ``first_token_s + output_tokens / tokens_per_s`` with one
+    token per output character (close enough for Chinese text).
+    """
+
+    def __init__(
+        self,
+        *,
+        first_token_s: float = 0.02,
+        tokens_per_s: float = 2000.0,
+        model: str = "fake-llm",
+    ) -> None:
+        self.model = model
+        self.first_token_s = first_token_s
+        self.tokens_per_s = tokens_per_s
+        self.calls = 0
+        self.prompt_chars = 0
+        self.completion_chars = 0
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float = 0.8,
+        max_tokens: int = 4096,
+        response_format: dict[str, Any] | None = None,
+        retries: int = 3,
+        priority: int | None = None,
+        call_site: str | None = None,
+    ) -> str:
+        self.calls += 1
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        self.prompt_chars += prompt_chars
+        prompt = messages[-1].get("content", "") if messages else ""
+        system = messages[0].get("content", "") if messages else ""
+        reply = self._respond(system, prompt, seed=self.calls)
+        self.completion_chars += len(reply)
+        usage = _current_usage.get()
+        if usage is not None:
+            usage.record(prompt_chars, len(reply))
+        await asyncio.sleep(self.first_token_s + len(reply) / self.tokens_per_s)
+        return reply
+
+    async def chat_stream(self, messages, **kwargs):
+        yield await self.chat(messages, **kwargs)
+
+    _FRAGMENTS = (
+        "我觉得这里真正的变量是成本结构", "<#0.3#>", "你看去年那家公司的案例",
+        "数据其实说明了另一件事", "这背后是供应链在重新洗牌", "嗯",
+        "普通人感受到的是价格和选择", "我倒不这么看", "前提可能已经变了",
+        "上个季度的出货量掉了两成", "渠道商开始囤货观望", "监管的口径也在收紧",
+        "说白了就是谁来承担溢价", "工程师团队最先感受到压力", "海外订单转去了东南亚",
+        "我跟一位产线负责人聊过", "这和十年前那轮洗牌很像", "资本市场反应得更快",
+        "消费者其实很难察觉", "替代方案的良率还没上来", "短期阵痛躲不过去",
+        "长期看反而倒逼创新", "你这个类比不太准确", "我有个不同的数据口径",
+    )
+
+    _BATCH_SUBJECTS = (
+        "芯片出口管制", "新能源车价格战", "大模型开源", "外卖骑手社保", "储能电站安全",
+        "低空经济", "银发经济", "预制菜进校园", "光伏产能过剩", "跨境电商退货",
+        "城市更新", "碳关税", "脑机接口", "县城咖啡", "数据跨境",
+        "机器人养老", "生物医药出海", "短剧出海", "二手房降价", "智能驾驶事故",
+    )
+
+    @classmethod
+    def _sentence(cls, seed: int, length: int = 120) -> str:
+        out: list[str] = []
+        state = _digest(str(seed))
+        while sum(len(f) for f in out) < length:
+            state = (state * 6364136223846793005 + 1442695040888963407) % 2**64
+            out.append(cls._FRAGMENTS[(state >> 33) % len(cls._FRAGMENTS)])
+        return "，".join(out) + "。"
+
+    def _respond(self, system: str, prompt: str, *, seed: int) -> str:
+        if "搜索语句" in system:
+            return json.dumps(["话题 最新动态", "话题 政策影响", "话题 背景分析"],
+                              ensure_ascii=False)
+        if "请以JSON格式返回本批次的全部选题" in prompt:
+            match = re.search(r"一次性制作(\d+)期", prompt)
+            count = int(match.group(1)) if match else 1
+            return json.dumps({"topics": [{
+                "index": i + 1,
+                "topic": f"{subject}会不会改写普通人的账本",
+                "reason": "存在明显立场冲突，和普通人消费直接相关。",
+                "conflict_points": ["产业安全与效率", "短期价格与长期创新"],
+                "search_queries": [f"{subject} 最新", f"{subject} 影响", "供应链 转移"],
+                "angle_hint": "生活化类比切入",
+            } for i, subject in enumerate(self._BATCH_SUBJECTS[:count])]},
+                ensure_ascii=False)
+        if "请以JSON格式返回你的选择" in prompt:
+            return json.dumps({
+                "index": 1,
+                "topic": f"第{seed}期：芯片出口管制会不会改写消费电子定价？",
+                "reason": "存在明显立场冲突，和普通人消费直接相关。",
+                "conflict_points": ["产业安全与效率", "短期价格与长期创新"],
+                "search_queries": ["芯片出口管制 最新", "消费电子 涨价", "供应链 转移",
+                                   "国产替代 进展", "管制 历史对比"],
+                "angle_hint": "生活化类比切入",
+            }, ensure_ascii=False)
+        if "need_fresh_search" in prompt:
+            fresh = _digest(prompt) % 2 == 0
+            return json.dumps({
+                "need_fresh_search": fresh,
+                "reason": "知识库信息偏旧" if fresh else "知识库已足够",
+                "focus": "聚焦最新政策细节" if fresh else "",
+            }, ensure_ascii=False)
+        if "节目大纲" in prompt:
+            return json.dumps({
+                "topic": "芯片管制下的消费电子账本",
+                "summary": "管制到底让谁买单？这期我们把账算清楚。",
+                "opening": {"hook": "你的下一部手机可能更贵", "stance_hint": "审慎"},
+                "talking_points": [
+                    {"point": f"要点{i + 1}：{name}", "depth_hint": "现象->原因->影响",
+                     "conflict_setup": "技术派与商业派", "example_needed": "具体公司与数字"}
+                    for i, name in enumerate(["发生了什么", "为什么是现在",
+                                              "谁在买单", "反直觉的赢家"])
+                ],
+                "unexpected_angle": "真正受益的可能是二手市场",
+                "closing": {"open_question": "明年旗舰机会不会取消充电器之外的配件？",
+                            "host_takeaway": "我还没想通定价权归属"},
+            }, ensure_ascii=False)
+        if "本段对话指令" in prompt:
+            order = re.search(r"【发言顺序】(.+)", prompt)
+            speakers = order.group(1).split(" → ") if order else []
+            lines = []
+            for i, speaker in enumerate(speakers):
+                text = self._sentence(seed * 31 + i)
+                lines.append({
+                    "speaker": speaker.strip(),
+                    "text": text.replace("<#0.3#>，", ""),
+                    "ssml_text": text,
+                    "emotion": ["thoughtful", "excited", "skeptical", "neutral"][i % 4],
+                })
+            return json.dumps({"lines": lines}, ensure_ascii=False)
+        if "发言指令" in prompt or "主持人指令" in prompt:
+            text = self._sentence(seed)
+            return json.dumps({
+                "text": text.replace("<#0.3#>，", ""),
+                "ssml_text": text,
+                "emotion": ["thoughtful", "excited", "skeptical", "neutral"][seed % 4],
+                "intent": "question",
+                "stance": "extension",
+            }, ensure_ascii=False)
+        if "深度文章" in prompt or "深度内容编辑" in system:
+            return "# 芯片管制下的消费电子账本\n\n" + "\n\n".join(
+                self._sentence(seed + i, 300) for i in range(6))
+        return self._sentence(seed, 60)
+
+
+# ---------------------------------------------------------------------------
+# News (Tavily)
+# ---------------------------------------------------------------------------
+
+
+class FakeNews:
+    """``NewsService`` stand-in returning synthetic items after a delay."""
+
+    def __init__(self, *, latency_s: float = 0.05) -> None:
+        self.latency_s = latency_s
+        self.calls = 0
+
+    @staticmethod
+    def _item(query: str, i: int) -> NewsItem:
+        return NewsItem(
+            title=f"{query}：第{i + 1}条进展",
+            url=f"https://news.example/{_digest(query) % 10**8}/{i}",
+            content=f"{query}相关报道{i + 1}。" + "行业人士表示影响仍在评估中。" * 8,
+            published_date="2026-01-01",
+            score=round(1.0 - i * 0.05, 3),
+        )
+
+    async def get_topic_news(self, topic: str = "", max_results: int = 6) -> list[NewsItem]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        return [self._item(topic or "今日热点", i) for i in range(max_results)]
+
+    async def search_detail(
+        self, query: str, *, search_depth: str = "advanced", max_results: int = 5,
+    ) -> DetailedInfo:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        return DetailedInfo(
+            query=query,
+            answer=f"{query}：综合多方报道，关键事实如下。" * 3,
+            results=[self._item(query, i) for i in range(max_results)],
+        )
+
+
+# ---------------------------------------------------------------------------
+# TTS
+# ---------------------------------------------------------------------------
+
+
+class FakeTTS:
+    """``TTSService`` stand-in producing a WAV tone sized to the text.
+
+    Audio length is ``seconds_per_char * len(text) / speed``; latency is
+    ``latency_s + realtime_factor * audio_seconds``.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_s: float = 0.03,
+        realtime_factor: float = 0.01,
+        seconds_per_char: float = 0.05,
+        sample_rate: int = 16000,
+    ) -> None:
+        self.latency_s = latency_s
+        self.realtime_factor = realtime_factor
+        self.seconds_per_char = seconds_per_char
+        self.sample_rate = sample_rate
+        self.audio_format = "wav"
+        self.calls = 0
+        self.bytes_out = 0
+        # One 200 Hz period; repeated to build each clip without per-sample math.
+        period = sample_rate // 200
+        self._period = array.array("h", (
+            int(3000 * math.sin(2 * math.pi * i / period)) for i in range(period)
+        )).tobytes()
+
+    def _wav(self, seconds: float) -> bytes:
+        frames = max(1, int(seconds * self.sample_rate))
+        period_frames = len(self._period) // 2
+        pcm = self._period * (frames // period_frames + 1)
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(pcm[: frames * 2])
+        return buf.getvalue()
+
+    async def synthesize(
+        self, text: str, voice_id: str, emotion: str | None = None, *,
+        speed: float = 1.0, **kwargs: Any,
+    ) -> bytes:
+        if not text.strip():
+            return b""
+        self.calls += 1
+        seconds = self.seconds_per_char * len(text) / max(speed, 0.1)
+        await asyncio.sleep(self.latency_s + self.realtime_factor * seconds)
+        audio = self._wav(seconds)
+        self.bytes_out += len(audio)
+        return audio
+
+
+# ---------------------------------------------------------------------------
+# Knowledge base embeddings
+# ---------------------------------------------------------------------------
+
+
+class HashingEmbeddingFunction:
+    """Local ChromaDB embedding function: hashed character bigrams.
+
+    Lets the real ``ChromaKnowledgeBase`` (HNSW index, persistence, scope
+    filtering) run without downloading Chroma's default model.
+    """
+
+    def __init__(self, dim: int = 128) -> None:
+        self.dim = dim
+
+    def __call__(self, input: list[str]) -> list[list[float]]:
+        vectors: list[list[float]] = []
+        for text in input:
+            vec = [0.0] * self.dim
+            for i in range(max(len(text) - 1, 1)):
+                vec[_digest(text[i:i + 2]) % self.dim] += 1.0
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            vectors.append([v / norm for v in vec])
+        return vectors
+
+    def embed_query(self, input: list[str]) -> list[list[float]]:
+        # Queries embed the same way as documents.
+        return self(input)
+
+    @staticmethod
+    def name() -> str:
+        return "mindcast-bench-hashing"
+
+    def get_config(self) -> dict[str, Any]:
+        return {"dim": self.dim}
+
+    @staticmethod
+    def build_from_config(config: dict[str, Any]) -> "HashingEmbeddingFunction":
+        return HashingEmbeddingFunction(int(config.get("dim", 128)))
+
+    def is_legacy(self) -> bool:
+        return False
+
+    def default_space(self) -> str:
+        return "cosine"
+
+    def supported_spaces(self) -> list[str]:
+        return ["cosine", "l2", "ip"]
@@ -1,22 +1,53 @@
 """MindCast — Multi-Agent AI Podcast Generator (FastAPI entry point)."""
 
 import logging
+import time
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
-from backend.api.routes import router
+from backend.api.routes import refresh_scrape_metrics, router
 from backend.config import settings
+from backend.knowledge.retention import get_compaction_job
 from backend.logging_config import setup_logging
+from backend.services import metrics
+from backend.services.loop_watchdog import get_loop_watchdog
+from backend.services.warmup import get_warmup
 
 setup_logging(level=logging.INFO)
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Start/stop background maintenance jobs with the server."""
+    warmup = get_warmup()
+    warmup.start()
+    compaction_job = get_compaction_job()
+    compaction_job.start()
+    loop_lag_monitor = metrics.get_loop_lag_monitor()
+    loop_lag_monitor.start()
+    watchdog = get_loop_watchdog() if settings.loop_watchdog_enabled else None
+    if watchdog is not None:
+        watchdog.start()
+    try:
+        yield
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
+        await loop_lag_monitor.stop()
+        await compaction_job.stop()
+        await warmup.stop()
+
+
 app = FastAPI(
     title="MindCast API",
     description="Multi-Agent AI Podcast Generator",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -28,6 +59,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe per-route latency (time to response headers)."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to bound cardinality.
+        route = request.scope.get("route")
+        metrics.http_request_duration.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        )
+
+
 # API routes
 app.include_router(router)
 
@@ -42,6 +94,29 @@ async def root():
     return {"name": "MindCast API", "version": "0.1.0", "status": "running"}
 
 
+@app.get("/healthz", include_in_schema=False)
+async def liveness():
+    """Liveness: the process is up and serving (no dependency checks)."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readiness():
+    """Readiness: heavy dependencies are imported and the KB is open."""
+    snapshot = get_warmup().snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of process metrics."""
+    await refresh_scrape_metrics()
+    return PlainTextResponse(
+        metrics.registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host=settings.host,
                 port=settings.port, reload=True)
@@ -0,0 +1,95 @@
+"""Generate a slate of MindCast episodes in one run (full pipeline with TTS).
+
+Examples:
+    python scripts/run_batch.py --count 12
+    python scripts/run_batch.py --topic "AI Agent 发展" --topic "量子计算" --concurrency 2
+    python scripts/run_batch.py --count 10 --out output/batch-report.json
+
+With ``--count`` the host picks that many distinct topics from one news
+fetch; with ``--topic`` each topic gets its own episode.  News, knowledge
+base lookups and Tavily searches are shared across the batch, and the
+report ends with the aggregate throughput in episodes/hour.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from backend.agents.batch import BatchGenerator, BatchResult
+from backend.agents.orchestrator import get_orchestrator
+from backend.config import settings
+
+
+def _setup_logging(verbose: bool) -> None:
+    from backend.logging_config import setup_logging
+    setup_logging(level=logging.DEBUG if verbose else logging.INFO)
+
+
+def _print_report(result: BatchResult) -> None:
+    summary = result.summary()
+    print()
+    for item in summary["episodes"]:
+        outcome = item["episode_id"] or item["error"] or item["status"]
+        print(f"  [{item['index'] + 1:02d}] {item['status']:<9} {item['seconds']:8.1f}s"
+              f"  {item['topic']}  -> {outcome}")
+    print()
+    print(f"completed {summary['completed']}/{summary['requested']} episodes"
+          f" in {summary['elapsed_s']:.1f}s"
+          f" ({summary['max_concurrent_episodes']} at a time)")
+    print(f"throughput: {summary['episodes_per_hour']:.2f} episodes/hour")
+    shared = summary["shared_research"]
+    print(f"shared research lookups: {shared.get('hits', 0)} reused,"
+          f" {shared.get('misses', 0)} run")
+
+
+async def run_batch(args: argparse.Namespace) -> BatchResult:
+    batch = BatchGenerator(
+        get_orchestrator(),
+        max_concurrent_episodes=args.concurrency,
+        max_news_results=args.max_news,
+    )
+    return await batch.run(
+        topics=args.topic,
+        count=args.count,
+        selected_guest_names=args.guests,
+        generation_mode=args.generation_mode,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=0,
+                        help="let the host pick this many topics from today's news")
+    parser.add_argument("--topic", action="append", default=[],
+                        help="explicit topic (repeat for several episodes)")
+    parser.add_argument("--guests", nargs="*", default=None,
+                        help="guest names used for every episode (default: random)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"episodes in flight (default {settings.batch_max_concurrent_episodes})")
+    parser.add_argument("--max-news", type=int, default=10,
+                        help="news items the host chooses from with --count")
+    parser.add_argument("--generation-mode", choices=("per_line", "segment"),
+                        default=None)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="write the JSON report here")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    if not args.topic and args.count <= 0:
+        parser.error("give --count N or at least one --topic")
+
+    _setup_logging(args.verbose)
+    result = asyncio.run(run_batch(args))
+    _print_report(result)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result.summary(), ensure_ascii=False, indent=2),
+                            encoding="utf-8")
+        print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
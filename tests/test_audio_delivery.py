@@ -0,0 +1,141 @@
+import asyncio
+import os
+import stat
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import router
+from backend.config import settings
+from backend.models import DialogueLine, Episode, EpisodeMeta
+from backend.services import audio_delivery
+from backend.services.audio_delivery import AudioTranscoder, EpisodeAudioIndex
+
+
+def _save_episode(tmp_path, audio_bytes: bytes) -> Episode:
+    audio = tmp_path / "episode.wav"
+    audio.write_bytes(audio_bytes)
+    segment = tmp_path / "0000.wav"
+    segment.write_bytes(audio_bytes[:100])
+    episode = Episode(
+        audio_path=str(audio),
+        dialogue=[DialogueLine(speaker="主持", text="你好", ssml_text="你好",
+                               segment_audio_path=str(segment))],
+    )
+    episode.save_json(settings.output_dir)
+    return episode
+
+
+def test_audio_routes_support_ranges_and_revalidation(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", tmp_path / "episodes")
+    monkeypatch.setattr(audio_delivery, "_ffmpeg", lambda: None)
+    episode = _save_episode(tmp_path, bytes(range(256)) * 4)
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    url = f"/api/episodes/{episode.id}/audio"
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == bytes(range(256)) * 4
+    assert full.headers["content-type"] == "audio/wav"
+    assert full.headers["cache-control"] == "private, no-cache"
+    assert full.headers["accept-ranges"] == "bytes"
+
+    partial = client.get(url, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == bytes(range(10, 20))
+
+    etag = full.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    segment = client.get(f"/api/episodes/{episode.id}/segments/0/audio")
+    assert segment.status_code == 200 and len(segment.content) == 100
+    assert client.get(f"/api/episodes/{episode.id}/segments/3/audio").status_code == 404
+    assert client.get("/api/episodes/missing/audio").status_code == 404
+
+
+def test_audio_index_reloads_only_when_episode_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", tmp_path / "episodes")
+    episode = _save_episode(tmp_path, b"RIFF")
+    loads: list[str] = []
+    original = EpisodeMeta.load.__func__
+
+    def _load(cls, path):
+        loads.append(path.name)
+        return original(cls, path)
+
+    monkeypatch.setattr(EpisodeMeta, "load", classmethod(_load))
+    index = EpisodeAudioIndex(max_entries=4)
+
+    assert index.lookup(episode.id).audio_path == tmp_path / "episode.wav"
+    index.lookup(episode.id)
+    assert len(loads) == 1
+
+    episode.audio_path = str(tmp_path / "retimed.wav")
+    episode.save_json(settings.output_dir)
+    assert index.lookup(episode.id).audio_path == tmp_path / "retimed.wav"
+    assert len(loads) == 2
+    assert index.lookup("missing") is None
+
+
+def _fake_ffmpeg(tmp_path, monkeypatch):
+    calls = tmp_path / "calls.txt"
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text(
+        f"#!{sys.executable}\n"
+        "import shutil, sys\n"
+        f"open({str(calls)!r}, 'a').write('x')\n"
+        "shutil.copyfile(sys.argv[sys.argv.index('-i') + 1], sys.argv[-1])\n",
+        encoding="utf-8",
+    )
+    fake_ffmpeg.chmod(fake_ffmpeg.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(audio_delivery, "_ffmpeg", lambda: str(fake_ffmpeg))
+    return calls
+
+
+async def test_transcoder_encodes_each_source_once(tmp_path, monkeypatch):
+    calls = _fake_ffmpeg(tmp_path, monkeypatch)
+    source = tmp_path / "0001.wav"
+    source.write_bytes(b"RIFF" * 10)
+    transcoder = AudioTranscoder(codec="opus")
+
+    served = await asyncio.gather(*(transcoder.deliverable(source) for _ in range(3)))
+    assert served == [source.with_suffix(".opus")] * 3
+    assert await transcoder.deliverable(source) == source.with_suffix(".opus")
+    assert calls.read_text() == "x"
+    assert await AudioTranscoder(codec="none").deliverable(source) == source
+
+
+async def test_source_is_served_as_one_representation(tmp_path, monkeypatch):
+    calls = _fake_ffmpeg(tmp_path, monkeypatch)
+    source = tmp_path / "episode.wav"
+    source.write_bytes(b"RIFF" * 4 * 1024 * 1024)  # 16 MB: once encoded in the background
+    transcoder = AudioTranscoder(codec="aac")
+
+    transcoder.prepare(source)  # as after stitching
+    served = await asyncio.gather(*(transcoder.deliverable(source) for _ in range(2)))
+    assert served == [source.with_suffix(".m4a")] * 2
+    assert calls.read_text() == "x"
+    assert settings.audio_delivery_codec == "aac"
+
+
+async def test_source_rewritten_during_encode_is_encoded_again(tmp_path, monkeypatch):
+    calls = _fake_ffmpeg(tmp_path, monkeypatch)
+    source = tmp_path / "episode.wav"
+    source.write_bytes(b"RIFF old")
+    transcoder = AudioTranscoder(codec="opus")
+    run_ffmpeg = transcoder._run_ffmpeg
+
+    async def _retimed_mid_encode(src, output):
+        result = await run_ffmpeg(src, output)
+        if calls.read_text() == "x":  # a retime lands while the first encode runs
+            src.write_bytes(b"RIFF new")
+            os.utime(src, ns=(src.stat().st_atime_ns, src.stat().st_mtime_ns + 10**9))
+        return result
+
+    monkeypatch.setattr(transcoder, "_run_ffmpeg", _retimed_mid_encode)
+    assert await transcoder.deliverable(source) == source.with_suffix(".opus")
+    assert source.with_suffix(".opus").read_bytes() == b"RIFF new"
+    assert calls.read_text() == "xx"
@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.agents.batch import COMPLETED, FAILED, BatchGenerator
+from backend.agents.host import HostAgent
+from backend.agents.orchestrator import PodcastOrchestrator
+from backend.models import Episode, NewsItem
+from backend.services.shared_research import SharedResearch, shared
+
+
+async def test_shared_research_runs_each_lookup_once_per_batch():
+    calls: list[str] = []
+
+    async def _lookup(query: str) -> str:
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        if query == "bad" and calls.count("bad") == 1:
+            raise RuntimeError("flaky")
+        return query.upper()
+
+    assert await shared(("q", "a"), lambda: _lookup("a")) == "A"
+    assert calls == ["a"]  # no batch active: not memoized
+
+    research = SharedResearch()
+    token = research.activate()
+    try:
+        results = await asyncio.gather(
+            *(shared(("q", "b"), lambda: _lookup("b")) for _ in range(3)))
+        assert results == ["B"] * 3
+        assert await shared(("q", "b"), lambda: _lookup("b")) == "B"
+        with pytest.raises(RuntimeError):
+            await shared(("q", "bad"), lambda: _lookup("bad"))
+        assert await shared(("q", "bad"), lambda: _lookup("bad")) == "BAD"
+    finally:
+        SharedResearch.deactivate(token)
+    assert calls == ["a", "b", "bad", "bad"]
+    assert research.stats() == {"hits": 3, "misses": 3}
+
+
+class _FakeOrchestrator:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.calls: list[dict] = []
+
+    async def plan_batch_topics(self, count, *, max_news_results=10):
+        news = [NewsItem(title=f"资讯{i}", url=f"https://n/{i}", content="")
+                for i in range(5)]
+        return news, [{"topic": f"话题{i}", "search_queries": [f"q{i}"]} for i in range(count)]
+
+    async def generate_episode(self, progress=None, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await progress("research", "正在深度搜索…")
+            await asyncio.sleep(0.02)
+            topic = kwargs["topic_choice"]["topic"] if kwargs["topic_choice"] else kwargs["topic"]
+            if topic == "坏话题":
+                raise RuntimeError("LLM down")
+            return Episode(topic=topic)
+        finally:
+            self.in_flight -= 1
+
+
+def test_preselected_topic_starts_at_research():
+    route = PodcastOrchestrator._route_start
+    assert route({"topic": {"topic": "话题", "search_queries": []},
+                  "preselected_topic": True}) == "deep_research"
+    assert route({"topic": {"topic": "话题", "search_queries": ["话题"]}}) == "fetch_news"
+    assert route({"topic": {}, "document_session_id": "s1"}) == "derive_doc_topic"
+
+    choice = {"topic": " 话题 ", "reason": "热点", "search_queries": []}
+    assert PodcastOrchestrator._preselected_topic(choice) == {
+        "topic": "话题", "reason": "热点", "search_queries": ["话题"]}
+
+
+async def test_batch_limits_concurrency_and_isolates_failures():
+    orchestrator = _FakeOrchestrator()
+    seen: list[tuple[int, str]] = []
+
+    async def _progress(item):
+        seen.append((item.index, item.status))
+
+    result = await BatchGenerator(orchestrator, max_concurrent_episodes=2).run(
+        topics=["话题A", " ", "坏话题", "话题C"], progress=_progress)
+
+    assert orchestrator.peak == 2
+    assert [e.status for e in result.episodes] == [COMPLETED, FAILED, COMPLETED]
+    assert result.episodes[1].error == "LLM down"
+    assert all(call["topic_choice"] is None and call["news_items"] is None
+               for call in orchestrator.calls)
+    assert (2, COMPLETED) in seen
+    summary = result.summary()
+    assert summary["completed"] == 2 and summary["failed"] == 1
+    assert summary["episodes_per_hour"] == pytest.approx(
+        2 * 3600 / result.elapsed_s, rel=0.01)
+
+
+async def test_batch_count_uses_one_news_fetch_for_host_picked_topics():
+    orchestrator = _FakeOrchestrator()
+    result = await BatchGenerator(orchestrator).run(count=3)
+
+    assert [e.topic for e in result.completed] == ["话题0", "话题1", "话题2"]
+    news = orchestrator.calls[0]["news_items"]
+    assert len(news) == 5
+    assert all(call["news_items"] is news and call["topic"] == ""
+               for call in orchestrator.calls)
+    with pytest.raises(ValueError):
+        await BatchGenerator(orchestrator).run(topics=[" "])
+
+
+class _SlateLLM:
+    model = "fake"
+
+    def __init__(self, reply: dict) -> None:
+        self.reply = reply
+
+    async def chat(self, messages, **kwargs) -> str:
+        return json.dumps(self.reply, ensure_ascii=False)
+
+
+async def test_select_topics_drops_repeats_and_tops_up_from_news():
+    news = [NewsItem(title=title, url=f"https://n/{i}", content="")
+            for i, title in enumerate(["芯片出口管制", "新能源车价格战", "低空经济", "银发经济"])]
+    host = HostAgent(_SlateLLM({"topics": [
+        {"index": 1, "topic": "芯片出口管制", "search_queries": ["a"]},
+        {"index": 2, "topic": "芯片出口管制", "search_queries": ["b"]},  # duplicate
+        {"index": 3, "topic": "往期话题", "search_queries": ["c"]},      # already aired
+    ]}))
+
+    picked = await host.select_topics(news, 3, recent_topics=["往期话题"])
+
+    assert [p["topic"] for p in picked] == ["芯片出口管制", "新能源车价格战", "低空经济"]
+    assert all(p["search_queries"] for p in picked)
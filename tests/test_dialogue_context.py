@@ -0,0 +1,78 @@
+import asyncio
+
+from backend.agents.context import DialogueContext, estimate_tokens, truncate_to_tokens
+
+
+class _SummaryLLM:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def chat(self, messages, **kwargs):
+        self.calls.append(messages[-1]["content"])
+        await asyncio.sleep(0)
+        return f"摘要{len(self.calls)}"
+
+
+def test_estimate_and_truncate_tokens():
+    assert estimate_tokens("各位好") == 3
+    assert estimate_tokens("hello world!") == 3
+    text = "芯片" * 50
+    assert estimate_tokens(truncate_to_tokens(text, 30)) == 30
+
+
+async def test_context_stays_within_budget_and_summarizes_older_turns():
+    llm = _SummaryLLM()
+    ctx = DialogueContext("简报" * 100, llm=llm, max_tokens=400, summary_chunk_turns=3)
+    for i in range(12):
+        ctx.append("嘉宾", f"第{i}句" + "观点" * 20)
+
+    messages = ctx.build()
+    assert ctx.prompt_tokens(messages) <= 400
+    assert messages[0]["content"] == "简报" * 100
+    assert messages[-1]["content"].startswith("[嘉宾]: 第11句")
+    await asyncio.sleep(0.01)
+    assert len(llm.calls) == 1
+    assert "第0句" in llm.calls[0]
+
+    messages = ctx.build()
+    assert messages[1] == {"role": "system", "content": "【前文摘要】\n摘要1"}
+    assert ctx.prompt_tokens(messages) <= 400
+    assert ctx.summarized_upto > 0
+    await ctx.aclose()
+
+
+def test_context_without_llm_uses_extractive_digest():
+    ctx = DialogueContext("简报", max_tokens=120, summary_chunk_turns=2)
+    for i in range(6):
+        ctx.append("主持人", f"第{i}个问题。" + "补充说明" * 10)
+    ctx.build()
+    messages = ctx.build()
+    assert messages[1]["content"].startswith("【前文摘要】\n[主持人]: 第0个问题。")
+
+
+async def test_agent_messages_start_with_shared_brief_then_persona():
+    from backend.agents.base import BaseAgent
+
+    class _RecordingLLM:
+        def __init__(self) -> None:
+            self.messages: list[list[dict]] = []
+
+        async def chat(self, messages, **kwargs):
+            self.messages.append(messages)
+            return "ok"
+
+    llm = _RecordingLLM()
+    host = BaseAgent("主持人", "persona-host", llm)
+    guest = BaseAgent("嘉宾", "persona-guest", llm)
+    ctx = DialogueContext("brief", max_tokens=1000)
+    ctx.append("主持人", "开场")
+    await host.think("指令一", conversation_history=ctx.build(), system_suffix="rules")
+    ctx.append("嘉宾", "回应")
+    await guest.think("指令二", conversation_history=ctx.build())
+
+    first, second = llm.messages
+    assert first[0] == second[0] == {"role": "system", "content": "brief"}
+    assert first[1] == {"role": "system", "content": "persona-host\n\nrules"}
+    assert second[1] == {"role": "system", "content": "persona-guest"}
+    assert first[2:-1] == second[2:3]
+    assert second[-1] == {"role": "user", "content": "指令二"}
@@ -0,0 +1,65 @@
+import json
+
+from backend.agents.host import HostAgent
+from backend.agents.personas import GUEST_PERSONAS, HOST_PERSONA
+
+
+class _ScriptedLLM:
+    def __init__(self, reply: str) -> None:
+        self.reply = reply
+        self.messages: list[dict[str, str]] = []
+
+    async def chat(self, messages, **kwargs):
+        self.messages = messages
+        return self.reply
+
+
+async def test_generate_segment_parses_lines_and_drops_unknown_speakers():
+    guest = GUEST_PERSONAS[0]
+    reply = json.dumps({"lines": [
+        {"speaker": HOST_PERSONA.name, "text": "先问个具体的。", "emotion": "curious"},
+        {"speaker": guest.name, "text": "我见过一个案例。", "ssml_text": "我见过<#0.3#>一个案例。"},
+        {"speaker": "路人", "text": "我来插一句。"},
+        {"speaker": guest.name, "text": ""},
+    ]}, ensure_ascii=False)
+    llm = _ScriptedLLM(f"```json\n{reply}\n```")
+    host = HostAgent(llm, persona=HOST_PERSONA)
+
+    lines = await host.generate_segment(
+        [{"role": "system", "content": "brief"}], "讨论要点", [HOST_PERSONA, guest])
+
+    assert [(line.speaker, line.voice_id) for line in lines] == [
+        (HOST_PERSONA.name, HOST_PERSONA.voice_id), (guest.name, guest.voice_id)]
+    assert lines[0].ssml_text == "先问个具体的。"
+    assert lines[1].ssml_text == "我见过<#0.3#>一个案例。"
+    # Brief first, then the persona cards with the static segment rules.
+    assert llm.messages[0]["content"] == "brief"
+    assert guest.speaking_style in llm.messages[1]["content"]
+    assert "【本段对话指令】讨论要点" in llm.messages[-1]["content"]
+
+
+async def test_generate_segment_returns_none_for_unusable_output():
+    guest = GUEST_PERSONAS[0]
+    host = HostAgent(_ScriptedLLM("这不是JSON"), persona=HOST_PERSONA)
+    assert await host.generate_segment([], "x", [HOST_PERSONA, guest]) is None
+
+    one_line = json.dumps({"lines": [{"speaker": guest.name, "text": "只有一句"}]},
+                          ensure_ascii=False)
+    host = HostAgent(_ScriptedLLM(one_line), persona=HOST_PERSONA)
+    assert await host.generate_segment([], "x", [HOST_PERSONA, guest]) is None
+
+
+async def test_segment_suffix_is_identical_across_talking_points():
+    cast = [HOST_PERSONA, *GUEST_PERSONAS[:3]]
+    llm = _ScriptedLLM("这不是JSON")
+    host = HostAgent(llm, persona=HOST_PERSONA)
+
+    prompts = []
+    for speakers in (cast[1:3], cast[2:4]):
+        await host.generate_segment([], "x", [HOST_PERSONA, *speakers], cast=cast)
+        prompts.append(llm.messages)
+
+    assert prompts[0][0] == prompts[1][0]  # system suffix: the whole cast
+    assert GUEST_PERSONAS[2].name in prompts[0][0]["content"]
+    assert f"【本段发言人】{HOST_PERSONA.name}、{cast[2].name}、{cast[3].name}" in (
+        prompts[1][-1]["content"])
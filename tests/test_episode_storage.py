@@ -0,0 +1,60 @@
+from backend.models import (
+    DialogueLine,
+    Episode,
+    EpisodeMeta,
+    NewsItem,
+    episode_body_paths,
+    episode_meta_paths,
+)
+
+
+def _episode() -> Episode:
+    return Episode(
+        title="芯片出口管制",
+        topic="芯片出口管制",
+        guests=["嘉宾甲"],
+        dialogue=[
+            DialogueLine(speaker="主持", text="欢迎收听。" * 20, ssml_text="欢迎<#0.3#>收听。",
+                         segment_audio_path="/tmp/seg/0000.wav"),
+            DialogueLine(speaker="嘉宾甲", text="谢谢邀请。", ssml_text="谢谢邀请。"),
+        ],
+        news_sources=[NewsItem(title="新闻", url="https://example.com", content="正文" * 500)],
+        article="文章" * 1000,
+        word_count=105,
+    )
+
+
+def test_summary_record_is_small_and_body_round_trips(tmp_path):
+    episode = _episode()
+    record_path = episode.save_json(tmp_path)
+
+    record = record_path.read_text(encoding="utf-8")
+    assert "dialogue" not in record and "正文" not in record
+    (body_path,) = [p for p in episode_body_paths(tmp_path, episode.id) if p.exists()]
+    assert body_path.name.endswith(".gz")
+    assert body_path.stat().st_size < len(episode.model_dump_json().encode()) / 4
+
+    meta = EpisodeMeta.load(record_path)
+    assert (meta.line_count, meta.segment_audio_paths) == (2, ["/tmp/seg/0000.wav", None])
+    assert Episode.load_json(record_path) == episode
+    assert episode_meta_paths(tmp_path) == [record_path]
+
+    episode.save_json(tmp_path, compress=False)
+    assert [p.name for p in episode_body_paths(tmp_path, episode.id) if p.exists()] == [
+        f"{episode.id}.body.json"]
+    assert episode_meta_paths(tmp_path) == [record_path]
+    assert Episode.load_json(record_path) == episode
+
+    body_path.with_name(f"{episode.id}.body.json").unlink()
+    assert EpisodeMeta.load(record_path).title == "芯片出口管制"
+
+
+def test_legacy_single_file_episodes_still_load(tmp_path):
+    episode = _episode()
+    legacy = tmp_path / f"{episode.id}.json"
+    legacy.write_text(episode.model_dump_json(indent=2), encoding="utf-8")
+
+    assert Episode.load_json(legacy) == episode
+    meta = EpisodeMeta.load(legacy)
+    assert meta.body_file is None
+    assert meta.segment_audio_paths == ["/tmp/seg/0000.wav", None]
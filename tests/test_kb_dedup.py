@@ -0,0 +1,174 @@
+import threading
+
+from backend.knowledge.chroma_kb import BACKGROUND_MATERIAL, ChromaKnowledgeBase
+from backend.knowledge.dedup import SimHashIndex, hamming_distance, simhash
+
+_STORY = (
+    "OpenAI周二发布新一代推理模型，在数学竞赛和代码基准上大幅领先上一代。"
+    "公司表示新模型将首先向付费用户开放，并计划在下月推出面向企业的API版本。"
+)
+_SYNDICATED = "【转载】" + _STORY.replace("周二", "本周二")
+_UNRELATED = "欧盟议会通过数字市场法修订案，要求大型平台开放第三方应用商店并接受年度审计。"
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.docs: dict[str, tuple[str, dict]] = {}
+
+    def count(self):
+        return len(self.docs)
+
+    def upsert(self, ids, documents, metadatas):
+        for doc_id, doc, md in zip(ids, documents, metadatas):
+            self.docs[doc_id] = (doc, md)
+
+    def update(self, ids, metadatas):
+        for doc_id, md in zip(ids, metadatas):
+            self.docs[doc_id] = (self.docs[doc_id][0], md)
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.docs.pop(doc_id, None)
+
+    def get(self, ids=None, include=None, limit=None, offset=None):
+        keys = [k for k in (ids if ids is not None else list(self.docs))
+                if k in self.docs]
+        start = offset or 0
+        keys = keys[start:start + limit] if limit else keys[start:]
+        return {
+            "ids": keys,
+            "documents": [self.docs[k][0] for k in keys],
+            "metadatas": [self.docs[k][1] for k in keys],
+        }
+
+
+def test_simhash_separates_syndicated_from_unrelated():
+    base = simhash(_STORY)
+
+    assert hamming_distance(base, simhash(_SYNDICATED)) <= 10
+    assert hamming_distance(base, simhash(_UNRELATED)) > 10
+
+
+def test_index_finds_near_duplicates_and_persists(tmp_path):
+    path = tmp_path / "sig.json"
+    index = SimHashIndex(path, max_distance=3)
+    index.add("a", 0b1011)
+    index.save()
+
+    reloaded = SimHashIndex(path, max_distance=3)
+
+    assert reloaded.loaded_from_disk
+    assert reloaded.find(0b1011 ^ 0b0110) == "a"
+    assert reloaded.find(0b1011 ^ 0b1111_0000) is None
+    reloaded.discard(["a"])
+    assert reloaded.find(0b1011) is None
+
+
+def _make_kb(coll: _FakeCollection, tmp_path) -> ChromaKnowledgeBase:
+    kb = ChromaKnowledgeBase.__new__(ChromaKnowledgeBase)
+    kb._collections = {BACKGROUND_MATERIAL: coll}
+    kb._persist_path = tmp_path
+    kb._near_duplicate_max_distance = 10
+    kb._dedup_indexes = {}
+    kb._dedup_lock = threading.Lock()
+    return kb
+
+
+async def test_store_many_merges_duplicate_sources(tmp_path):
+    coll = _FakeCollection()
+    kb = _make_kb(coll, tmp_path)
+
+    await kb.store_many(
+        [{"id": "first", "content": _STORY, "metadata": {"url": "https://a.example"}}],
+        dedup=True,
+    )
+    stored = await kb.store_many(
+        [{"id": "second", "content": _SYNDICATED, "metadata": {"url": "https://b.example"}}],
+        dedup=True,
+    )
+
+    assert stored == 0
+    assert set(coll.docs) == {"first"}
+    metadata = coll.docs["first"][1]
+    assert metadata["source_urls"].split("\n") == [
+        "https://a.example", "https://b.example"]
+    assert metadata["duplicate_count"] == 1
+
+
+async def test_purged_docs_do_not_swallow_later_ingests(tmp_path):
+    coll = _FakeCollection()
+    await _make_kb(coll, tmp_path).store_many(
+        [{"id": "first", "content": _STORY,
+          "metadata": {"url": "https://a.example", "type": "tavily_daily_news",
+                       "stored_at_ts": 0}}],
+        dedup=True,
+    )
+
+    # Restart: compaction purges before anything loads the SimHash index.
+    restarted = _make_kb(coll, tmp_path)
+    restarted.purge_expired(tavily_ttl_seconds=60, task_ttl_seconds=60)
+    assert coll.docs == {}
+    assert "first" not in SimHashIndex(tmp_path / f"simhash_{BACKGROUND_MATERIAL}.json")
+
+    stored = await _make_kb(coll, tmp_path).store_many(
+        [{"id": "second", "content": _SYNDICATED, "metadata": {"url": "https://b.example"}}],
+        dedup=True,
+    )
+    assert stored == 1
+    assert set(coll.docs) == {"second"}
+
+
+async def test_stale_signature_is_replaced_by_the_new_doc(tmp_path):
+    coll = _FakeCollection()
+    index = SimHashIndex(tmp_path / f"simhash_{BACKGROUND_MATERIAL}.json")
+    index.add("gone", simhash(_STORY))
+    index.save()
+
+    stored = await _make_kb(coll, tmp_path).store_many(
+        [{"id": "second", "content": _SYNDICATED, "metadata": {"url": "https://b.example"}},
+         {"id": "third", "content": _STORY, "metadata": {"url": "https://c.example"}}],
+        dedup=True,
+    )
+
+    assert stored == 1
+    assert set(coll.docs) == {"second"}
+    assert coll.docs["second"][1]["source_urls"].split("\n") == [
+        "https://b.example", "https://c.example"]
+    reloaded = SimHashIndex(tmp_path / f"simhash_{BACKGROUND_MATERIAL}.json")
+    assert "gone" not in reloaded and "second" in reloaded
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    index = SimHashIndex(tmp_path / "simhash.json")
+    for i in range(200):
+        index.add(f"doc{i}", i + 1)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: index.save(), range(32)))
+
+    assert len(SimHashIndex(tmp_path / "simhash.json")) == 200
+    assert [p.name for p in tmp_path.iterdir()] == ["simhash.json"]
+
+
+def test_index_is_loaded_once_across_threads(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    coll = _FakeCollection()
+    coll.docs["old"] = (_STORY, {"type": "tavily_daily_news"})
+    kb = _make_kb(coll, tmp_path)
+    backfills: list[str] = []
+    original = ChromaKnowledgeBase._backfill_signatures
+
+    def _slow_backfill(self, collection, index):
+        backfills.append(collection)
+        threading.Event().wait(0.05)
+        original(self, collection, index)
+
+    monkeypatch.setattr(ChromaKnowledgeBase, "_backfill_signatures", _slow_backfill)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        indexes = list(pool.map(
+            lambda _: kb._dedup_index(BACKGROUND_MATERIAL), range(4)))
+
+    assert backfills == [BACKGROUND_MATERIAL]
+    assert all(index is indexes[0] for index in indexes)
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from backend.knowledge.chroma_kb import (
+    BACKGROUND_MATERIAL,
+    EVICT_BY_SCORE,
+    KNOWLEDGE_SCOPE_TASK,
+    ChromaKnowledgeBase,
+)
+
+
+class _FakeCollection:
+    """Minimal in-memory stand-in for a ChromaDB collection."""
+
+    def __init__(self, docs: dict[str, tuple[str, dict]]):
+        self.docs = dict(docs)
+
+    def count(self) -> int:
+        return len(self.docs)
+
+    def get(self, ids=None, include=None, limit=None, offset=None):
+        keys = list(ids) if ids is not None else list(self.docs)
+        start = offset or 0
+        keys = keys[start:start + limit] if limit else keys[start:]
+        keys = [k for k in keys if k in self.docs]
+        return {
+            "ids": keys,
+            "documents": [self.docs[k][0] for k in keys],
+            "metadatas": [self.docs[k][1] for k in keys],
+        }
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.docs.pop(doc_id, None)
+
+
+def _make_kb(coll: _FakeCollection, tmp_path) -> ChromaKnowledgeBase:
+    kb = ChromaKnowledgeBase.__new__(ChromaKnowledgeBase)
+    kb._collections = {BACKGROUND_MATERIAL: coll}
+    kb._persist_path = tmp_path
+    kb._near_duplicate_max_distance = 10
+    kb._dedup_indexes = {}
+    kb._dedup_lock = threading.Lock()
+    return kb
+
+
+def test_purge_expired_applies_per_type_ttls(tmp_path):
+    now = time.time()
+    coll = _FakeCollection({
+        "old_news": ("n", {"type": "tavily_daily_news", "stored_at_ts": now - 10 * 86400}),
+        "new_news": ("n", {"type": "tavily_daily_news", "stored_at_ts": now - 60}),
+        "old_chunk": ("c", {"knowledge_scope": KNOWLEDGE_SCOPE_TASK, "stored_at_ts": now - 7200}),
+        "old_background": ("b", {"type": "background", "stored_at_ts": now - 999 * 86400}),
+        "legacy_news": ("n", {"type": "tavily_search_result", "stored_at": "2020-01-01T00:00:00"}),
+    })
+    kb = _make_kb(coll, tmp_path)
+
+    report = kb.purge_expired(
+        tavily_ttl_seconds=86400, task_ttl_seconds=3600, now=now)
+
+    assert report[BACKGROUND_MATERIAL]["docs"] == 3
+    assert set(coll.docs) == {"new_news", "old_background"}
+
+
+def test_enforce_caps_evicts_lowest_score_and_skips_task_scope(tmp_path):
+    coll = _FakeCollection({
+        "a": ("a", {"score": 0.9, "stored_at_ts": 1.0}),
+        "b": ("b", {"score": 0.1, "stored_at_ts": 2.0}),
+        "c": ("c", {"score": 0.5, "stored_at_ts": 3.0}),
+        "task": ("t", {"knowledge_scope": KNOWLEDGE_SCOPE_TASK, "stored_at_ts": 0.0}),
+    })
+    kb = _make_kb(coll, tmp_path)
+
+    report = kb.enforce_caps({BACKGROUND_MATERIAL: 2}, policy=EVICT_BY_SCORE)
+
+    assert report[BACKGROUND_MATERIAL]["docs"] == 2
+    assert set(coll.docs) == {"a", "task"}
@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import router
+from backend.config import settings
+from backend.services.live_playlist import LivePlaylist, live_dir_for_task, sweep_live_dirs
+from backend.services.telemetry import bind_task_id
+
+
+class _ChunkAudio:
+    def __init__(self, fail_on: bytes | None = None) -> None:
+        self.fail_on = fail_on
+
+    def render_chunk(self, audio_bytes, pause_after, output_path):
+        if audio_bytes == self.fail_on:
+            raise RuntimeError("ffmpeg missing")
+        output_path.write_bytes(audio_bytes)
+        return len(audio_bytes) + pause_after
+
+
+def _entries(playlist: LivePlaylist) -> list[str]:
+    lines = playlist.playlist_path.read_text(encoding="utf-8").splitlines()
+    return [line for line in lines if not line.startswith("#")]
+
+
+async def test_chunks_are_published_in_dialogue_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", tmp_path)
+    bind_task_id("task_live")
+    playlist = LivePlaylist("ep1", _ChunkAudio())
+    assert live_dir_for_task("task_live") == tmp_path / "live" / "ep1"
+
+    await playlist.add(1, b"bb", 0.5)
+    assert _entries(playlist) == []
+    await playlist.add(0, b"a", 0.3)
+    await playlist.add(2, b"", 0.3)  # empty audio is skipped like in stitching
+    await playlist.add(3, b"dddd", 0.3)
+    assert _entries(playlist) == ["0000.mp3", "0001.mp3", "0003.mp3"]
+    text = playlist.playlist_path.read_text(encoding="utf-8")
+    assert "#EXTINF:2.500," in text and "#EXT-X-PLAYLIST-TYPE:EVENT" in text
+    assert "#EXT-X-ENDLIST" not in text
+
+    playlist.close()
+    assert playlist.playlist_path.read_text(encoding="utf-8").endswith("#EXT-X-ENDLIST\n")
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    response = client.get("/api/tasks/task_live/live/index.m3u8")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.apple.mpegurl")
+    chunk = client.get("/api/tasks/task_live/live/0001.mp3")
+    assert chunk.content == b"bb"
+    assert chunk.headers["cache-control"] == "private, no-cache"
+    assert client.get("/api/tasks/task_live/live/0001.mp3",
+                      headers={"If-None-Match": chunk.headers["etag"]}).status_code == 304
+    assert client.get("/api/tasks/task_live/live/..%2Fsecret").status_code == 404
+    assert client.get("/api/tasks/unknown/live/index.m3u8").status_code == 404
+
+
+async def test_render_failure_ends_playlist_without_raising(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", tmp_path)
+    playlist = LivePlaylist("ep2", _ChunkAudio(fail_on=b"x"))
+    await playlist.add(0, b"ok", 0.3)
+    await playlist.add(1, b"x", 0.3)
+    await playlist.add(2, b"later", 0.3)
+    assert _entries(playlist) == ["0000.mp3"]
+    assert playlist.playlist_path.read_text(encoding="utf-8").endswith("#EXT-X-ENDLIST\n")
+
+
+async def test_closed_playlists_are_removed_after_retention(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", tmp_path)
+    monkeypatch.setattr(settings, "live_retention_s", 0.01)
+    bind_task_id("task_retained")
+    playlist = LivePlaylist("ep3", _ChunkAudio())
+    await playlist.add(0, b"a", 0.3)
+    playlist.close()
+    assert live_dir_for_task("task_retained") == playlist.directory
+
+    await asyncio.sleep(0.05)
+    assert live_dir_for_task("task_retained") is None
+    assert not playlist.directory.exists()
+
+    # Left behind by a previous process: swept when the next playlist opens.
+    stale = tmp_path / "live" / "old"
+    stale.mkdir(parents=True)
+    (stale / "index.m3u8").write_text("#EXTM3U\n", encoding="utf-8")
+    os.utime(stale / "index.m3u8", (0, 0))
+    os.utime(stale, (0, 0))
+    assert sweep_live_dirs() == 1 and not stale.exists()
+
+
+async def test_expiry_of_a_replaced_run_keeps_the_new_playlist(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", tmp_path)
+    first = LivePlaylist("ep4", _ChunkAudio())
+    second = LivePlaylist("ep4", _ChunkAudio())
+    first.expire()
+    assert second.playlist_path.exists()
+    second.expire()
+    assert not second.directory.exists()
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from backend.config import settings
+from backend.services.llm_service import (
+    TIER_FAST,
+    TIER_STRONG,
+    LLMEndpoint,
+    LLMScheduler,
+    LLMService,
+    tier_for,
+)
+from backend.services.structured_output import chat_json
+
+
+def _client(model: str, calls: list[str], *, status: int | None = None):
+    async def _create(**kwargs):
+        assert kwargs["model"] == model
+        calls.append(model)
+        if status is not None:
+            error = RuntimeError(f"HTTP {status}")
+            error.status_code = status
+            raise error
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"{model} 回复"))],
+            usage=None)
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+
+
+def _endpoint(model: str, calls: list[str], **kwargs) -> LLMEndpoint:
+    return LLMEndpoint(model, _client(model, calls, **kwargs), LLMScheduler(2, name=model))
+
+
+def _service(calls: list[str], *, strong_status=None, fast=None, fallback=None) -> LLMService:
+    service = LLMService(base_url="http://routing.test", api_key="x", model="strong",
+                         fast=fast, fallback=fallback)
+    service._client = _client("strong", calls, status=strong_status)
+    return service
+
+
+def test_call_sites_map_to_tiers_with_settings_overrides(monkeypatch):
+    assert tier_for("search_queries") == TIER_FAST
+    assert tier_for("fresh_search_decision") == TIER_FAST
+    assert tier_for("host_line") == TIER_STRONG
+    assert tier_for(None) == TIER_STRONG
+
+    monkeypatch.setattr(settings, "llm_call_tiers",
+                        {"episode_plan": "fast", "search_queries": "strong"})
+    assert tier_for("episode_plan") == TIER_FAST
+    assert tier_for("search_queries") == TIER_STRONG
+
+
+async def test_control_calls_use_the_fast_model_and_dialogue_the_strong_one():
+    calls: list[str] = []
+    service = _service(calls, fast=_endpoint("fast", calls))
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert await service.chat(messages, call_site="search_queries") == "fast 回复"
+    assert await service.chat(messages, call_site="dialogue_segment") == "strong 回复"
+    assert await service.chat(messages) == "strong 回复"
+    assert calls == ["fast", "strong", "strong"]
+
+
+async def test_failed_calls_fall_back_down_the_chain():
+    calls: list[str] = []
+    service = _service(calls, strong_status=503,
+                       fast=_endpoint("fast", calls, status=401),
+                       fallback=_endpoint("backup", calls))
+    messages = [{"role": "user", "content": "hi"}]
+
+    reply = await service.chat(messages, call_site="fresh_search_decision", retries=2)
+    assert reply == "backup 回复"
+    assert calls == ["fast", "strong", "strong", "backup"]
+
+    calls.clear()
+    service = _service(calls, strong_status=401)
+    with pytest.raises(RuntimeError, match="after 1 attempts"):
+        await service.chat(messages, call_site="host_line")
+    assert calls == ["strong"]
+
+
+class _Topic(BaseModel):
+    topic: str
+
+
+async def test_structured_calls_route_by_their_name():
+    seen: list[str | None] = []
+
+    class _RecordingLLM:
+        async def chat(self, messages, **kwargs):
+            seen.append(kwargs.get("call_site"))
+            return '{"topic": "话题"}'
+
+    llm = _RecordingLLM()
+    assert (await chat_json(llm, [], _Topic, name="document_topic")).topic == "话题"
+    await chat_json(llm, [], _Topic, name="guest_profile", call_site="translation")
+    assert seen == ["document_topic", "translation"]
+
+
+def test_primary_key_is_never_sent_to_another_provider(monkeypatch):
+    monkeypatch.setattr(settings, "llm_base_url", "https://primary.test/v1")
+    monkeypatch.setattr(settings, "llm_api_key", "primary-key")
+    monkeypatch.setattr(settings, "llm_fast_model", "fast")
+    monkeypatch.setattr(settings, "llm_fallback_model", "backup")
+    monkeypatch.setattr(settings, "llm_fallback_base_url", "https://other.test/v1")
+    monkeypatch.setattr(settings, "llm_fallback_api_key", "")
+
+    service = LLMService()
+    assert service._fast.client.api_key == "primary-key"  # same provider
+    assert service._fallback is None
+
+    monkeypatch.setattr(settings, "llm_fallback_api_key", "other-key")
+    assert LLMService()._fallback.client.api_key == "other-key"
@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.config import settings
+from backend.services.llm_service import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    LLMScheduler,
+    LLMService,
+    backoff_delay,
+    llm_priority,
+    retry_after_seconds,
+)
+
+
+async def test_scheduler_admits_waiters_by_priority_then_arrival():
+    scheduler = LLMScheduler(1, name="test")
+    admitted: list[str] = []
+    assert await scheduler.acquire() == 0.0
+
+    async def _call(name: str, priority: int) -> None:
+        await scheduler.acquire(priority)
+        admitted.append(name)
+        await asyncio.sleep(0)
+        scheduler.release()
+
+    tasks = []
+    for name, priority in (("batch", PRIORITY_BATCH), ("normal-1", PRIORITY_NORMAL),
+                           ("interactive", PRIORITY_INTERACTIVE),
+                           ("normal-2", PRIORITY_NORMAL)):
+        tasks.append(asyncio.create_task(_call(name, priority)))
+        await asyncio.sleep(0)
+    assert scheduler.queued == 4
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    assert admitted == ["interactive", "normal-1", "normal-2", "batch"]
+    assert scheduler.in_flight == 0
+
+
+async def test_cancelled_waiter_does_not_leak_its_slot():
+    scheduler = LLMScheduler(1, name="test")
+    await scheduler.acquire()
+    waiter = asyncio.create_task(scheduler.acquire())
+    await asyncio.sleep(0)
+
+    scheduler.release()  # hands the slot to the waiter...
+    waiter.cancel()      # ...which is cancelled before it resumes
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.in_flight == 0
+    assert await scheduler.acquire() == 0.0
+
+
+def test_backoff_honors_retry_after_headers(monkeypatch):
+    def _error(**headers):
+        return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+    assert retry_after_seconds(_error(**{"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(_error(**{"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(_error(**{"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after_seconds(RuntimeError("no response")) is None
+
+    monkeypatch.setattr(settings, "llm_backoff_base_s", 1.0)
+    monkeypatch.setattr(settings, "llm_backoff_max_s", 5.0)
+    assert 3.0 <= backoff_delay(1, _error(**{"retry-after": "3"})) <= 3.3
+    assert backoff_delay(1, _error(**{"retry-after": "600"})) == 5.0
+    assert all(0 <= backoff_delay(4) <= 5.0 for _ in range(50))
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int, retry_after: str = "") -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(
+            headers={"retry-after": retry_after} if retry_after else {})
+
+
+def _service(create) -> LLMService:
+    service = LLMService(base_url="http://scheduler.test", api_key="x", model="m")
+    service._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return service
+
+
+async def test_chat_backs_off_on_rate_limits_and_fails_fast_on_bad_requests():
+    calls: list[int] = []
+
+    async def _rate_limited_once(**kwargs):
+        calls.append(1)
+        assert service._scheduler.in_flight == 1  # one slot, not kept across backoff
+        if len(calls) == 1:
+            raise _StatusError(429, retry_after="0")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="好"))], usage=None)
+
+    service = _service(_rate_limited_once)
+    with llm_priority(PRIORITY_INTERACTIVE):
+        assert await service.chat([{"role": "user", "content": "hi"}]) == "好"
+    assert len(calls) == 2
+    assert service._scheduler.in_flight == 0
+
+    async def _bad_request(**kwargs):
+        calls.append(1)
+        raise _StatusError(400)
+
+    calls.clear()
+    service = _service(_bad_request)
+    with pytest.raises(RuntimeError, match="after 1 attempts"):
+        await service.chat([{"role": "user", "content": "hi"}])
+    assert len(calls) == 1
+    assert service._scheduler.in_flight == 0
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import time
+
+from backend.services.loop_watchdog import LoopWatchdog
+from backend.services.telemetry import SPAN_NODE, bind_task_id, span
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def test_watchdog_reports_blocking_stack_with_task_and_node(tmp_path):
+    watchdog = LoopWatchdog(threshold_s=0.05, interval_s=0.01, report_dir=tmp_path)
+    watchdog.start()
+    try:
+        async def _job():
+            bind_task_id("task_7")
+            async with span(SPAN_NODE, "plan_episode"):
+                await asyncio.sleep(0.02)
+                _block_the_loop(0.3)
+
+        await asyncio.create_task(_job())
+        await asyncio.sleep(0.1)
+    finally:
+        watchdog.stop()
+
+    (report_file,) = tmp_path.glob("loop-stalls-*.jsonl")
+    records = [json.loads(line) for line in report_file.read_text().splitlines()]
+    assert watchdog.stall_count == len(records) == 1
+    record = records[0]
+    assert record["blocked_ms"] >= 250
+    assert record["task_id"] == "task_7"
+    assert record["node"] == "plan_episode"
+    assert any("_block_the_loop" in frame for frame in record["stack"])
+
+
+async def test_watchdog_ignores_short_pauses(tmp_path):
+    watchdog = LoopWatchdog(threshold_s=0.2, interval_s=0.01, report_dir=tmp_path)
+    watchdog.start()
+    try:
+        _block_the_loop(0.02)
+        await asyncio.sleep(0.1)
+    finally:
+        watchdog.stop()
+    assert watchdog.stall_count == 0
+    assert not list(tmp_path.glob("*.jsonl"))
@@ -0,0 +1,34 @@
+from backend.services import metrics
+from backend.services.telemetry import SPAN_TTS, mark_queue_wait, span
+
+
+def test_registry_renders_prometheus_text():
+    registry = metrics.MetricsRegistry()
+    requests = registry.counter("t_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("t_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = registry.render()
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{route="/a"} 3' in text
+    assert 't_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 't_latency_seconds_bucket{le="1"} 2' in text
+    assert 't_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "t_latency_seconds_count 2" in text
+    assert text.endswith("\n")
+
+
+async def test_leaf_spans_feed_external_call_metrics_without_a_run():
+    before = metrics.external_call_duration.count(service=SPAN_TTS, status="ok")
+    waited = metrics.external_queue_wait.value(service=SPAN_TTS)
+
+    mark_queue_wait(0.5)
+    async with span(SPAN_TTS, "voice"):
+        assert metrics.external_calls_inflight.value(service=SPAN_TTS) >= 1
+
+    assert metrics.external_call_duration.count(service=SPAN_TTS, status="ok") == before + 1
+    assert metrics.external_queue_wait.value(service=SPAN_TTS) == waited + 0.5
+    assert metrics.external_calls_inflight.value(service=SPAN_TTS) == 0
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from backend.agents import orchestrator as orchestrator_module
+from backend.agents.base import BaseAgent, activate_agent_run, deactivate_agent_run
+from backend.agents.personas import GUEST_PERSONAS, HOST_PERSONA
+
+
+class _EchoLLM:
+    async def chat(self, messages, **kwargs):
+        await asyncio.sleep(0)
+        return f"reply to {messages[-1]['content']}"
+
+
+async def test_agent_history_is_private_to_each_run():
+    agent = BaseAgent("host", "system", _EchoLLM())
+
+    async def _run(name: str) -> list[dict[str, str]]:
+        token = activate_agent_run()
+        try:
+            await agent.think(f"{name}-1")
+            await agent.think(f"{name}-2")
+            return list(agent.conversation_history)
+        finally:
+            deactivate_agent_run(token)
+
+    first, second = await asyncio.gather(_run("a"), _run("b"))
+    assert [m["content"] for m in first if m["role"] == "user"] == ["a-1", "a-2"]
+    assert [m["content"] for m in second if m["role"] == "user"] == ["b-1", "b-2"]
+    assert agent.conversation_history == []
+
+
+def test_get_orchestrator_rebuilds_only_when_personas_change(monkeypatch):
+    built: list[tuple] = []
+
+    class _Orchestrator:
+        def __init__(self, *, guest_personas, host_persona):
+            built.append((host_persona.name, [g.name for g in guest_personas]))
+
+    host = HOST_PERSONA.model_copy(deep=True)
+    guests = [p.model_copy(deep=True) for p in GUEST_PERSONAS]
+    monkeypatch.setattr(orchestrator_module, "PodcastOrchestrator", _Orchestrator)
+    monkeypatch.setattr(orchestrator_module, "_orchestrator", None)
+    monkeypatch.setattr(orchestrator_module, "get_host_service",
+                        lambda: SimpleNamespace(get_host=lambda: host))
+    monkeypatch.setattr(
+        orchestrator_module, "get_guest_pool_service",
+        lambda: SimpleNamespace(list_guests=lambda: [g.model_copy() for g in guests]))
+
+    first = orchestrator_module.get_orchestrator()
+    assert orchestrator_module.get_orchestrator() is first
+    assert len(built) == 1
+
+    guests[0].stance_bias = "完全相反的立场"
+    assert orchestrator_module.get_orchestrator() is not first
+    host.name = "新主持人"
+    orchestrator_module.get_orchestrator()
+    orchestrator_module.get_orchestrator(guests[:1])
+    assert [entry[0] for entry in built] == [
+        HOST_PERSONA.name, HOST_PERSONA.name, "新主持人", "新主持人"]
+    assert built[-1][1] == [guests[0].name]
@@ -0,0 +1,75 @@
+import json
+import threading
+from pathlib import Path
+
+from backend.agents.personas import GUEST_PERSONAS, HOST_PERSONA
+from backend.services.guest_pool_service import GuestPoolService
+from backend.services.host_service import HostService
+
+
+def _count_reads(monkeypatch) -> list[Path]:
+    reads: list[Path] = []
+    original = Path.read_text
+
+    def _read_text(self, *args, **kwargs):
+        reads.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", _read_text)
+    return reads
+
+
+def test_guest_pool_is_served_from_memory_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "guest_pool.json"
+    service = GuestPoolService(path)
+    defaults = service.list_guests()
+    assert [g.name for g in defaults] == [g.name for g in GUEST_PERSONAS]
+
+    reads = _count_reads(monkeypatch)
+    for _ in range(5):
+        service.list_guests()
+    assert service.get_guest(GUEST_PERSONAS[0].name).name == GUEST_PERSONAS[0].name
+    assert reads == []
+
+    edited = json.loads(path.read_text(encoding="utf-8"))[:1]
+    edited[0]["occupation"] = "手工编辑"
+    path.write_text(json.dumps(edited, ensure_ascii=False), encoding="utf-8")
+    reads.clear()
+    (guest,) = service.list_guests()
+    assert guest.occupation == "手工编辑"
+    assert reads == [path]
+
+
+def test_concurrent_guest_edits_are_not_lost(tmp_path):
+    path = tmp_path / "guest_pool.json"
+    service = GuestPoolService(path)
+    template = GUEST_PERSONAS[0]
+
+    def _add(index: int) -> None:
+        service.add_guest(template.model_copy(update={"name": f"嘉宾{index}"}))
+
+    threads = [threading.Thread(target=_add, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    on_disk = {item["name"] for item in json.loads(path.read_text(encoding="utf-8"))}
+    assert {f"嘉宾{i}" for i in range(16)} <= on_disk
+    assert [p.name for p in tmp_path.iterdir()] == ["guest_pool.json"]
+
+    fresh = GuestPoolService(path)
+    assert len(fresh.delete_guest("嘉宾3")) == len(on_disk) - 1
+    assert service.get_guest("嘉宾3") is None
+
+
+def test_host_reloads_after_external_save(tmp_path):
+    path = tmp_path / "host.json"
+    service = HostService(path)
+    assert service.get_host().name == HOST_PERSONA.name
+
+    HostService(path).save_host(HOST_PERSONA.model_copy(update={"name": "新主持"}))
+    assert service.get_host().name == "新主持"
+
+    path.write_text("{not json", encoding="utf-8")
+    assert service.get_host().name == HOST_PERSONA.name
@@ -0,0 +1,27 @@
+from backend.models import NewsItem
+from backend.services.relevance import TopicMatcher, normalize_text
+
+
+def _item(title: str, content: str = "", score: float = 0.5) -> NewsItem:
+    return NewsItem(title=title, url=f"https://example.com/{title}",
+                    content=content, published_date=None, score=score)
+
+
+def test_normalize_text_matches_regex_whitespace_semantics():
+    assert normalize_text(" Trump\u3000关税\n\tWAR ") == "trump关税war"
+    assert normalize_text(None) == ""
+
+
+def test_topic_matcher_scores_items_in_one_pass():
+    topic = "特朗普 关税"
+    matcher = TopicMatcher(topic, [topic, "特朗普", "关税"])
+
+    full, partial, unrelated = matcher.score_items([
+        _item("特朗普 关税 新政", "细节"),
+        _item("白宫声明", "提到特朗普"),
+        _item("冬奥会赛程更新", "短道速滑"),
+    ])
+
+    assert (full.relevant, full.match_count) == (True, 3)
+    assert (partial.relevant, partial.match_count) == (False, 1)
+    assert (unrelated.relevant, unrelated.match_count) == (False, 0)
@@ -0,0 +1,51 @@
+import gzip
+import json
+
+from backend.services.run_logger import EpisodeRunLogger
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_events_are_buffered_until_flush(tmp_path):
+    log = EpisodeRunLogger(tmp_path / "ep.jsonl", buffer_events=1000)
+    log.event("dialogue", "line 1")
+    log.event("dialogue", "line 2", payload={"speaker": "主持人"})
+    assert not log.log_path.exists()
+
+    log.flush()
+    events = _read(log.log_path)
+    assert [e["seq"] for e in events] == [1, 2]
+    assert events[1]["payload"] == {"speaker": "主持人"}
+    log.close()
+
+
+def test_error_events_and_close_flush_immediately(tmp_path):
+    log = EpisodeRunLogger(tmp_path / "ep.jsonl", buffer_events=1000)
+    log.event("tts", "segment")
+    try:
+        raise ValueError("boom")
+    except ValueError as exc:
+        log.exception("pipeline", exc)
+    assert [e["status"] for e in _read(log.log_path)] == ["info", "error"]
+
+    log.event("pipeline", "done")
+    log.close()
+    assert len(_read(log.log_path)) == 3
+
+
+def test_close_compresses_and_appends_to_existing_archive(tmp_path):
+    path = tmp_path / "ep.jsonl"
+    first = EpisodeRunLogger(path, compress_on_close=True)
+    first.event("pipeline", "generated")
+    first.close()
+    second = EpisodeRunLogger(path, compress_on_close=True)
+    second.event("audio", "retimed")
+    second.close()
+
+    assert not path.exists()
+    assert second.final_path == tmp_path / "ep.jsonl.gz"
+    with gzip.open(second.final_path, "rt", encoding="utf-8") as f:
+        messages = [json.loads(line)["message"] for line in f]
+    assert messages == ["generated", "retimed"]
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import knowledge
+from backend.agents import orchestrator as orchestrator_module
+from backend.agents.orchestrator import PodcastOrchestrator
+from backend.api.routes import router
+from backend.agents.personas import GUEST_PERSONAS, HOST_PERSONA
+from backend.config import settings
+from backend.knowledge.chroma_kb import ChromaKnowledgeBase
+from backend.services.structured_output import StructuredOutputError
+from benchmarks.fakes import FakeLLM, FakeNews, FakeTTS, HashingEmbeddingFunction
+
+
+async def test_preview_script_stops_before_article_and_audio(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "output_dir", tmp_path / "episodes")
+    monkeypatch.setattr(knowledge, "_kb_instance", ChromaKnowledgeBase(
+        persist_dir=tmp_path / "chromadb",
+        embedding_function=HashingEmbeddingFunction(),
+    ))
+    tts = FakeTTS(latency_s=0)
+    orchestrator = PodcastOrchestrator(
+        llm=FakeLLM(first_token_s=0), news=FakeNews(latency_s=0), tts=tts,
+        guest_personas=GUEST_PERSONAS[:2], host_persona=HOST_PERSONA)
+    stages: list[str] = []
+
+    async def _progress(stage: str, detail: str) -> None:
+        stages.append(stage)
+
+    state = await orchestrator.preview_script(
+        _progress,
+        selected_guest_names=[GUEST_PERSONAS[0].name],
+        max_news_results=3,
+        max_search_queries=2,
+    )
+
+    episode = state["episode"]
+    assert episode.dialogue and episode.word_count > 0
+    assert episode.guests == [GUEST_PERSONAS[0].name]
+    assert 0 < len(state["search_queries"]) <= 2
+    assert len(episode.news_sources) <= 3
+    assert not episode.article and not episode.audio_path
+    assert "dialogue" in stages
+    assert "article" not in stages and "audio" not in stages
+    assert episode.generation_log_path.endswith(".debug.jsonl")
+    assert not (tmp_path / "episodes" / f"{episode.id}.json").exists()
+
+
+def test_only_invalid_requests_are_client_errors(monkeypatch):
+    async def _preview_script(*args, **kwargs):
+        raise StructuredOutputError("plan reply was not JSON")
+
+    fake = SimpleNamespace(_guest_pool={GUEST_PERSONAS[0].name: GUEST_PERSONAS[0]},
+                           preview_script=_preview_script)
+    monkeypatch.setattr(orchestrator_module, "get_orchestrator", lambda: fake)
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app, raise_server_exceptions=False)
+
+    unknown = client.post("/api/debug/script", json={"selected_guests": ["路人甲"]})
+    assert unknown.status_code == 400
+    assert "路人甲" in unknown.json()["detail"]
+
+    failed = client.post("/api/debug/script",
+                         json={"selected_guests": [GUEST_PERSONAS[0].name]})
+    assert failed.status_code == 500
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from backend.services import search_cache
+from backend.services.search_cache import SearchCache, cache_key, ttl_for
+
+_TTLS = {"week": 60, "news": 30, "general": 120}
+
+
+class _CountingFetch:
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"results": [{"title": f"call-{self.calls}"}]}
+
+
+def test_cache_key_normalizes_query_and_ttl_follows_time_range():
+    assert cache_key({"query": " AI  芯片 ", "topic": "news"}) == \
+        cache_key({"topic": "news", "query": "ai 芯片"})
+    assert ttl_for({"query": "q", "time_range": "week", "topic": "news"}, _TTLS) == 60
+    assert ttl_for({"query": "q", "topic": "news"}, _TTLS) == 30
+    assert ttl_for({"query": "q"}, _TTLS) == 120
+
+
+async def test_concurrent_identical_queries_share_one_call(tmp_path):
+    cache = SearchCache(tmp_path / "c.sqlite3", stale_seconds=0, ttls=_TTLS)
+    fetch = _CountingFetch(delay=0.05)
+    params = {"query": "q", "topic": "news"}
+
+    results = await asyncio.gather(
+        *[cache.get_or_fetch(params, fetch) for _ in range(5)])
+    again = await cache.get_or_fetch(params, fetch)
+
+    assert fetch.calls == 1
+    assert all(r == results[0] for r in results) and again == results[0]
+    assert cache.get_stats()["coalesced"] == 4
+    assert cache.get_stats()["hits"] == 1
+
+
+async def test_stale_entry_is_served_while_refreshing(tmp_path, monkeypatch):
+    path = tmp_path / "c.sqlite3"
+    params = {"query": "q", "topic": "news"}
+    fetch = _CountingFetch()
+    await SearchCache(path, ttls=_TTLS).get_or_fetch(params, fetch)
+
+    cache = SearchCache(path, stale_seconds=3600, ttls=_TTLS)
+    later = time.time() + 31
+    monkeypatch.setattr(search_cache.time, "time", lambda: later)
+    stale = await cache.get_or_fetch(params, fetch)
+    await asyncio.sleep(0.01)
+    refreshed = await cache.get_or_fetch(params, fetch)
+
+    assert stale["results"][0]["title"] == "call-1"
+    assert refreshed["results"][0]["title"] == "call-2"
+    assert cache.get_stats()["refreshes"] == 1
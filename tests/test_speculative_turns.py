@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from backend.agents.orchestrator import PodcastOrchestrator
+from backend.models import DialogueLine
+
+
+def test_turns_conflict_flags_repeated_drafts_only():
+    followup = "你们真正的分歧其实在定价权，下面我们看看芯片管制到底让谁买单。"
+    repeat = "你们真正的分歧其实在定价权<#0.3#>，我们看看芯片管制到底让谁买单？"
+    fresh = "说个具体场景：你下个月换手机，发现同款贵了三百块，这钱流向了哪里？"
+    assert PodcastOrchestrator._turns_conflict(repeat, [followup])
+    assert not PodcastOrchestrator._turns_conflict(fresh, [followup])
+    assert not PodcastOrchestrator._turns_conflict(fresh, [])
+
+
+async def test_generate_concurrently_runs_together_and_cancels_on_failure():
+    started: list[str] = []
+
+    async def _line(name: str, delay: float, fail: bool = False) -> DialogueLine:
+        started.append(name)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(name)
+        return DialogueLine(speaker=name, text=name, ssml_text=name)
+
+    lines = await PodcastOrchestrator._generate_concurrently(
+        [_line("a", 0.05), _line("b", 0.01)])
+    assert [line.speaker for line in lines] == ["a", "b"]
+
+    slow = asyncio.ensure_future(_line("slow", 10))
+    with pytest.raises(RuntimeError):
+        await PodcastOrchestrator._generate_concurrently([slow, _line("bad", 0, fail=True)])
+    await asyncio.sleep(0)
+    assert slow.cancelled()
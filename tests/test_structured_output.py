@@ -0,0 +1,88 @@
+import pytest
+
+from backend.config import settings
+from backend.models import FreshSearchDecision, LineDraft
+from backend.services.structured_output import (
+    StructuredOutputError,
+    chat_json,
+    extract_json,
+    parse_structured,
+    structured_outputs,
+)
+
+
+@pytest.mark.parametrize("raw, expected, repaired", [
+    ('{"a": 1}', {"a": 1}, False),
+    ('```json\n{"a": [1, 2]}\n```', {"a": [1, 2]}, False),
+    ('好的，结果如下：\n{"a": "x"}\n希望有帮助。', {"a": "x"}, True),
+    ('{"a": [1, 2,], "b": True, "c": None,}', {"a": [1, 2], "b": True, "c": None}, True),
+    ('{"text": "第一行\n第二行"}', {"text": "第一行\n第二行"}, True),
+    ('{"lines": [{"speaker": "甲", "text": "说完了"}, {"speaker": "乙", "text": "说到一半',
+     {"lines": [{"speaker": "甲", "text": "说完了"}, {"speaker": "乙", "text": "说到一半"}]}, True),
+    ('{"a": "x", "b', {"a": "x"}, True),
+    ('["q1", "q2"]', ["q1", "q2"], False),
+])
+def test_extract_json_repairs_near_json(raw, expected, repaired):
+    assert extract_json(raw) == (expected, repaired)
+
+
+def test_extract_json_rejects_prose():
+    with pytest.raises(StructuredOutputError):
+        extract_json("抱歉，我无法回答。")
+
+
+def test_parse_structured_validates_and_counts_outcomes():
+    before = {outcome: structured_outputs.value(schema="t", outcome=outcome)
+              for outcome in ("ok", "repaired", "invalid", "unparseable")}
+
+    draft = parse_structured('{"text": "你好", "emotion": "happy"}', LineDraft, name="t")
+    assert (draft.text, draft.ssml_text, draft.emotion) == ("你好", "", "happy")
+    decision = parse_structured(
+        '```\n{"need_fresh_search": "true", "focus": "x",}\n```',
+        FreshSearchDecision, name="t")
+    assert decision.need_fresh_search is True
+    with pytest.raises(StructuredOutputError):
+        parse_structured('{"emotion": "happy"}', LineDraft, name="t")
+    with pytest.raises(StructuredOutputError):
+        parse_structured("不是JSON", LineDraft, name="t")
+
+    for outcome in ("ok", "repaired", "invalid", "unparseable"):
+        assert structured_outputs.value(schema="t", outcome=outcome) == before[outcome] + 1
+
+
+async def test_chat_json_requests_json_mode_for_objects_only(monkeypatch):
+    seen: list[dict | None] = []
+
+    class _LLM:
+        async def chat(self, messages, **kwargs):
+            seen.append(kwargs.get("response_format"))
+            return '["a", "b"]' if len(seen) > 1 else '{"need_fresh_search": false}'
+
+    monkeypatch.setattr(settings, "llm_json_mode", True)
+    await chat_json(_LLM(), [], FreshSearchDecision, name="t")
+    assert await chat_json(_LLM(), [], list[str], name="t", json_object=False) == ["a", "b"]
+    assert seen == [{"type": "json_object"}, None]
+
+
+async def test_host_fallbacks_cover_bad_replies_not_llm_failures():
+    from backend.agents.host import HostAgent
+
+    class _LLM:
+        def __init__(self, reply):
+            self.reply = reply
+
+        async def chat(self, messages, **kwargs):
+            if isinstance(self.reply, Exception):
+                raise self.reply
+            return self.reply
+
+    host = HostAgent(_LLM("不是JSON"))
+    decision = await host.decide_need_fresh_search("芯片", [])
+    assert decision["need_fresh_search"] is True
+    assert (await host.plan_episode({"topic": "芯片"}, [], ["甲"])).topic == "芯片"
+
+    host = HostAgent(_LLM(RuntimeError("LLM request failed after 3 attempts")))
+    with pytest.raises(RuntimeError):
+        await host.decide_need_fresh_search("芯片", [])
+    with pytest.raises(RuntimeError):
+        await host.plan_episode({"topic": "芯片"}, [], ["甲"])
@@ -0,0 +1,126 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.config import settings
+from backend.services.llm_service import LLMService, cached_prompt_tokens
+from backend.services.telemetry import (
+    SPAN_LLM,
+    SPAN_NODE,
+    SPAN_TTS,
+    RunTelemetry,
+    current_run,
+    mark_queue_wait,
+    span,
+    traced_node,
+)
+
+
+class _RecordingLogger:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, dict]] = []
+
+    def event(self, stage, detail, *, status="info", payload=None):
+        self.events.append((stage, status, payload or {}))
+
+
+async def test_spans_are_attributed_to_enclosing_node():
+    log = _RecordingLogger()
+    telemetry = RunTelemetry(log)
+    token = telemetry.activate()
+    try:
+        async def _node(state):
+            async with span(SPAN_LLM, "model", prompt_tokens=100) as record:
+                record.set(completion_tokens=50)
+
+            async def _tts():
+                mark_queue_wait(0.25)
+                async with span(SPAN_TTS, "voice", chars=20, bytes_out=1000):
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(_tts(), _tts())
+            return state
+
+        await traced_node("plan_episode", _node)({})
+        async with span(SPAN_LLM, "model", prompt_tokens=1):
+            pass
+    finally:
+        RunTelemetry.deactivate(token)
+
+    summary = telemetry.summary()
+    plan = summary["nodes"]["plan_episode"]
+    assert plan["llm_calls"] == 1
+    assert plan["prompt_tokens"] == 100
+    assert plan["completion_tokens"] == 50
+    assert plan["tts_calls"] == 2
+    assert plan["tts_chars"] == 40
+    assert plan["queue_wait_s"] == pytest.approx(0.5)
+    assert plan["wall_s"] > 0
+    assert summary["nodes"]["(other)"]["prompt_tokens"] == 1
+    assert summary["totals"]["prompt_tokens"] == 101
+    assert summary["totals"]["prompt_cache_hit_ratio"] == 0
+    assert summary["totals"]["cost"] == pytest.approx(
+        101 / 1000 * settings.llm_price_per_1k_prompt_tokens
+        + 50 / 1000 * settings.llm_price_per_1k_completion_tokens
+        + 40 / 1000 * settings.tts_price_per_1k_chars, abs=1e-6)
+    assert all(stage == "telemetry" for stage, _, _ in log.events)
+    assert len(log.events) == 5
+
+
+async def test_span_records_errors_and_is_noop_without_run():
+    assert current_run() is None
+    async with span(SPAN_LLM, "model"):
+        pass
+
+    telemetry = RunTelemetry()
+    token = telemetry.activate()
+    try:
+        with pytest.raises(ValueError):
+            async with span(SPAN_NODE, "fetch_news"):
+                raise ValueError("boom")
+    finally:
+        RunTelemetry.deactivate(token)
+
+    assert telemetry.spans[0].status == "error"
+    assert "boom" in telemetry.spans[0].error
+
+
+async def test_llm_chat_records_usage_and_retries():
+    calls = {"n": 0}
+
+    async def _create(**kwargs):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("rate limited")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=" 你好 "))],
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=3,
+                                  prompt_cache_hit_tokens=8),
+        )
+
+    service = LLMService(base_url="http://localhost", api_key="x", model="m")
+    service._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+
+    telemetry = RunTelemetry()
+    token = telemetry.activate()
+    try:
+        assert await service.chat([{"role": "user", "content": "hi"}]) == "你好"
+    finally:
+        RunTelemetry.deactivate(token)
+
+    (record,) = telemetry.spans
+    assert (record.kind, record.name) == (SPAN_LLM, "m")
+    assert record.prompt_tokens == 12
+    assert record.cached_prompt_tokens == 8
+    assert record.completion_tokens == 3
+    assert record.retries == 1
+    assert record.bytes_in == 2
+
+
+def test_cached_prompt_tokens_from_openai_style_usage():
+    usage = SimpleNamespace(
+        prompt_tokens=100, prompt_tokens_details=SimpleNamespace(cached_tokens=64))
+    assert cached_prompt_tokens(usage) == 64
+    assert cached_prompt_tokens(None) == 0
@@ -0,0 +1,77 @@
+from backend.agents.host import HostAgent
+from backend.knowledge.topic_index import TopicIndex
+from backend.models import Episode
+
+
+class _FakeTopicCollection:
+    """Cosine distance over character bigrams stands in for embeddings."""
+
+    def __init__(self):
+        self.rows: dict[str, tuple[str, dict]] = {}
+
+    @staticmethod
+    def _distance(left: str, right: str) -> float:
+        a = {left[i:i + 2] for i in range(len(left) - 1)}
+        b = {right[i:i + 2] for i in range(len(right) - 1)}
+        if not a or not b:
+            return 1.0
+        return 1 - len(a & b) / (len(a) * len(b)) ** 0.5
+
+    def count(self):
+        return len(self.rows)
+
+    def upsert(self, ids, documents, metadatas):
+        for doc_id, doc, md in zip(ids, documents, metadatas):
+            self.rows[doc_id] = (doc, md)
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.rows.pop(doc_id, None)
+
+    def get(self, include=None):
+        return {"ids": list(self.rows),
+                "metadatas": [md for _, md in self.rows.values()]}
+
+    def query(self, query_texts, n_results, include=None):
+        metadatas, distances = [], []
+        for text in query_texts:
+            ranked = sorted(
+                ((self._distance(text, doc), md) for doc, md in self.rows.values()),
+                key=lambda pair: pair[0],
+            )[:n_results]
+            distances.append([d for d, _ in ranked])
+            metadatas.append([md for _, md in ranked])
+        return {"metadatas": metadatas, "distances": distances}
+
+
+class _BrokenIndex:
+    def find_repeats(self, texts, exclude_episode_id=None):
+        raise RuntimeError("chroma unavailable")
+
+
+def test_topic_index_backfills_and_matches_within_threshold(tmp_path):
+    Episode(id="old1", topic="英伟达芯片出口管制再升级",
+            summary="讨论美国对华芯片出口限制").save_json(tmp_path)
+    index = TopicIndex(_FakeTopicCollection(), max_distance=0.5)
+
+    assert index.backfill(tmp_path) == 1
+    assert index.backfill(tmp_path) == 0
+
+    repeat, fresh = index.find_repeats(["英伟达芯片出口管制升级", "欧洲杯决赛前瞻"])
+    assert repeat is not None and repeat.episode_id == "old1"
+    assert fresh is None
+    assert index.find_repeats(
+        ["英伟达芯片出口管制升级"], exclude_episode_id="old1") == [None]
+
+    index.remove("old1")
+    assert index.nearest("英伟达芯片出口管制升级") is None
+
+
+async def test_host_flags_paraphrase_via_index_and_degrades_on_failure():
+    index = TopicIndex(_FakeTopicCollection(), max_distance=0.5)
+    index.add("old1", "英伟达芯片出口管制再升级")
+    candidates = ["英伟达芯片出口管制升级", "欧洲杯决赛前瞻"]
+
+    assert await HostAgent._find_repetitive(candidates, [], index) == [True, False]
+    assert await HostAgent._find_repetitive(
+        candidates, ["欧洲杯决赛前瞻"], _BrokenIndex()) == [False, True]
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from backend.services.warmup import FAILED, READY, WarmUp
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+async def test_warmup_reports_ready_only_after_every_step():
+    calls: list[str] = []
+
+    def _ok():
+        calls.append("ok")
+
+    def _broken():
+        raise RuntimeError("chroma unavailable")
+
+    warmup = WarmUp((("imports", _ok), ("knowledge_base", _broken), ("agents", _ok)))
+    assert not warmup.ready
+    assert not await warmup.run_once()
+
+    assert calls == ["ok", "ok"]
+    assert not warmup.ready
+    snapshot = warmup.snapshot()
+    assert snapshot["components"]["imports"]["status"] == READY
+    assert snapshot["components"]["knowledge_base"] == {
+        "status": FAILED, "error": "chroma unavailable"}
+
+    healthy = WarmUp((("imports", _ok),))
+    await healthy.run()
+    assert healthy.ready
+
+
+def test_api_import_does_not_load_heavy_dependencies(tmp_path):
+    script = (
+        "import sys, backend.api.routes\n"
+        "heavy = ('chromadb', 'langgraph', 'openai', 'tavily', 'pydub')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True,
+        env={"PYTHONPATH": str(ROOT), "PATH": ""}, check=True)
+    assert result.stdout.strip() == ""
+
+
+async def test_warmup_retries_failed_steps_until_ready():
+    attempts: list[int] = []
+
+    def _flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("LLM_API_KEY missing")
+
+    warmup = WarmUp((("orchestrator", _flaky),), retry_base_s=0.001)
+    await warmup.run()
+    assert len(attempts) == 3
+    assert warmup.ready